@@ -4,6 +4,8 @@ Combines all 4 branches into one project.
 """
 
 from pathlib import Path
+import os
+import sys
 import ssl
 import smtplib
 
@@ -43,20 +45,27 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.ServerTimingMiddleware",
+    "core.middleware.CompressionMiddleware",
+    "core.middleware.HTMLMinifyMiddleware",
+    "core.middleware.StaticCacheControlMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.ReplicaStickinessMiddleware",
 ]
 
 ROOT_URLCONF = "campus_requests.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "core.timing.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -65,6 +74,8 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "requests_unified.context_processors.unread_notifications",
+                "core.context_processors.asset_bundles",
             ],
         },
     },
@@ -79,7 +90,40 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+        "OPTIONS": {
+            # BEGIN IMMEDIATE takes the write lock when an atomic block starts, so
+            # read-then-write transactions wait on busy_timeout instead of failing
+            # with "database is locked" when upgrading. None = SQLite's DEFERRED.
+            "transaction_mode": "IMMEDIATE",
+        },
+    },
+    # Read replica for dashboards and statistics (see core.routers). Locally it
+    # is a copy of db.sqlite3 refreshed with `manage.py refresh_replica`.
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_replica.sqlite3",
+        "TEST": {"MIRROR": "default"},
+    },
+}
+
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+
+# Alias that @replica_view pages read from; None reads everything from default.
+# Only enabled once the local replica has been created, and never under tests.
+REPLICA_DATABASE = (
+    "replica" if (BASE_DIR / "db_replica.sqlite3").exists() and "test" not in sys.argv else None
+)
+# After a write, the user's reads stay on the primary for this many seconds.
+REPLICA_STICKY_SECONDS = 10
+
+# Applied to every new SQLite connection (see core.db).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",          # readers and the writer no longer block each other
+    "synchronous": "NORMAL",        # safe with WAL; fsync at checkpoints only
+    "busy_timeout": 5000,           # ms to wait for a lock before "database is locked"
+    "cache_size": -20000,           # page cache in KiB (negative) per connection
+    "mmap_size": 128 * 1024 * 1024,
+    "temp_store": "MEMORY",
 }
 
 # ============================================
@@ -123,7 +167,35 @@ USE_TZ = True
 # ============================================
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
-STATICFILES_DIRS = [BASE_DIR / "static"]
+STATICFILES_DIRS = [BASE_DIR / "static", BASE_DIR / "assets" / "build"]
+
+# collectstatic stores every file under a content-hashed name as well and
+# records it in STATIC_ROOT/staticfiles.json; {% static %} links the hashed
+# name, which StaticCacheControlMiddleware serves with this max-age.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.storage.ManifestStaticStorage"},
+}
+STATIC_HASHED_MAX_AGE = 365 * 24 * 3600
+
+# `manage.py build_assets` (see core.assets): bundles built at deploy time
+# into ASSET_DIR/build from the sources listed in order. "tailwind" runs the
+# Tailwind standalone CLI (TAILWIND_CLI); "vendor/..." files are pinned
+# copies kept in ASSET_DIR/vendor and fetched from ASSET_VENDOR with --fetch.
+# CSS rules for classes that no template uses are purged; classes only ever
+# added at runtime need a pattern in ASSET_PURGE_SAFELIST.
+ASSET_DIR = BASE_DIR / "assets"
+TAILWIND_CLI = os.environ.get("TAILWIND_CLI", "tailwindcss")
+ASSET_VENDOR = {
+    "daisyui-4.4.19.min.css": "https://cdn.jsdelivr.net/npm/daisyui@4.4.19/dist/full.min.css",
+    "aos-2.3.1.css": "https://unpkg.com/aos@2.3.1/dist/aos.css",
+    "aos-2.3.1.js": "https://unpkg.com/aos@2.3.1/dist/aos.js",
+}
+ASSET_BUNDLES = {
+    "bundle/app.css": ["vendor/daisyui-4.4.19.min.css", "tailwind", "vendor/aos-2.3.1.css"],
+    "bundle/app.js": ["vendor/aos-2.3.1.js"],
+}
+ASSET_PURGE_SAFELIST = [r"^aos-"]
 
 # ============================================
 # MEDIA FILES
@@ -131,6 +203,144 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# ============================================
+# DOCUMENT PREVIEWS
+# ============================================
+# Rendered into MEDIA_ROOT/<DOCUMENT_PREVIEW_DIR> by a background process pool.
+# Set DOCUMENT_PREVIEW_WORKERS = 0 to render inline instead.
+DOCUMENT_PREVIEW_DIR = "previews"
+DOCUMENT_PREVIEW_WORKERS = 2
+DOCUMENT_PREVIEW_SIZE = (800, 1100)
+DOCUMENT_THUMBNAIL_SIZE = (200, 260)
+
+# ============================================
+# TYPEAHEAD
+# ============================================
+# In-process autocomplete indexes are invalidated by model signals and
+# rebuilt at least this often (seconds) so other workers pick up changes.
+TYPEAHEAD_MAX_AGE = 300
+# At most this many indexes (one per name and scope, e.g. degree) are kept.
+TYPEAHEAD_MAX_INDEXES = 64
+
+# ============================================
+# LIVE NOTIFICATIONS
+# ============================================
+# Server-sent event streams (see requests_unified.live) are woken in-process
+# when a notification or status change commits; streams in other worker
+# processes see it after at most POLL_INTERVAL seconds. A stream ends after
+# MAX_AGE seconds and the browser reconnects where it left off. Streams are
+# only held open under ASGI; under WSGI every connection is a short poll
+# answered at once, and the browser comes back after POLL_INTERVAL.
+LIVE_NOTIFICATIONS_POLL_INTERVAL = 5
+LIVE_NOTIFICATIONS_KEEPALIVE = 15
+LIVE_NOTIFICATIONS_MAX_AGE = 300
+
+# Email delivery (see requests_unified.digests): users without a saved
+# preference get their role's default, else NOTIFICATION_EMAIL_DEFAULT
+# ("immediate", "digest" or "none"). Digests go out once the oldest queued
+# notification is NOTIFICATION_DIGEST_HOURS old.
+NOTIFICATION_EMAIL_DEFAULT = "immediate"
+NOTIFICATION_EMAIL_ROLE_DEFAULTS = {
+    "lecturer": "digest",
+    "head_of_dept": "digest",
+}
+NOTIFICATION_DIGEST_HOURS = 24
+NOTIFICATION_EMAIL_BATCH_SIZE = 100
+
+# ============================================
+# VIEW BENCHMARK BUDGETS
+# ============================================
+# Limits checked by `manage.py benchmark_views` (see requests_unified.benchmarks):
+# queries per request, median milliseconds and peak traced KiB. "default"
+# applies to every view; per-view entries (keyed by URL name) override it.
+VIEW_BENCHMARK_BUDGETS = {
+    "default": {"queries": 15, "ms": 500, "memory_kb": 8192},
+    "staff:request_detail": {"queries": 20},
+    # Unpaginated lists: time and memory grow with the number of open requests.
+    "staff:dashboard": {"ms": 1000, "memory_kb": 32768},
+    "lecturers:dashboard": {"ms": 1000, "memory_kb": 16384},
+}
+# Median milliseconds of one user search (`benchmark_views --user-search`).
+USER_SEARCH_BUDGET_MS = 50
+
+# ============================================
+# REQUEST TIMING
+# ============================================
+# core.middleware.ServerTimingMiddleware: fraction of requests measured,
+# whether to send Server-Timing / X-Query-Count headers, and the thresholds
+# above which a request is logged as a warning with its slowest queries.
+SERVER_TIMING_SAMPLE_RATE = 1.0 if DEBUG else 0.1
+SERVER_TIMING_HEADER = True
+SERVER_TIMING_QUERY_COUNT_HEADER = DEBUG
+SERVER_TIMING_SLOW_MS = 1000
+SERVER_TIMING_MAX_QUERIES = 50
+SERVER_TIMING_SLOW_QUERIES = 3
+
+# core.middleware.ProfilingMiddleware: "cprofile" writes .prof and collapsed
+# stacks, "sampler" only the (much cheaper) collapsed stacks. Admins can
+# always profile a request with the header token from the Profiles page.
+PROFILING_SAMPLE_RATE = 0
+PROFILING_MODE = "cprofile"
+PROFILING_INTERVAL = 0.005
+PROFILING_DIR = BASE_DIR / "profiles"
+PROFILING_MAX_PROFILES = 50
+PROFILING_TOKEN_MAX_AGE = 3600
+
+# core.metrics (/metrics): set METRICS_MULTIPROCESS_DIR when running several
+# worker processes so the endpoint reports the sum of all of them, and
+# METRICS_TOKEN to require "Authorization: Bearer <token>" from scrapers.
+METRICS_ENABLED = True
+METRICS_MULTIPROCESS_DIR = os.environ.get("METRICS_MULTIPROCESS_DIR")
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+# core.middleware.CompressionMiddleware: Brotli (when the optional `brotli`
+# package is installed) or gzip, for the content types below only; bodies
+# shorter than COMPRESSION_MIN_LENGTH bytes are not worth the CPU.
+# HTMLMinifyMiddleware collapses template indentation before compression.
+COMPRESSION_ENABLED = True
+COMPRESSION_MIN_LENGTH = 512
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+# BREACH mitigation, as in Django's GZipMiddleware: gzipped pages are padded
+# with a random 0..N bytes. Brotli cannot be padded and is used for static
+# files only.
+COMPRESSION_MAX_RANDOM_BYTES = 100
+COMPRESSION_CONTENT_TYPES = (
+    "text/html", "text/plain", "text/css", "text/csv", "text/javascript",
+    "application/javascript", "application/json", "application/xml", "image/svg+xml",
+)
+HTML_MINIFY = True
+
+# core.slow_queries: queries slower than SLOW_QUERY_MS (None disables) are
+# logged with their plan to SLOW_QUERY_LOG_FILE, a rotating file capped at
+# SLOW_QUERY_LOG_MAX_BYTES x (SLOW_QUERY_LOG_BACKUPS + 1).
+SLOW_QUERY_MS = 100
+SLOW_QUERY_EXPLAIN = True
+SLOW_QUERY_LOG_FILE = BASE_DIR / "logs" / "slow_queries.jsonl"
+SLOW_QUERY_LOG_MAX_BYTES = 5 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 3
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+        "slow_queries": {
+            "class": "core.slow_queries.SlowQueryFileHandler",
+            "filename": SLOW_QUERY_LOG_FILE,
+            "maxBytes": SLOW_QUERY_LOG_MAX_BYTES,
+            "backupCount": SLOW_QUERY_LOG_BACKUPS,
+            "delay": True,
+        },
+    },
+    "loggers": {
+        # INFO logs a line per sampled request; WARNING only flagged ones.
+        "core.timing": {"handlers": ["console"], "level": "WARNING", "propagate": False},
+        "core.slow_queries": {"handlers": ["slow_queries"], "level": "WARNING", "propagate": False},
+    },
+}
+
 # ============================================
 # DEFAULT PRIMARY KEY
 # ============================================
@@ -139,7 +349,9 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # ============================================
 # EMAIL CONFIGURATION - 2FA Verification Codes
 # ============================================
-EMAIL_BACKEND = 'core.email_backend.CustomEmailBackend'
+# Overridable so a server under load test can use a mail sink, e.g.
+# EMAIL_BACKEND=django.core.mail.backends.locmem.EmailBackend
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'core.email_backend.CustomEmailBackend')
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
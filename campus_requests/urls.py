@@ -8,6 +8,8 @@ from django.conf.urls.static import static
 from django.shortcuts import redirect
 from django.contrib.auth.decorators import login_required
 
+from requests_unified.views import sync_changes
+
 
 def redirect_to_dashboard(request):
     """Redirect authenticated users to their role-specific dashboard."""
@@ -49,6 +51,18 @@ urlpatterns = [
     
     # Admin user management
     path("management/", include("management.urls")),
+    
+    # Typeahead/autocomplete JSON endpoints
+    path("api/typeahead/", include("requests_unified.urls")),
+    
+    # Notification center and live notifications (server-sent events)
+    path("notifications/", include("requests_unified.notification_urls")),
+    
+    # Delta sync feed for client apps
+    path("api/sync/", sync_changes, name="sync"),
+    
+    # Versioned REST API
+    path("api/v1/", include("requests_unified.api_urls")),
 ]
 
 # Serve media files in development
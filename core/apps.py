@@ -5,3 +5,17 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'Core - Users & Authentication'
+    
+    def ready(self):
+        # Keep the user search index in sync with User.save()
+        import core.signals  # noqa: F401
+
+        from django.db.backends.signals import connection_created
+        from core.db import configure_sqlite
+        connection_created.connect(configure_sqlite, dispatch_uid='core.configure_sqlite')
+
+        from core.slow_queries import install as install_slow_query_log
+        connection_created.connect(install_slow_query_log, dispatch_uid='core.slow_query_log')
+
+        from core.metrics import install as install_query_metrics
+        connection_created.connect(install_query_metrics, dispatch_uid='core.query_metrics')
@@ -0,0 +1,306 @@
+"""
+Deploy-time CSS/JS bundles built by the build_assets command.
+
+ASSET_BUNDLES maps each bundle (a static path such as "bundle/app.css") to
+its sources, concatenated in order. A source can be one of:
+
+- "tailwind": the utilities the Tailwind standalone CLI (TAILWIND_CLI)
+  generates from tailwind.config.js for the classes our templates use;
+- "vendor/<file>": a pinned third-party file in ASSET_DIR/vendor, which
+  can be downloaded from its ASSET_VENDOR URL;
+- any other path, found by the staticfiles finders.
+
+CSS is purged of rules whose selectors name classes that appear nowhere in
+the templates or static JS (template_tokens()), then minified. The bundles
+are written to ASSET_DIR/build, which is in STATICFILES_DIRS, and
+collectstatic stores them under content-hashed names through the manifest
+storage (core.storage). templates/assets.html links them once
+bundles_built() reports that the manifest has them, and falls back to the
+CDNs otherwise.
+"""
+import re
+import shutil
+import subprocess
+import tempfile
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template.utils import get_app_template_dirs
+
+TAILWIND = 'tailwind'
+VENDOR_PREFIX = 'vendor/'
+
+
+class AssetError(Exception):
+    """A bundle source is missing or could not be built."""
+
+
+def asset_dir():
+    return Path(getattr(settings, 'ASSET_DIR', Path(settings.BASE_DIR) / 'assets'))
+
+
+def build_dir():
+    return asset_dir() / 'build'
+
+
+def bundles_built():
+    """Whether collectstatic has stored every bundle in the manifest."""
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+    if not hashed_files:
+        return False
+    return all(name in hashed_files for name in getattr(settings, 'ASSET_BUNDLES', {}))
+
+
+# ============================================
+# CONTENT SCANNING
+# ============================================
+
+# Roughly Tailwind's own extractor: anything between quotes, whitespace and tag brackets.
+_TOKEN = re.compile(r'[^\s"\'`<>={}]+')
+# A class built at render time, e.g. status-{{ req.status }} or `status-${data.status}`.
+_DYNAMIC_PREFIX = re.compile(r'([\w:-]+-)(?:\{\{|\$\{)')
+
+
+def content_files():
+    """Templates (project and app directories) and static JS that may name CSS classes."""
+    roots = [Path(d) for engine in settings.TEMPLATES for d in engine.get('DIRS', [])]
+    roots += [Path(d) for d in get_app_template_dirs('templates')]
+    files = [path for root in roots for path in root.rglob('*.html')]
+    for root in getattr(settings, 'STATICFILES_DIRS', []):
+        files += Path(root).rglob('*.js')
+    return sorted(set(files))
+
+
+def template_tokens(files=None):
+    """(tokens, dynamic class prefixes) found in the content files."""
+    tokens, prefixes = set(), set()
+    for path in files if files is not None else content_files():
+        text = path.read_text(encoding='utf-8', errors='replace')
+        tokens.update(_TOKEN.findall(text))
+        prefixes.update(_DYNAMIC_PREFIX.findall(text))
+    return tokens, prefixes
+
+
+class ClassMatcher:
+    """Whether a CSS class may be used: a scanned token, a dynamic prefix or a safelist pattern."""
+
+    def __init__(self, tokens, prefixes=(), safelist=()):
+        self.tokens = set(tokens)
+        self.prefixes = tuple(prefixes)
+        self.safelist = [re.compile(pattern) for pattern in safelist]
+
+    def __call__(self, name):
+        return (
+            name in self.tokens
+            or name.startswith(self.prefixes)
+            or any(pattern.search(name) for pattern in self.safelist)
+        )
+
+
+# ============================================
+# CSS
+# ============================================
+
+_PROTECTED = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|url\([^)]*\)|/\*.*?\*/', re.DOTALL)
+# At-rules whose blocks hold style rules; the rest (@font-face, @keyframes, ...) are kept whole.
+_NESTED_AT_RULES = ('@media', '@supports', '@layer', '@container', '@document')
+
+
+def _split_blocks(css):
+    """
+    Top-level (prelude, body) pairs of a stylesheet; body is None for
+    statements such as @import. Strings, url() and comments are skipped
+    over so the braces and semicolons inside them do not count.
+    """
+    blocks, start, depth, i = [], 0, 0, 0
+    prelude = None
+    while i < len(css):
+        match = _PROTECTED.match(css, i)
+        if match:
+            i = match.end()
+            continue
+        char = css[i]
+        if char == '{':
+            if depth == 0:
+                prelude, start = css[start:i], i + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude, css[start:i]))
+                start = i + 1
+            depth = max(depth, 0)
+        elif char == ';' and depth == 0:
+            blocks.append((css[start:i], None))
+            start = i + 1
+        i += 1
+    return blocks
+
+
+def _split_selectors(prelude):
+    """Selector list split on commas outside parentheses and brackets."""
+    selectors, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            selectors.append(prelude[start:i])
+            start = i + 1
+    selectors.append(prelude[start:])
+    return [selector.strip() for selector in selectors if selector.strip()]
+
+
+# Pseudo-class arguments (:not(.x), :is(.a, .b), ...) and attribute selectors, whose classes are not required.
+_OPTIONAL_PARTS = re.compile(r'\((?:[^()]|\([^()]*\))*\)|(?<!\\)\[(?:\\.|[^\]\\])*\]')
+_CLASS = re.compile(r'\.((?:\\[0-9a-fA-F]{1,6} ?|\\.|[\w-])+)')
+_ESCAPE = re.compile(r'\\([0-9a-fA-F]{1,6}) ?|\\(.)')
+
+
+def selector_classes(selector):
+    """Class names a selector requires, unescaped (".hover\\:x" -> "hover:x")."""
+    required = _OPTIONAL_PARTS.sub('', selector)
+    return [
+        _ESCAPE.sub(lambda m: chr(int(m.group(1), 16)) if m.group(1) else m.group(2), name)
+        for name in _CLASS.findall(required)
+    ]
+
+
+def purge_css(css, is_used):
+    """css without the selectors (and then rules) that need a class is_used() rejects."""
+    out = []
+    for prelude, body in _split_blocks(css):
+        head = _PROTECTED.sub(lambda m: '' if m.group().startswith('/*') else m.group(), prelude).strip()
+        if body is None:
+            out.append(f'{head};')
+        elif head.startswith(_NESTED_AT_RULES):
+            inner = purge_css(body, is_used)
+            if inner or head.startswith('@layer'):
+                # An empty @layer block still fixes the layer order.
+                out.append(f'{head}{{{inner}}}')
+        elif head.startswith('@'):
+            out.append(f'{head}{{{body}}}')
+        else:
+            kept = [s for s in _split_selectors(head) if all(is_used(c) for c in selector_classes(s))]
+            if kept:
+                out.append(f"{','.join(kept)}{{{body}}}")
+    return '\n'.join(out)
+
+
+def minify_css(css):
+    """css without comments (except /*! licence notes) and insignificant whitespace."""
+    parts, text, last = [], '', 0
+    for match in _PROTECTED.finditer(css):
+        text += css[last:match.start()]
+        last = match.end()
+        token = match.group()
+        if token.startswith('/*!'):
+            # Whitespace next to a licence note is never significant.
+            parts.extend([_squeeze(text).strip(), token, '\n'])
+            text = ''
+        elif not token.startswith('/*'):
+            parts.extend([_squeeze(text), token])
+            text = ''
+    parts.append(_squeeze(text + css[last:]))
+    for i in range(1, len(parts)):
+        if parts[i - 1] == '\n':
+            parts[i] = parts[i].lstrip()
+    return ''.join(parts).replace(';}', '}').strip()
+
+
+def _squeeze(text):
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r' ?([{};,]) ?', r'\1', text)
+    # Only after a declaration's property: "a :hover" and "a:hover" are different selectors.
+    return re.sub(r'([{;][-\w]+:) ', r'\1', text)
+
+
+# ============================================
+# SOURCES AND BUNDLES
+# ============================================
+
+def fetch_vendor(name):
+    """Download vendor/<name> from its ASSET_VENDOR URL."""
+    url = getattr(settings, 'ASSET_VENDOR', {}).get(name)
+    if url is None:
+        raise AssetError(f'No ASSET_VENDOR URL for {VENDOR_PREFIX}{name}')
+    path = asset_dir() / 'vendor' / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with urllib.request.urlopen(url, timeout=30) as response:
+        path.write_bytes(response.read())
+    return path
+
+
+def run_tailwind(cli=None):
+    """CSS the Tailwind standalone CLI generates for the project's content, minified."""
+    cli = cli or getattr(settings, 'TAILWIND_CLI', 'tailwindcss')
+    executable = shutil.which(cli)
+    if executable is None:
+        raise AssetError(
+            f'Tailwind CLI {cli!r} not found; install the standalone binary '
+            '(github.com/tailwindlabs/tailwindcss/releases) and set TAILWIND_CLI'
+        )
+    config = Path(settings.BASE_DIR) / 'tailwind.config.js'
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / 'tailwind.css'
+        result = subprocess.run(
+            [executable, '--config', str(config), '--output', str(output), '--minify'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise AssetError(f'Tailwind CLI failed: {result.stderr.strip()}')
+        return output.read_text(encoding='utf-8')
+
+
+def read_source(source, fetch=False):
+    """Text of one bundle source; see the module docstring for the kinds of source."""
+    if source == TAILWIND:
+        return run_tailwind()
+    if source.startswith(VENDOR_PREFIX):
+        name = source[len(VENDOR_PREFIX):]
+        path = asset_dir() / 'vendor' / name
+        if not path.exists():
+            if not fetch:
+                raise AssetError(f'{path} is missing; add it or rerun with --fetch')
+            path = fetch_vendor(name)
+    else:
+        path = finders.find(source)
+        if path is None:
+            raise AssetError(f'Static file {source!r} not found')
+    return Path(path).read_text(encoding='utf-8')
+
+
+def build_bundle(name, sources, is_used, fetch=False):
+    """
+    (contents, total bytes of the sources) of one bundle. CSS sources are
+    purged, except Tailwind's own output, and minified.
+    """
+    parts, source_bytes = [], 0
+    for source in sources:
+        text = read_source(source, fetch=fetch)
+        source_bytes += len(text.encode())
+        if name.endswith('.css'):
+            # Tailwind has already generated only what the content uses.
+            parts.append(minify_css(text if source == TAILWIND else purge_css(text, is_used)))
+        else:
+            # Separate scripts so one without a trailing semicolon cannot run into the next.
+            parts.append(text.rstrip() + '\n;')
+    return '\n'.join(parts) + '\n', source_bytes
+
+
+def build_bundles(fetch=False):
+    """Write every ASSET_BUNDLES bundle to build_dir(); returns {name: (source bytes, bundle bytes)}."""
+    tokens, prefixes = template_tokens()
+    is_used = ClassMatcher(tokens, prefixes, getattr(settings, 'ASSET_PURGE_SAFELIST', ()))
+    sizes = {}
+    for name, sources in getattr(settings, 'ASSET_BUNDLES', {}).items():
+        content, source_bytes = build_bundle(name, sources, is_used, fetch=fetch)
+        path = build_dir() / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+        sizes[name] = (source_bytes, len(content.encode()))
+    return sizes
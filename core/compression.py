@@ -0,0 +1,162 @@
+"""
+Response compression and HTML minification (see core.middleware).
+
+negotiate() picks Brotli or gzip from the client's Accept-Encoding. Brotli
+is only offered when the optional `brotli` package is installed. Whole
+responses are compressed in one go. Streaming responses are compressed
+chunk by chunk and flushed after every chunk, so a client still sees each
+chunk as soon as the view yields it.
+
+Like Django's GZipMiddleware, gzip output carries a header file name of
+random length (up to max_random_bytes). This pads compressed pages against
+BREACH, where an attacker who can inject text into a page (e.g. ?search=)
+guesses a secret on it (the CSRF token) from the compressed size. Brotli
+has no such field, so the middleware only uses it for static files.
+
+minify_html() only collapses template indentation: whitespace that contains
+a line break and lies between two tags. Text content keeps every space and
+line break, because it may be shown with white-space: pre-wrap, as request
+descriptions are. <pre>, <textarea>, <script> and <style> are left alone
+entirely.
+"""
+import re
+import secrets
+import struct
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ============================================
+# NEGOTIATION
+# ============================================
+
+def available_encodings():
+    """Encodings this server can produce, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def _accepted(header):
+    """{coding: q} from an Accept-Encoding header; codings with q=0 are refused."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(header, encodings=None):
+    """The encoding to use for a client sending `header` as Accept-Encoding, or None."""
+    accepted = _accepted(header or '')
+    best, best_q = None, 0.0
+    for encoding in encodings or available_encodings():
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+# ============================================
+# COMPRESSION
+# ============================================
+
+def compress(data, encoding, gzip_level=6, brotli_quality=5, max_random_bytes=0):
+    """data compressed as `encoding` ('br' or 'gzip')."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    compressor = _StreamCompressor(encoding, gzip_level=gzip_level, max_random_bytes=max_random_bytes)
+    return compressor.whole(data)
+
+
+def _gzip_header(max_random_bytes):
+    # Flags FNAME when padded; mtime 0, no extra flags, OS unknown.
+    padding = b'a' * secrets.randbelow(max_random_bytes) if max_random_bytes else b''
+    header = b'\x1f\x8b\x08' + (b'\x08' if padding else b'\x00') + b'\x00\x00\x00\x00\x00\xff'
+    return header + (padding + b'\x00' if padding else b'')
+
+
+class _StreamCompressor:
+    """Incremental compressor whose every chunk can be decoded on arrival."""
+
+    def __init__(self, encoding, gzip_level=6, brotli_quality=5, max_random_bytes=0):
+        self.encoding = encoding
+        if encoding == 'br':
+            self.compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            # A raw deflate stream; the gzip header and trailer are written here.
+            self.compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+            self.header = _gzip_header(max_random_bytes)
+            self.crc, self.size = 0, 0
+
+    def _deflate(self, data):
+        self.crc = zlib.crc32(data, self.crc)
+        self.size += len(data)
+        header, self.header = self.header, b''
+        return header + self.compressor.compress(data)
+
+    def _trailer(self):
+        return struct.pack('<II', self.crc, self.size & 0xffffffff)
+
+    def chunk(self, data):
+        if self.encoding == 'br':
+            return self.compressor.process(data) + self.compressor.flush()
+        return self._deflate(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self.compressor.finish()
+        return self._deflate(b'') + self.compressor.flush(zlib.Z_FINISH) + self._trailer()
+
+    def whole(self, data):
+        """data compressed in one piece (gzip only)."""
+        return self._deflate(data) + self.compressor.flush(zlib.Z_FINISH) + self._trailer()
+
+
+def compress_stream(chunks, encoding, **levels):
+    """Compress an iterable of byte chunks, yielding one compressed chunk per input chunk."""
+    compressor = _StreamCompressor(encoding, **levels)
+    for data in chunks:
+        if data:
+            yield compressor.chunk(data)
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding, **levels):
+    """compress_stream() for the async iterators of async streaming responses."""
+    compressor = _StreamCompressor(encoding, **levels)
+    async for data in chunks:
+        if data:
+            yield compressor.chunk(data)
+    yield compressor.finish()
+
+
+# ============================================
+# HTML MINIFICATION
+# ============================================
+
+# Elements whose text is whitespace-sensitive. These are kept verbatim.
+_PRESERVED = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+# Each part between preserved elements starts after a ">" and ends before a "<".
+_INDENTATION = re.compile(r'(?:(?<=>)|^)[ \t\r\f\v]*\n\s*(?=<|$)')
+
+
+def minify_html(html):
+    """html with whitespace between tags that contains a line break collapsed to one newline."""
+    parts = _PRESERVED.split(html)
+    # split() yields text, element, tag name, text, element, tag name, ...
+    for i in range(0, len(parts), 3):
+        parts[i] = _INDENTATION.sub('\n', parts[i])
+    return ''.join(part for i, part in enumerate(parts) if i % 3 != 2)
@@ -0,0 +1,9 @@
+"""
+Project-wide template context.
+"""
+from . import assets
+
+
+def asset_bundles(request):
+    """Whether templates/assets.html can link the built bundles instead of the CDNs."""
+    return {'assets_built': assets.bundles_built()}
@@ -0,0 +1,36 @@
+"""
+SQLite connection tuning.
+
+Every new SQLite connection gets the PRAGMAs from settings.SQLITE_PRAGMAS
+(WAL journal, busy timeout, page cache, mmap...). In WAL mode readers no longer
+block the single writer (and vice versa), and busy_timeout makes a second
+writer wait for the lock instead of failing with "database is locked".
+"""
+from django.conf import settings
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def get_pragmas():
+    return getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_PRAGMAS)
+
+
+def apply_pragmas(cursor, pragmas):
+    """Run `PRAGMA name = value` for each entry; works with DB-API and Django cursors."""
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created handler."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, get_pragmas())
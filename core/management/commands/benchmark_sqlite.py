@@ -0,0 +1,158 @@
+"""
+Multi-threaded SQLite read/write benchmark.
+
+Runs the same workload (readers listing requests by status, writers doing a
+read-then-write status change plus a history insert) against a scratch
+database once per connection mode, and prints the throughput of each:
+
+    default        rollback journal, deferred transactions (plain Django)
+    wal            settings.SQLITE_PRAGMAS, deferred transactions
+    wal-immediate  settings.SQLITE_PRAGMAS, BEGIN IMMEDIATE for writes
+
+The real database is never touched.
+"""
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.db import apply_pragmas, get_pragmas
+
+MODES = {
+    'default': (False, 'BEGIN'),
+    'wal': (True, 'BEGIN'),
+    'wal-immediate': (True, 'BEGIN IMMEDIATE'),
+}
+
+STATUSES = ['PENDING', 'IN_REVIEW', 'APPROVED', 'REJECTED']
+
+SCHEMA = """
+    CREATE TABLE bench_request (
+        id INTEGER PRIMARY KEY, status TEXT NOT NULL, title TEXT NOT NULL, description TEXT NOT NULL
+    );
+    CREATE INDEX bench_request_status ON bench_request (status, id);
+    CREATE TABLE bench_history (
+        id INTEGER PRIMARY KEY, request_id INTEGER NOT NULL, old_status TEXT, new_status TEXT, changed_at REAL
+    );
+"""
+
+
+class Command(BaseCommand):
+    help = 'Compare SQLite read/write throughput with and without the connection tuning'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4, help='Reader threads (default: 4)')
+        parser.add_argument('--writers', type=int, default=2, help='Writer threads (default: 2)')
+        parser.add_argument('--duration', type=float, default=5.0,
+                            help='Seconds to run each mode (default: 5)')
+        parser.add_argument('--rows', type=int, default=5000, help='Seeded requests (default: 5000)')
+        parser.add_argument('--modes', default=','.join(MODES),
+                            help=f'Comma-separated modes to run (default: {",".join(MODES)})')
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        unknown = [mode for mode in modes if mode not in MODES]
+        if unknown:
+            raise CommandError(f"Unknown mode(s): {', '.join(unknown)}. Choose from {', '.join(MODES)}.")
+
+        self.stdout.write(
+            f"{options['readers']} readers, {options['writers']} writers, "
+            f"{options['duration']:g}s per mode, {options['rows']} rows"
+        )
+        self.stdout.write(f"{'mode':<15}{'reads/s':>10}{'writes/s':>10}{'locked':>8}")
+
+        for mode in modes:
+            with tempfile.TemporaryDirectory() as tmp:
+                result = self.run_mode(os.path.join(tmp, 'bench.sqlite3'), mode, options)
+            self.stdout.write(
+                f"{mode:<15}{result['reads'] / result['elapsed']:>10.0f}"
+                f"{result['writes'] / result['elapsed']:>10.0f}{result['locked']:>8}"
+            )
+
+    def connect(self, path, tuned):
+        conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        if tuned:
+            apply_pragmas(conn, get_pragmas())
+        return conn
+
+    def seed(self, path, tuned, rows):
+        conn = self.connect(path, tuned)
+        conn.executescript(SCHEMA)
+        rng = random.Random(0)
+        conn.execute('BEGIN')
+        conn.executemany(
+            'INSERT INTO bench_request (status, title, description) VALUES (?, ?, ?)',
+            ((rng.choice(STATUSES), f'Request {i}', 'x' * 200) for i in range(rows)),
+        )
+        conn.execute('COMMIT')
+        conn.close()
+
+    def run_mode(self, path, mode, options):
+        tuned, begin = MODES[mode]
+        self.seed(path, tuned, options['rows'])
+
+        counts = {'reads': 0, 'writes': 0, 'locked': 0}
+        counts_lock = threading.Lock()
+        stop = threading.Event()
+
+        def reader(seed):
+            conn = self.connect(path, tuned)
+            rng = random.Random(seed)
+            done = 0
+            while not stop.is_set():
+                try:
+                    conn.execute(
+                        'SELECT id, title FROM bench_request WHERE status = ? ORDER BY id DESC LIMIT 20',
+                        [rng.choice(STATUSES)],
+                    ).fetchall()
+                    conn.execute('SELECT status, count(*) FROM bench_request GROUP BY status').fetchall()
+                    done += 1
+                except sqlite3.OperationalError:
+                    with counts_lock:
+                        counts['locked'] += 1
+            conn.close()
+            with counts_lock:
+                counts['reads'] += done
+
+        def writer(seed):
+            conn = self.connect(path, tuned)
+            rng = random.Random(seed)
+            done = 0
+            while not stop.is_set():
+                pk = rng.randint(1, options['rows'])
+                try:
+                    conn.execute(begin)
+                    old = conn.execute('SELECT status FROM bench_request WHERE id = ?', [pk]).fetchone()[0]
+                    new = rng.choice(STATUSES)
+                    conn.execute('UPDATE bench_request SET status = ? WHERE id = ?', [new, pk])
+                    conn.execute(
+                        'INSERT INTO bench_history (request_id, old_status, new_status, changed_at) '
+                        'VALUES (?, ?, ?, ?)', [pk, old, new, time.time()],
+                    )
+                    conn.execute('COMMIT')
+                    done += 1
+                except sqlite3.OperationalError:
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+                    with counts_lock:
+                        counts['locked'] += 1
+            conn.close()
+            with counts_lock:
+                counts['writes'] += done
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(options['readers'])]
+        threads += [threading.Thread(target=writer, args=(1000 + i,)) for i in range(options['writers'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        counts['elapsed'] = time.perf_counter() - started
+        return counts
@@ -0,0 +1,50 @@
+"""
+Build the self-hosted CSS/JS bundles and collect them under hashed names.
+
+Run at deploy time, before the server starts:
+
+    TAILWIND_CLI=/opt/bin/tailwindcss manage.py build_assets --fetch
+
+Each bundle in settings.ASSET_BUNDLES is built from its sources (see
+core.assets): Tailwind utilities generated for the classes our templates
+use, plus DaisyUI and AOS with the rules for unused classes purged, all
+minified. collectstatic then stores the bundles in STATIC_ROOT with
+content-hashed names through the manifest storage. From then on
+templates/assets.html links them instead of the CDNs.
+"""
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from core.assets import AssetError, build_bundles
+
+
+class Command(BaseCommand):
+    help = 'Build purged, minified CSS/JS bundles and collect them with hashed names'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fetch', action='store_true',
+                            help='Download missing vendor files from settings.ASSET_VENDOR')
+        parser.add_argument('--skip-collectstatic', action='store_true',
+                            help='Only write the bundles to ASSET_DIR/build (default: also run collectstatic)')
+
+    def handle(self, *args, **options):
+        if not getattr(settings, 'ASSET_BUNDLES', None):
+            raise CommandError('settings.ASSET_BUNDLES is empty.')
+        try:
+            sizes = build_bundles(fetch=options['fetch'])
+        except (AssetError, OSError) as e:
+            raise CommandError(str(e))
+
+        for name, (source_bytes, bundle_bytes) in sizes.items():
+            self.stdout.write(f'{name}: {source_bytes / 1024:.1f} KiB of sources -> {bundle_bytes / 1024:.1f} KiB')
+
+        if options['skip_collectstatic']:
+            self.stdout.write(self.style.SUCCESS(f'Built {len(sizes)} bundles.'))
+            return
+
+        call_command('collectstatic', interactive=False, verbosity=0)
+        for name in sizes:
+            self.stdout.write(f'  {name} -> {staticfiles_storage.stored_name(name)}')
+        self.stdout.write(self.style.SUCCESS(f'Built and collected {len(sizes)} bundles.'))
@@ -0,0 +1,20 @@
+"""
+Rebuild the user search index (needed after bulk imports that bypass User.save).
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the normalized token/trigram index used by the management user search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Users indexed per insert batch (default: 1000)')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} users.'))
@@ -0,0 +1,57 @@
+"""
+Refresh a local SQLite read replica from the primary database.
+
+Uses SQLite's online backup API, copying a few pages at a time so the primary
+keeps serving reads and writes while the copy runs. With --interval the
+command keeps refreshing, which simulates a lagging replica for local testing
+of the read-replica router.
+"""
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def backup_database(source_path, target_path, pages=1024, sleep=0.005):
+    """Copy source into target online. Returns the number of pages copied."""
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target, pages=pages, sleep=sleep)
+        return source.execute('PRAGMA page_count').fetchone()[0]
+    finally:
+        target.close()
+        source.close()
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into the read replica (online backup)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=getattr(settings, 'REPLICA_DATABASE', None) or 'replica',
+                            help='Replica database alias (default: settings.REPLICA_DATABASE or "replica")')
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Keep refreshing every N seconds (default: refresh once)')
+        parser.add_argument('--pages', type=int, default=1024,
+                            help='Pages copied per backup step (default: 1024)')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        if alias not in settings.DATABASES or alias == 'default':
+            raise CommandError(f"'{alias}' is not a replica database alias.")
+
+        primary, replica = settings.DATABASES['default'], settings.DATABASES[alias]
+        for db in (primary, replica):
+            if db['ENGINE'] != 'django.db.backends.sqlite3':
+                raise CommandError('refresh_replica only supports SQLite databases.')
+
+        while True:
+            started = time.perf_counter()
+            pages = backup_database(str(primary['NAME']), str(replica['NAME']), pages=options['pages'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Copied {pages} pages to '{alias}' in {time.perf_counter() - started:.2f}s."
+            ))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
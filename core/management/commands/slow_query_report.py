@@ -0,0 +1,90 @@
+"""
+Summarize the slow query log (see core.slow_queries).
+
+Records are grouped by SQL fingerprint and ranked by total time, so one
+moderately slow query run thousands of times outranks a single outlier.
+Each group shows its count, total/mean/max time, normalized SQL, the most
+common call site and the latest query plan; groups whose plan contains a
+full table scan are flagged.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.slow_queries import read_log
+
+SORT_KEYS = {
+    'total': lambda group: group['total_ms'],
+    'count': lambda group: group['count'],
+    'max': lambda group: group['max_ms'],
+}
+
+
+def aggregate(records):
+    """Group slow query records by fingerprint."""
+    groups = {}
+    for record in records:
+        group = groups.setdefault(record['fingerprint'], {
+            'fingerprint': record['fingerprint'],
+            'sql': record['sql'],
+            'count': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'plan': [],
+            'full_scan': False,
+            'stacks': Counter(),
+            'params': Counter(),
+        })
+        group['count'] += 1
+        group['total_ms'] += record['ms']
+        group['max_ms'] = max(group['max_ms'], record['ms'])
+        if record.get('plan'):
+            group['plan'] = record['plan']
+            group['full_scan'] = record.get('full_scan', False)
+        if record.get('stack'):
+            group['stacks'][' <- '.join(reversed(record['stack']))] += 1
+        group['params'][record.get('params', '')] += 1
+    return list(groups.values())
+
+
+class Command(BaseCommand):
+    help = 'Aggregate the slow query log by fingerprint and flag full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', default=None,
+                            help='Log file to read, plus its rotated backups (default: SLOW_QUERY_LOG_FILE)')
+        parser.add_argument('--limit', type=int, default=20, help='Fingerprints to show (default: 20)')
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='total',
+                            help='Rank by total time, count or max time (default: total)')
+        parser.add_argument('--full-scans', action='store_true', help='Only show queries with a full table scan')
+
+    def handle(self, *args, **options):
+        path = options['log'] or getattr(settings, 'SLOW_QUERY_LOG_FILE', None)
+        if not path:
+            raise CommandError('No log file: pass --log or set SLOW_QUERY_LOG_FILE.')
+
+        records = list(read_log(path))
+        groups = aggregate(records)
+        if options['full_scans']:
+            groups = [group for group in groups if group['full_scan']]
+        groups.sort(key=SORT_KEYS[options['sort']], reverse=True)
+
+        for rank, group in enumerate(groups[:options['limit']], 1):
+            flag = self.style.ERROR('  FULL SCAN') if group['full_scan'] else ''
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"#{rank} {group['fingerprint']}  count={group['count']}  total={group['total_ms']:.0f}ms  "
+                f"mean={group['total_ms'] / group['count']:.1f}ms  max={group['max_ms']:.0f}ms"
+            ) + flag)
+            self.stdout.write(f"  {group['sql']}")
+            self.stdout.write(f"  params: {group['params'].most_common(1)[0][0]}")
+            if group['stacks']:
+                self.stdout.write(f"  from: {group['stacks'].most_common(1)[0][0]}")
+            for line in group['plan']:
+                self.stdout.write(f"  | {line}")
+            self.stdout.write('')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(records)} slow queries, {len(groups)} fingerprints"
+            f"{' with full table scans' if options['full_scans'] else ''}."
+        ))
@@ -0,0 +1,302 @@
+"""
+Prometheus metrics in the text exposition format, without external dependencies.
+
+Counters and histograms are recorded into a per-thread dict, so the hot path
+takes no lock; a scrape merges the dicts of every thread. When a thread
+exits, its dict is folded into a process-wide total, so short-lived threads
+(one per connection under runserver) do not accumulate. Gauges are
+computed at scrape time by callbacks (e.g. outstanding requests per status
+from the database).
+
+With settings.METRICS_MULTIPROCESS_DIR set, each worker process also writes
+its totals to <dir>/<pid>-<token>.json (at most every
+METRICS_FLUSH_INTERVAL seconds, and on every scrape), and /metrics sums the
+files of all workers, including ones that have exited, so counters stay
+monotonic across restarts. Clear the directory when deploying.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+import weakref
+from bisect import bisect_left
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+REGISTRY = {}
+
+_local = threading.local()
+_stores = []
+_retired = {}  # merged samples of threads that have exited
+_stores_lock = threading.Lock()
+_process = {'token': uuid.uuid4().hex[:8], 'flushed': 0.0}
+
+
+def _reset_after_fork():
+    """A forked worker starts from zero instead of inheriting the parent's totals."""
+    global _local, _stores, _retired, _stores_lock
+    _local = threading.local()
+    _stores = []
+    _retired = {}
+    _stores_lock = threading.Lock()
+    _process.update(token=uuid.uuid4().hex[:8], flushed=0.0)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class _ThreadToken:
+    """Lives only in the thread-local, so it is collected when its thread exits."""
+
+
+def _retire(store):
+    with _stores_lock:
+        for i, registered in enumerate(_stores):
+            if registered is store:
+                del _stores[i]
+                break
+        else:
+            return  # registered before a fork reset
+        for key, value in store.items():
+            _merge(_retired, key, value)
+
+
+def _store():
+    store = getattr(_local, 'store', None)
+    if store is None:
+        store = _local.store = {}
+        _local.token = _ThreadToken()
+        with _stores_lock:
+            _stores.append(store)
+        weakref.finalize(_local.token, _retire, store)
+    return store
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY[name] = self
+
+    def _key(self, labels):
+        return (self.name, tuple(str(labels[label]) for label in self.labelnames))
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        store = _store()
+        key = self._key(labels)
+        store[key] = store.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    """Observations per bucket (non-cumulative) plus their sum, cumulated when rendered."""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        store = _store()
+        key = self._key(labels)
+        values = store.get(key)
+        if values is None:
+            values = store[key] = [0] * (len(self.buckets) + 2)  # buckets, +Inf, sum
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+
+class Gauge(Metric):
+    """Computed on scrape: callback() returns {label values tuple: value}."""
+    type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+
+# ============================================
+# COLLECTION
+# ============================================
+
+def _merge(into, key, value):
+    current = into.get(key)
+    if current is None:
+        into[key] = list(value) if isinstance(value, list) else value
+    elif isinstance(current, list):
+        for i, item in enumerate(value):
+            current[i] += item
+    else:
+        into[key] = current + value
+
+
+def local_samples():
+    """This process's counter and histogram values, merged across threads."""
+    with _stores_lock:
+        stores = list(_stores)
+        merged = {}
+        for key, value in _retired.items():
+            _merge(merged, key, value)
+    for store in stores:
+        for key, value in store.copy().items():  # dict.copy() is atomic under the GIL
+            _merge(merged, key, value)
+    return merged
+
+
+def get_multiprocess_dir():
+    return getattr(settings, 'METRICS_MULTIPROCESS_DIR', None) or os.environ.get('METRICS_MULTIPROCESS_DIR')
+
+
+def flush(force=False):
+    """Write this process's totals to the multiprocess directory (rate-limited unless forced)."""
+    directory = get_multiprocess_dir()
+    if not directory:
+        return
+    now = time.monotonic()
+    if not force and now - _process['flushed'] < getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+        return
+    _process['flushed'] = now
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{os.getpid()}-{_process['token']}.json")
+    samples = [[name, list(labels), value] for (name, labels), value in local_samples().items()]
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as fh:
+        json.dump(samples, fh)
+    os.replace(tmp, path)
+
+
+def collect():
+    """Counter and histogram values of this process, or of all processes in multiprocess mode."""
+    directory = get_multiprocess_dir()
+    if not directory:
+        return local_samples()
+    flush(force=True)
+    merged = {}
+    for filename in os.listdir(directory):
+        if not filename.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, filename)) as fh:
+                samples = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in samples:
+            _merge(merged, (name, tuple(labels)), value)
+    return merged
+
+
+# ============================================
+# EXPOSITION
+# ============================================
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """All registered metrics in the Prometheus text format (version 0.0.4)."""
+    samples = collect()
+    by_metric = {}
+    for (name, labels), value in samples.items():
+        by_metric.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for metric in REGISTRY.values():
+        if isinstance(metric, Gauge):
+            values = sorted(metric.callback().items()) if metric.callback else []
+        else:
+            values = sorted(by_metric.get(metric.name, []))
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        for labels, value in values:
+            if isinstance(metric, Histogram):
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float('inf'),), value[:-1]):
+                    cumulative += count
+                    le = _labels(metric.labelnames, labels, [('le', _number(float(bound)))])
+                    lines.append(f'{metric.name}_bucket{le} {cumulative}')
+                label_text = _labels(metric.labelnames, labels)
+                lines.append(f'{metric.name}_sum{label_text} {_number(float(value[-1]))}')
+                lines.append(f'{metric.name}_count{label_text} {cumulative}')
+            else:
+                lines.append(f'{metric.name}{_labels(metric.labelnames, labels)} {_number(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+# ============================================
+# APPLICATION METRICS
+# ============================================
+
+http_request_duration = Histogram(
+    'http_request_duration_seconds', 'Request latency by URL name and method.', ['view', 'method'],
+)
+http_requests = Counter(
+    'http_requests_total', 'Responses by URL name, method and status code.', ['view', 'method', 'status'],
+)
+db_query_duration = Histogram(
+    'db_query_duration_seconds', 'Database query latency by connection alias.', ['database'], buckets=DB_BUCKETS,
+)
+cache_requests = Counter(
+    'cache_requests_total', 'In-process cache lookups by cache and result (hit or miss).', ['cache', 'result'],
+)
+workflow_submissions = Counter(
+    'workflow_submissions_total', 'Requests submitted, by request type.', ['request_type'],
+)
+workflow_decisions = Counter(
+    'workflow_decisions_total', 'Approval log entries, by the role of the approver and the action.',
+    ['role', 'action'],
+)
+
+
+def _outstanding_requests():
+    from django.db.models import Count
+    from requests_unified.models import Request
+
+    final = {Request.STATUS_APPROVED, Request.STATUS_REJECTED}
+    counts = dict.fromkeys([status for status, _ in Request.STATUS_CHOICES if status not in final], 0)
+    rows = Request.objects.exclude(status__in=final).values_list('status').annotate(n=Count('pk')).order_by()
+    counts.update(rows)
+    return {(status,): count for status, count in counts.items()}
+
+
+requests_outstanding = Gauge(
+    'requests_outstanding', 'Open requests by workflow status.', ['status'], callback=_outstanding_requests,
+)
+
+
+def record_query(execute, sql, params, many, context):
+    """connection.execute_wrapper feeding db_query_duration_seconds."""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        db_query_duration.observe(time.perf_counter() - started, database=context['connection'].alias)
+
+
+def install(sender, connection, **kwargs):
+    """connection_created receiver: time every query on the new connection."""
+    if getattr(settings, 'METRICS_ENABLED', True) and record_query not in connection.execute_wrappers:
+        # Below any scoped execute_wrapper() open on this connection (see slow_queries.install).
+        connection.execute_wrappers.insert(0, record_query)
@@ -0,0 +1,295 @@
+"""
+Project-wide middleware.
+"""
+import logging
+import random
+import re
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+from . import compression, metrics, profiling
+from .routers import SAFE_METHODS, mark_write
+from .timing import RequestTimer
+
+timing_logger = logging.getLogger('core.timing')
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Record the time of each write request in the session so that @replica_view
+    pages keep reading from the primary for REPLICA_STICKY_SECONDS afterwards.
+    Must come after SessionMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            mark_write(request)
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    Measure DB time, query count, template time and view time of a sample of
+    requests (SERVER_TIMING_SAMPLE_RATE). Sampled responses get a Server-Timing
+    header (and X-Query-Count if SERVER_TIMING_QUERY_COUNT_HEADER), a
+    key=value line on the "core.timing" logger, and a warning with the
+    slowest SQL when SERVER_TIMING_SLOW_MS or SERVER_TIMING_MAX_QUERIES is
+    exceeded. Should be first in MIDDLEWARE so "total" covers everything.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'SERVER_TIMING_SAMPLE_RATE', 1.0)
+        self.header = getattr(settings, 'SERVER_TIMING_HEADER', True)
+        self.query_count_header = getattr(settings, 'SERVER_TIMING_QUERY_COUNT_HEADER', False)
+        self.slow_ms = getattr(settings, 'SERVER_TIMING_SLOW_MS', None)
+        self.max_queries = getattr(settings, 'SERVER_TIMING_MAX_QUERIES', None)
+        self.slow_queries = getattr(settings, 'SERVER_TIMING_SLOW_QUERIES', 3)
+
+    def __call__(self, request):
+        if self.sample_rate <= 0 or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return self.get_response(request)
+
+        with RequestTimer(slow_queries=self.slow_queries) as timer:
+            request._timer = timer
+            response = self.get_response(request)
+
+        if self.header:
+            response['Server-Timing'] = timer.server_timing()
+        if self.query_count_header:
+            response['X-Query-Count'] = str(timer.queries)
+        self.log(request, response, timer)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timer = getattr(request, '_timer', None)
+        if timer is not None:
+            timer.start_view()
+
+    def log(self, request, response, timer):
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(timer.total_ms, 1),
+            'view_ms': round(timer.view_ms, 1),
+            'db_ms': round(timer.db_ms, 1),
+            'queries': timer.queries,
+            'tpl_ms': round(timer.template_ms, 1),
+        }
+        line = ' '.join(f'{key}={value}' for key, value in fields.items())
+
+        reasons = []
+        if self.slow_ms is not None and timer.total_ms > self.slow_ms:
+            reasons.append(f'slow>{self.slow_ms}ms')
+        if self.max_queries is not None and timer.queries > self.max_queries:
+            reasons.append(f'queries>{self.max_queries}')
+        if not reasons:
+            timing_logger.info(line, extra={'timing': fields})
+            return
+
+        slowest = timer.slowest_queries()
+        fields['slowest_queries'] = [{'ms': round(ms, 1), 'sql': sql} for ms, sql in slowest]
+        details = ''.join(f'\n  {ms:.1f}ms {sql}' for ms, sql in slowest)
+        timing_logger.warning(f"{line} flagged={','.join(reasons)}{details}", extra={'timing': fields})
+
+
+class ProfilingMiddleware:
+    """
+    Profile a sample of requests (PROFILING_SAMPLE_RATE, off by default) and
+    every request from an admin carrying a valid profiling.PROFILE_HEADER
+    token; see core.profiling. Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0)
+        self.mode = getattr(settings, 'PROFILING_MODE', 'cprofile')
+        self.interval = getattr(settings, 'PROFILING_INTERVAL', 0.005)
+
+    def __call__(self, request):
+        requested = profiling.PROFILE_HEADER in request.headers
+        if requested:
+            requested = profiling.check_token(request.headers[profiling.PROFILE_HEADER], request.user)
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (requested or sampled) or not profiling.profile_lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            response, profiler, sampler, elapsed = profiling.profile_call(
+                lambda: self.get_response(request), mode=self.mode, interval=self.interval,
+            )
+            name = profiling.save_profile(request, profiler, sampler, elapsed)
+        finally:
+            profiling.profile_lock.release()
+        if requested:
+            response['X-Profile-Name'] = name
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Record request latency and status per URL name for core.metrics, and
+    periodically flush this worker's totals in multiprocess mode.
+    """
+
+    METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        # URL names, not paths, keep the label set bounded.
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        method = request.method if request.method in self.METHODS else 'other'
+        metrics.http_request_duration.observe(elapsed, view=view, method=method)
+        metrics.http_requests.inc(view=view, method=method, status=response.status_code)
+        metrics.flush()
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with Brotli (if installed) or gzip, whichever the
+    client prefers (see core.compression). Whole responses shorter than
+    COMPRESSION_MIN_LENGTH, or that would not shrink, are sent as they are.
+    Streaming responses are compressed chunk by chunk. Only
+    COMPRESSION_CONTENT_TYPES are compressed. Server-sent event streams are
+    never compressed because proxies and browsers may buffer compressed
+    events. Should come right after the timing middleware so every other
+    middleware sees the uncompressed body.
+
+    Dynamic responses can reflect request input next to secrets, so they are
+    only gzipped, padded with up to COMPRESSION_MAX_RANDOM_BYTES against
+    BREACH. Brotli, which cannot be padded, is kept for STATIC_URL.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'COMPRESSION_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.min_length = getattr(settings, 'COMPRESSION_MIN_LENGTH', 512)
+        self.content_types = set(getattr(settings, 'COMPRESSION_CONTENT_TYPES', ('text/html',)))
+        self.static_url = settings.STATIC_URL or '/static/'
+        if not self.static_url.startswith('/'):
+            self.static_url = '/' + self.static_url
+        self.levels = {
+            'gzip_level': getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6),
+            'brotli_quality': getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5),
+            'max_random_bytes': getattr(settings, 'COMPRESSION_MAX_RANDOM_BYTES', 100),
+        }
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if (
+            content_type not in self.content_types
+            or content_type == 'text/event-stream'
+            or response.has_header('Content-Encoding')
+            or 'no-transform' in response.get('Cache-Control', '')
+            or response.status_code in (204, 206, 304)
+        ):
+            return response
+
+        # Caches must keep one copy per encoding even when this one is not compressed.
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if not response.streaming and len(response.content) < self.min_length:
+            return response
+        if request.path.startswith(self.static_url):
+            encodings = compression.available_encodings()
+        else:
+            encodings = ('gzip',)
+        encoding = compression.negotiate(request.headers.get('Accept-Encoding', ''), encodings)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compression.acompress_stream(
+                    response.streaming_content, encoding, **self.levels,
+                )
+            else:
+                response.streaming_content = compression.compress_stream(
+                    response.streaming_content, encoding, **self.levels,
+                )
+            del response['Content-Length']
+        else:
+            compressed = compression.compress(response.content, encoding, **self.levels)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # The compressed bytes differ, so a strong validator would no longer hold.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+
+class HTMLMinifyMiddleware:
+    """
+    Collapse the indentation of rendered HTML pages (core.compression.minify_html)
+    when HTML_MINIFY is on. Must come after CompressionMiddleware so pages are
+    minified before they are compressed.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'HTML_MINIFY', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or response.get('Content-Type', '').split(';')[0].strip().lower() != 'text/html'
+        ):
+            return response
+
+        response.content = compression.minify_html(response.content.decode(response.charset))
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        return response
+
+
+class StaticCacheControlMiddleware:
+    """
+    Far-future Cache-Control for static files whose names carry a content
+    hash (name.<hash>.ext, written by the manifest storage, core.storage):
+    a changed file gets a new name, so browsers never need to revalidate.
+    Only matters where Django itself serves STATIC_URL.
+    """
+
+    HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.static_url = settings.STATIC_URL or '/static/'
+        if not self.static_url.startswith('/'):
+            self.static_url = '/' + self.static_url
+        self.max_age = getattr(settings, 'STATIC_HASHED_MAX_AGE', 365 * 24 * 3600)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.status_code == 200
+            and request.path.startswith(self.static_url)
+            and self.HASHED_NAME.search(request.path)
+        ):
+            response['Cache-Control'] = f'public, max-age={self.max_age}, immutable'
+        return response
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def index_existing_users(apps, schema_editor):
+    from core.search import user_terms
+
+    User = apps.get_model('core', 'User')
+    UserSearchTerm = apps.get_model('core', 'UserSearchTerm')
+    terms = []
+    for user in User.objects.iterator():
+        tokens, grams = user_terms(user.first_name, user.last_name, user.email, user.student_id, user.employee_id)
+        terms += [UserSearchTerm(user_id=user.pk, kind='t', term=t) for t in tokens]
+        terms += [UserSearchTerm(user_id=user.pk, kind='g', term=g) for g in grams]
+    UserSearchTerm.objects.bulk_create(terms, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_user_degree'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('t', 'Token'), ('g', 'Trigram')], max_length=1)),
+                ('term', models.CharField(max_length=254)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'term'], name='core_usersearch_kind_term')],
+            },
+        ),
+        migrations.RunPython(index_existing_users, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_user_search_terms'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='usersearchterm',
+            name='core_usersearch_kind_term',
+        ),
+        migrations.AddIndex(
+            model_name='usersearchterm',
+            index=models.Index(fields=['kind', 'term', 'user'], name='core_usersearch_kind_term_user'),
+        ),
+    ]
@@ -176,3 +176,35 @@ class VerificationCode(models.Model):
     
     def __str__(self):
         return f"Code for {self.user.email} - {'Used' if self.is_used else 'Active'}"
+
+
+class UserSearchTerm(models.Model):
+    """
+    Normalized search terms for a user, maintained whenever the user is saved.
+    Token rows support indexed prefix lookups; trigram rows support fuzzy matching.
+    """
+    
+    KIND_TOKEN = 't'
+    KIND_TRIGRAM = 'g'
+    
+    KIND_CHOICES = [
+        (KIND_TOKEN, 'Token'),
+        (KIND_TRIGRAM, 'Trigram'),
+    ]
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="search_terms"
+    )
+    kind = models.CharField(max_length=1, choices=KIND_CHOICES)
+    term = models.CharField(max_length=254)
+    
+    class Meta:
+        indexes = [
+            # Covers user_id too, so prefix and trigram lookups never read the table.
+            models.Index(fields=['kind', 'term', 'user'], name='core_usersearch_kind_term_user'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id}: {self.term}"
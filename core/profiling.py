@@ -0,0 +1,150 @@
+"""
+On-demand profiling of live requests (see core.middleware.ProfilingMiddleware).
+
+A profiled request is run under cProfile (mode "cprofile") or only under a
+low-overhead stack sampler (mode "sampler"). Each profile is written to
+PROFILING_DIR as <name>.prof (cProfile, open with snakeviz or pstats) and/or
+<name>.collapsed: one "frame;frame;frame count" line per sampled stack, the
+input format of flamegraph.pl and speedscope. Only the newest
+PROFILING_MAX_PROFILES profiles are kept.
+
+Admins trigger a profile by sending the token from the management
+"Profiles" page in the PROFILE_HEADER request header.
+"""
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+
+PROFILE_HEADER = 'X-Profile-Token'
+EXTENSIONS = ('.prof', '.collapsed')
+TOKEN_SALT = 'core.profiling'
+
+_safe_name = re.compile(r'[^A-Za-z0-9]+')
+# One profiled request at a time: bounds the overhead, and cProfile cannot be
+# active in two threads at once on newer Pythons.
+profile_lock = threading.Lock()
+
+
+def get_profile_dir():
+    return Path(getattr(settings, 'PROFILING_DIR', Path(settings.BASE_DIR) / 'profiles'))
+
+
+def make_token(user):
+    """A header token that lets `user` profile their own requests for a while."""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(str(user.pk))
+
+
+def check_token(token, user):
+    """True if `token` was issued to `user`, is fresh, and the user is still an admin."""
+    if not token or not getattr(user, 'is_authenticated', False):
+        return False
+    if not (user.is_admin or user.is_superuser):
+        return False
+    max_age = getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 3600)
+    try:
+        return signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=max_age) == str(user.pk)
+    except signing.BadSignature:
+        return False
+
+
+class StackSampler(threading.Thread):
+    """Records the stack of another thread every `interval` seconds, collapsed."""
+
+    def __init__(self, thread_id, interval=0.005):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+def profile_call(func, mode='cprofile', interval=0.005):
+    """Run func(); returns (result, profiler or None, sampler, elapsed ms)."""
+    sampler = StackSampler(threading.get_ident(), interval=interval)
+    profiler = cProfile.Profile() if mode == 'cprofile' else None
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        if profiler is not None:
+            result = profiler.runcall(func)
+        else:
+            result = func()
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        sampler.stop()
+    return result, profiler, sampler, elapsed
+
+
+def save_profile(request, profiler, sampler, elapsed_ms):
+    """Write the profile files for `request`, rotate old ones, return the profile name."""
+    directory = get_profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = _safe_name.sub('-', request.path).strip('-') or 'root'
+    name = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{request.method}-{path[:60]}-{elapsed_ms:.0f}ms"
+
+    if profiler is not None:
+        profiler.dump_stats(directory / f'{name}.prof')
+    (directory / f'{name}.collapsed').write_text(sampler.collapsed())
+    rotate(directory, getattr(settings, 'PROFILING_MAX_PROFILES', 50))
+    return name
+
+
+def list_profiles():
+    """Stored profiles, newest first: [{'name', 'created', 'size', 'files': {extension: filename}}]."""
+    directory = get_profile_dir()
+    if not directory.is_dir():
+        return []
+    profiles = {}
+    for entry in directory.iterdir():
+        if entry.suffix not in EXTENSIONS or not entry.is_file():
+            continue
+        stat = entry.stat()
+        profile = profiles.setdefault(entry.stem, {'name': entry.stem, 'created': 0, 'size': 0, 'files': {}})
+        profile['created'] = max(profile['created'], stat.st_mtime)
+        profile['size'] += stat.st_size
+        profile['files'][entry.suffix] = entry.name
+    for profile in profiles.values():
+        profile['created'] = datetime.fromtimestamp(profile['created'])
+    return sorted(profiles.values(), key=lambda profile: profile['name'], reverse=True)
+
+
+def rotate(directory, keep):
+    """Delete all but the newest `keep` profiles (names start with their timestamp)."""
+    for profile in list_profiles()[keep:]:
+        for filename in profile['files'].values():
+            (directory / filename).unlink(missing_ok=True)
+
+
+def get_profile_file(filename):
+    """Path of a stored profile file, or None if `filename` is not one (no traversal)."""
+    if Path(filename).name != filename or Path(filename).suffix not in EXTENSIONS:
+        return None
+    path = get_profile_dir() / filename
+    return path if path.is_file() else None
@@ -0,0 +1,83 @@
+"""
+Read-replica routing for dashboards and reporting.
+
+Nothing is routed to the replica by default. Read-only views opt in with
+@replica_view (reporting code can use `with read_from_replica():`), and
+while that is active every read goes to settings.REPLICA_DATABASE. Writes
+always go to the primary.
+
+A user who has just written is kept on the primary for
+REPLICA_STICKY_SECONDS (see core.middleware.ReplicaStickinessMiddleware), so
+they always see their own changes even if the replica lags behind.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+LAST_WRITE_SESSION_KEY = '_db_last_write'
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def get_replica_alias():
+    """The configured replica alias, or None when no replica is set up."""
+    alias = getattr(settings, 'REPLICA_DATABASE', None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+@contextmanager
+def read_from_replica():
+    """Route reads inside the block to the replica (no-op without one)."""
+    token = _read_alias.set(get_replica_alias())
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def mark_write(request):
+    """Remember that this session just wrote, so its next reads stay on the primary."""
+    if hasattr(request, 'session'):
+        request.session[LAST_WRITE_SESSION_KEY] = time.time()
+
+
+def is_sticky(request):
+    """True while the session is inside its read-your-writes window."""
+    session = getattr(request, 'session', None)
+    last_write = session.get(LAST_WRITE_SESSION_KEY) if session is not None else None
+    window = getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+    return last_write is not None and time.time() - last_write < window
+
+
+def replica_view(view_func):
+    """Serve a read-only view from the replica unless the user has just written."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS or is_sticky(request):
+            return view_func(request, *args, **kwargs)
+        with read_from_replica():
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Database router honouring read_from_replica(); everything else uses the primary."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica is a copy of the primary, so objects from either may be related.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema with the data.
+        return db != get_replica_alias()
@@ -0,0 +1,145 @@
+"""
+Indexed user search for the management user list.
+
+Each user is broken into normalized terms stored in UserSearchTerm:
+- tokens (full email, email local-part pieces, names, student/employee IDs)
+  answered with indexed range scans for prefix matching;
+- trigrams of name and email pieces, used as a fuzzy fallback when no
+  prefix match exists (typos, partial middles of names).
+"""
+import math
+import re
+from collections.abc import Sequence
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import User, UserSearchTerm
+
+# Upper bound for prefix range scans: every term starting with `word` sorts below word + PREFIX_END.
+PREFIX_END = '\uffff'
+
+# Minimum share of the query's trigrams a user must contain to count as a fuzzy match.
+FUZZY_THRESHOLD = 0.4
+
+
+def normalize(value):
+    return (value or '').strip().lower()
+
+
+def trigrams(word):
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def user_terms(first_name, last_name, email, student_id, employee_id):
+    """Return ({tokens}, {trigrams}) for the given user fields."""
+    email = normalize(email)
+    local_part = email.split('@', 1)[0]
+    fuzzy_words = set(re.findall(r'\w+', f"{normalize(first_name)} {normalize(last_name)} {local_part}"))
+
+    tokens = set(fuzzy_words)
+    tokens.update(value for value in (email, normalize(student_id), normalize(employee_id)) if value)
+
+    grams = set()
+    for word in fuzzy_words:
+        grams |= trigrams(word)
+    return tokens, grams
+
+
+def build_terms(user):
+    tokens, grams = user_terms(user.first_name, user.last_name, user.email, user.student_id, user.employee_id)
+    return (
+        [UserSearchTerm(user_id=user.pk, kind=UserSearchTerm.KIND_TOKEN, term=t) for t in tokens]
+        + [UserSearchTerm(user_id=user.pk, kind=UserSearchTerm.KIND_TRIGRAM, term=g) for g in grams]
+    )
+
+
+@transaction.atomic
+def index_user(user):
+    UserSearchTerm.objects.filter(user_id=user.pk).delete()
+    UserSearchTerm.objects.bulk_create(build_terms(user))
+
+
+def rebuild_index(batch_size=1000):
+    """Re-index every user in batches. Returns the number of users indexed."""
+    fields = ('pk', 'first_name', 'last_name', 'email', 'student_id', 'employee_id')
+    UserSearchTerm.objects.all().delete()
+    count = 0
+    batch = []
+    for user in User.objects.only(*fields).order_by('pk').iterator(chunk_size=batch_size):
+        batch.extend(build_terms(user))
+        count += 1
+        if count % batch_size == 0:
+            UserSearchTerm.objects.bulk_create(batch, batch_size=batch_size)
+            batch = []
+    UserSearchTerm.objects.bulk_create(batch, batch_size=batch_size)
+    return count
+
+
+def prefix_matches(word):
+    """Subquery of user ids having a token that starts with `word` (an index range scan)."""
+    return UserSearchTerm.objects.filter(
+        kind=UserSearchTerm.KIND_TOKEN,
+        term__gte=word,
+        term__lt=word + PREFIX_END,
+    ).values('user_id')
+
+
+def fuzzy_matches(words):
+    """User ids ranked by how many of the query's trigrams they share."""
+    grams = set()
+    for word in words:
+        grams |= trigrams(word)
+    needed = max(1, math.ceil(len(grams) * FUZZY_THRESHOLD))
+    return (
+        UserSearchTerm.objects.filter(kind=UserSearchTerm.KIND_TRIGRAM, term__in=grams)
+        .values('user_id')
+        .annotate(hits=Count('id'))
+        .filter(hits__gte=needed)
+        .order_by('-hits')
+    )
+
+
+def search_users(queryset, text):
+    """
+    Filter `queryset` to users matching `text`.
+    Every word must prefix-match one of the user's tokens; if nothing matches,
+    fall back to fuzzy trigram matching. Returns (queryset, is_fuzzy).
+    """
+    words = normalize(text).split()
+    if not words:
+        return queryset, False
+
+    prefixed = queryset
+    for word in words:
+        prefixed = prefixed.filter(pk__in=prefix_matches(word))
+    if prefixed.exists():
+        return prefixed, False
+
+    fuzzy_words = [w for word in words for w in re.findall(r'\w+', word)]
+    ranked_ids = [row['user_id'] for row in fuzzy_matches(fuzzy_words)[:500]]
+    allowed = set(queryset.filter(pk__in=ranked_ids).values_list('pk', flat=True))
+    # Keep the similarity order rather than the default ordering
+    return RankedUsers(queryset, [pk for pk in ranked_ids if pk in allowed]), True
+
+
+class RankedUsers(Sequence):
+    """
+    Users of `queryset` in the order of `pks`. Only the users of the items
+    or slice asked for are loaded, so paginating fuzzy results reads one page.
+    """
+
+    def __init__(self, queryset, pks):
+        self.queryset = queryset
+        self.pks = pks
+
+    def __len__(self):
+        return len(self.pks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            pks = self.pks[index]
+            users = self.queryset.in_bulk(pks)
+            return [users[pk] for pk in pks if pk in users]
+        return self[index:index + 1 or None][0]
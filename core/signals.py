@@ -0,0 +1,18 @@
+"""
+Signal handlers for keeping the user search index up to date.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import User
+from .search import index_user
+
+
+@receiver(post_save, sender=User)
+def update_user_search_terms(sender, instance, update_fields=None, **kwargs):
+    """Re-index a user when a searchable field may have changed."""
+    searchable = {'first_name', 'last_name', 'email', 'student_id', 'employee_id'}
+    if update_fields is not None and not searchable & set(update_fields):
+        # e.g. login only touches last_login
+        return
+    index_user(instance)
@@ -0,0 +1,178 @@
+"""
+Slow query log.
+
+Every database connection gets a SlowQueryLog execute wrapper (installed from
+CoreConfig.ready). A query slower than settings.SLOW_QUERY_MS is written as
+one JSON line to the "core.slow_queries" logger, which settings.LOGGING
+sends to a size-capped, rotating file. Each record holds the normalized SQL
+and its fingerprint, the shape of the parameters, a short summary of the
+project code that issued it and, for SQLite, its EXPLAIN QUERY PLAN.
+
+`manage.py slow_query_report` aggregates the log by fingerprint.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import traceback
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+
+logger = logging.getLogger('core.slow_queries')
+
+_whitespace = re.compile(r'\s+')
+_string_literal = re.compile(r"'(?:[^']|'')*'")
+_number_literal = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?\b')
+_placeholder_list = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+_full_scan = re.compile(r'^SCAN (?!CONSTANT ROW)(?!.*\bUSING\b)|\bSeq Scan\b')
+_explainable = ('SELECT', 'WITH', 'UPDATE', 'DELETE')
+
+_this_file = os.path.abspath(__file__)
+
+
+def normalize_sql(sql):
+    """SQL with literals and placeholder lists replaced, so similar queries compare equal."""
+    sql = _whitespace.sub(' ', sql).strip()
+    sql = _string_literal.sub('?', sql)
+    sql = _number_literal.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    return _placeholder_list.sub('(...)', sql)
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:16]
+
+
+def params_shape(params, many):
+    """'(int, str, datetime)' or '(int, str) x 40' for executemany."""
+    if many:
+        params = list(params or [])
+        first = params[0] if params else ()
+        return f'{params_shape(first, False)} x {len(params)}'
+    if isinstance(params, dict):
+        return '{' + ', '.join(f'{key}: {type(value).__name__}' for key, value in params.items()) + '}'
+    types = [type(value).__name__ for value in (params or ())]
+    if len(types) > 10 and len(set(types)) == 1:
+        return f'({types[0]} x {len(types)})'
+    return '(' + ', '.join(types) + ')'
+
+
+def call_site(limit=5):
+    """The innermost project frames that led to the query, as 'path:line function' strings."""
+    base = str(settings.BASE_DIR)
+    frames = []
+    for frame in traceback.extract_stack()[:-1]:
+        filename = os.path.abspath(frame.filename)
+        if not filename.startswith(base) or filename == _this_file or 'site-packages' in filename:
+            continue
+        frames.append(f'{os.path.relpath(filename, base)}:{frame.lineno} {frame.name}')
+    return frames[-limit:]
+
+
+def explain(connection, sql, params):
+    """EXPLAIN QUERY PLAN lines (SQLite) or EXPLAIN output, run on a raw cursor outside the wrappers."""
+    if connection.vendor == 'sqlite':
+        statement = f'EXPLAIN QUERY PLAN {sql}'
+    elif connection.vendor in ('postgresql', 'mysql'):
+        statement = f'EXPLAIN {sql}'
+    else:
+        return []
+    cursor = connection.create_cursor()
+    try:
+        cursor.execute(statement, params)
+        rows = cursor.fetchall()
+    except Exception:
+        return []
+    finally:
+        cursor.close()
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail): indent children under their parents.
+        depth = {0: -1}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            lines.append('  ' * depth[node_id] + detail)
+        return lines
+    return [' '.join(str(value) for value in row) for row in rows]
+
+
+def has_full_scan(plan):
+    return any(_full_scan.search(line.strip()) for line in plan)
+
+
+class SlowQueryLog:
+    """connection.execute_wrapper that logs queries slower than threshold_ms."""
+
+    def __init__(self, threshold_ms, explain=True):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed = (time.perf_counter() - started) * 1000
+        if elapsed >= self.threshold_ms:
+            try:
+                self.record(sql, params, many, context['connection'], elapsed)
+            except Exception:
+                logger.exception('Could not record slow query')
+        return result
+
+    def record(self, sql, params, many, connection, elapsed):
+        normalized = normalize_sql(sql)
+        explainable = self.explain and not many and sql.lstrip()[:6].upper().startswith(_explainable)
+        plan = explain(connection, sql, params) if explainable else []
+        logger.warning(json.dumps({
+            'time': datetime.now(timezone.utc).isoformat(),
+            'database': connection.alias,
+            'ms': round(elapsed, 2),
+            'fingerprint': fingerprint(normalized),
+            'sql': normalized,
+            'params': params_shape(params, many),
+            'stack': call_site(),
+            'plan': plan,
+            'full_scan': has_full_scan(plan),
+        }))
+
+
+def install(sender, connection, **kwargs):
+    """connection_created receiver: add the slow query log to a new connection."""
+    threshold = getattr(settings, 'SLOW_QUERY_MS', None)
+    if threshold is None:
+        return
+    if not any(isinstance(wrapper, SlowQueryLog) for wrapper in connection.execute_wrappers):
+        # At the bottom: the connection may open inside a scoped execute_wrapper()
+        # (e.g. core.timing.RequestTimer), which pops whatever is on top when it exits.
+        connection.execute_wrappers.insert(
+            0, SlowQueryLog(threshold, explain=getattr(settings, 'SLOW_QUERY_EXPLAIN', True))
+        )
+
+
+class SlowQueryFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that creates its directory, for use from settings.LOGGING."""
+
+    def __init__(self, filename, *args, **kwargs):
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        super().__init__(filename, *args, **kwargs)
+
+
+def read_log(path):
+    """Records from the log file and its rotated backups (oldest first), skipping bad lines."""
+    path = str(path)
+    files = []
+    index = 1
+    while os.path.exists(f'{path}.{index}'):
+        files.append(f'{path}.{index}')
+        index += 1
+    files = files[::-1] + ([path] if os.path.exists(path) else [])
+    for filename in files:
+        with open(filename) as fh:
+            for line in fh:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
@@ -0,0 +1,18 @@
+"""
+Static files storage.
+"""
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+
+class ManifestStaticStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that links the plain name of files missing
+    from the manifest (a fresh checkout, the test runner) instead of
+    raising, so pages still render before the first collectstatic.
+    """
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
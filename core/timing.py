@@ -0,0 +1,120 @@
+"""
+Per-request timing: database time and query count, template render time and
+view time, collected for core.middleware.ServerTimingMiddleware.
+
+While a RequestTimer is active, a connection.execute_wrapper times every
+query (keeping only the SQL of the slowest few) and TimedDjangoTemplates,
+the project's template backend, adds top-level render time to it. Outside
+a timer both are a single ContextVar lookup.
+"""
+import heapq
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from .routers import get_replica_alias
+
+_current = ContextVar('request_timer', default=None)
+
+
+def current_timer():
+    """The RequestTimer of the request being served, or None when not sampled."""
+    return _current.get()
+
+
+class RequestTimer:
+    """Accumulates timings for one request; use as a context manager around it."""
+
+    def __init__(self, slow_queries=3):
+        self.slow_queries = slow_queries
+        self.started = None
+        self.view_started = None
+        self.total_ms = 0.0
+        self.view_ms = 0.0
+        self.db_ms = 0.0
+        self.queries = 0
+        self.template_ms = 0.0
+        self.slowest = []  # min-heap of (ms, sequence, sql)
+        self._render_depth = 0
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in {DEFAULT_DB_ALIAS, get_replica_alias() or DEFAULT_DB_ALIAS}:
+            self._stack.enter_context(connections[alias].execute_wrapper(self._time_query))
+        self._token = _current.set(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        now = time.perf_counter()
+        self.total_ms = (now - self.started) * 1000
+        if self.view_started is not None:
+            self.view_ms = (now - self.view_started) * 1000
+        _current.reset(self._token)
+        self._stack.close()
+
+    def start_view(self):
+        self.view_started = time.perf_counter()
+
+    def _time_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.db_ms += elapsed
+            self.queries += 1
+            if self.slow_queries:
+                entry = (elapsed, self.queries, sql)
+                if len(self.slowest) < self.slow_queries:
+                    heapq.heappush(self.slowest, entry)
+                elif elapsed > self.slowest[0][0]:
+                    heapq.heapreplace(self.slowest, entry)
+
+    def slowest_queries(self):
+        """[(ms, sql)] of the slowest queries seen, slowest first."""
+        return [(ms, sql) for ms, _, sql in sorted(self.slowest, reverse=True)]
+
+    def server_timing(self):
+        """Value for the Server-Timing response header."""
+        return ', '.join([
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template_ms:.1f};desc="Templates"',
+            f'view;dur={self.view_ms:.1f};desc="View"',
+            f'total;dur={self.total_ms:.1f};desc="Total"',
+        ])
+
+
+class TimedTemplate(Template):
+    """Backend template that reports its render time to the active RequestTimer."""
+
+    def render(self, context=None, request=None):
+        timer = _current.get()
+        if timer is None:
+            return super().render(context, request)
+        # Templates rendered while rendering (e.g. render_to_string in a tag) are already counted.
+        timer._render_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timer._render_depth -= 1
+            if not timer._render_depth:
+                timer.template_ms += (time.perf_counter() - started) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with render time reported to core.timing."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -12,4 +12,5 @@ urlpatterns = [
     path("signup/", views.signup, name="signup"),
     path("verify-code/", views.verify_code, name="verify_code"),
     path("logout/", views.logout_view, name="logout"),
+    path("metrics", views.metrics, name="metrics"),
 ]
@@ -1,6 +1,7 @@
 """
 Core authentication views with 2FA for all user roles.
 """
+import hmac
 import random
 import re
 from datetime import timedelta
@@ -13,6 +14,7 @@ from django.shortcuts import redirect, render
 from django.utils import timezone
 from django.conf import settings
 
+from . import metrics as app_metrics
 from .models import User, VerificationCode
 from requests_unified.models import Degree
 
@@ -350,3 +352,11 @@ def verify_code(request: HttpRequest) -> HttpResponse:
     return render(request, "core/verify_code.html", {
         "email": user.email
     })
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    """Prometheus scrape endpoint; requires "Authorization: Bearer METRICS_TOKEN" when that is set."""
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=403)
+    return HttpResponse(app_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -10,9 +10,14 @@ from django.views.decorators.http import require_http_methods
 from django.utils import timezone
 
 from core.models import User
+from core.routers import replica_view
 from requests_unified.models import (
-    Request, StatusHistory, Notification, ApprovalLog, Comment
+    Request, StatusHistory, ApprovalLog, Comment, RequestDetails
 )
+from requests_unified import notifications
+from requests_unified.archive import get_request_or_404, status_type_counts
+from requests_unified.details import normalize_semester
+from requests_unified.search import search_requests
 
 
 def hod_required(view_func):
@@ -37,20 +42,78 @@ def hod_required_api(view_func):
         return view_func(request, *args, **kwargs)
     return wrapper
 
+IN_PROGRESS_STATUSES = [
+    Request.STATUS_NEW, Request.STATUS_IN_PROGRESS,
+    Request.STATUS_SENT_TO_LECTURER, Request.STATUS_NEEDS_INFO,
+]
+
+
+def _rate(part, whole):
+    return round(part / whole * 100, 2) if whole > 0 else 0
+
+
+def _request_statistics():
+    """Request counts overall and per type, over hot and archived requests."""
+    counts = status_type_counts()
+    
+    def count(statuses, request_type=None):
+        return sum(
+            n for (status, type_), n in counts.items()
+            if status in statuses and (request_type is None or type_ == request_type)
+        )
+    
+    approved = count([Request.STATUS_APPROVED])
+    rejected = count([Request.STATUS_REJECTED])
+    processed = approved + rejected
+    
+    type_stats = {}
+    for req_type, label in Request.REQUEST_TYPE_CHOICES:
+        type_approved = count([Request.STATUS_APPROVED], req_type)
+        type_rejected = count([Request.STATUS_REJECTED], req_type)
+        type_stats[req_type] = {
+            'label': label,
+            'total': sum(n for (_, type_), n in counts.items() if type_ == req_type),
+            'approved': type_approved,
+            'rejected': type_rejected,
+            'pending': count([Request.STATUS_SENT_TO_HOD], req_type),
+            'approval_rate': _rate(type_approved, type_approved + type_rejected),
+        }
+    
+    return {
+        'total': sum(counts.values()),
+        'approved': approved,
+        'rejected': rejected,
+        'pending': count([Request.STATUS_SENT_TO_HOD]),
+        'in_progress': count(IN_PROGRESS_STATUSES),
+        'processed': processed,
+        'approval_rate': _rate(approved, processed),
+        'rejection_rate': _rate(rejected, processed),
+        'type_stats': type_stats,
+    }
+
+
 # BSSEF25T9-65: HOD – View Pending Requests (existing dashboard/api_pending_requests)
 @login_required
 @hod_required
+@replica_view
 def dashboard(request: HttpRequest) -> HttpResponse:
     """Head of Department dashboard - view pending requests for final approval."""
     status_filter = request.GET.get("status", "pending")
     request_type = request.GET.get("type", "")
     date_from = request.GET.get("date_from", "")
     date_to = request.GET.get("date_to", "")
+    semester = normalize_semester(request.GET.get("semester", ""))
+    reason_type = request.GET.get("reason_type", "")
+    search = request.GET.get("search", "").strip()
     
-    # Base query - requests sent to HOD or needing final approval
-    requests_qs = Request.objects.filter(
-        status=Request.STATUS_SENT_TO_HOD
-    ).order_by("-created_at")
+    # Base query - requests sent to HOD or needing final approval.
+    # A text search looks through all requests, not only pending ones.
+    if search:
+        requests_qs = Request.objects.select_related("student")
+    else:
+        requests_qs = Request.objects.select_related("student").filter(
+            status=Request.STATUS_SENT_TO_HOD
+        ).order_by("-created_at")
     
     # Apply filters
     if request_type:
@@ -68,12 +131,22 @@ def dashboard(request: HttpRequest) -> HttpResponse:
         except:
             pass
     
-    # Statistics
-    all_requests = Request.objects.all()
-    total = all_requests.count()
-    pending = Request.objects.filter(status=Request.STATUS_SENT_TO_HOD).count()
-    approved = all_requests.filter(status=Request.STATUS_APPROVED).count()
-    rejected = all_requests.filter(status=Request.STATUS_REJECTED).count()
+    # Structured details (indexed columns, no description parsing)
+    if semester:
+        requests_qs = requests_qs.filter(details__semester=semester)
+    
+    if reason_type:
+        requests_qs = requests_qs.filter(details__reason_type=reason_type)
+    
+    if search:
+        requests_qs = search_requests(search, requests_qs)
+    
+    # Statistics (archived requests included)
+    stats = _request_statistics()
+    total = stats['total']
+    pending = stats['pending']
+    approved = stats['approved']
+    rejected = stats['rejected']
     
     context = {
         "requests": requests_qs,
@@ -85,67 +158,30 @@ def dashboard(request: HttpRequest) -> HttpResponse:
         "request_type": request_type,
         "date_from": date_from,
         "date_to": date_to,
+        "semester": semester,
+        "reason_type": reason_type,
+        "search": search,
         "request_types": Request.REQUEST_TYPE_CHOICES,
+        "reason_types": RequestDetails.REASON_TYPE_CHOICES,
     }
     return render(request, "head_of_dept/dashboard.html", context)
 
 
 @login_required
 @hod_required
+@replica_view
 def statistics(request: HttpRequest) -> HttpResponse:
     """View detailed statistics."""
-    all_requests = Request.objects.all()
-    
-    total = all_requests.count()
-    approved = all_requests.filter(status=Request.STATUS_APPROVED).count()
-    rejected = all_requests.filter(status=Request.STATUS_REJECTED).count()
-    pending = all_requests.filter(status=Request.STATUS_SENT_TO_HOD).count()
-    in_progress = all_requests.filter(
-        status__in=[Request.STATUS_NEW, Request.STATUS_IN_PROGRESS, 
-                    Request.STATUS_SENT_TO_LECTURER, Request.STATUS_NEEDS_INFO]
-    ).count()
-    
-    processed = approved + rejected
-    approval_rate = (approved / processed * 100) if processed > 0 else 0
-    rejection_rate = (rejected / processed * 100) if processed > 0 else 0
-    
-    # Stats by type
-    type_stats = {}
-    for req_type, label in Request.REQUEST_TYPE_CHOICES:
-        type_requests = all_requests.filter(request_type=req_type)
-        type_total = type_requests.count()
-        type_approved = type_requests.filter(status=Request.STATUS_APPROVED).count()
-        type_rejected = type_requests.filter(status=Request.STATUS_REJECTED).count()
-        type_processed = type_approved + type_rejected
-        
-        type_stats[req_type] = {
-            'label': label,
-            'total': type_total,
-            'approved': type_approved,
-            'rejected': type_rejected,
-            'pending': type_requests.filter(status=Request.STATUS_SENT_TO_HOD).count(),
-            'approval_rate': round((type_approved / type_processed * 100), 2) if type_processed > 0 else 0,
-        }
+    stats = _request_statistics()
     
-    context = {
-        "total": total,
-        "approved": approved,
-        "rejected": rejected,
-        "pending": pending,
-        "in_progress": in_progress,
-        "processed": processed,
-        "approval_rate": round(approval_rate, 2),
-        "rejection_rate": round(rejection_rate, 2),
-        "type_stats": type_stats,
-    }
-    return render(request, "head_of_dept/statistics.html", context)
+    return render(request, "head_of_dept/statistics.html", stats)
 
 
 @login_required
 @hod_required
 def request_detail(request: HttpRequest, request_id: int) -> HttpResponse:
-    """View request details."""
-    req = get_object_or_404(Request, id=request_id)
+    """View request details (archived requests included)."""
+    req = get_request_or_404(id=request_id)
     documents = req.documents.all()
     status_history = req.status_history.all()
     comments = req.comments.all()
@@ -194,11 +230,7 @@ def approve_request(request: HttpRequest, request_id: int) -> HttpResponse:
         )
         
         # Notify student
-        Notification.objects.create(
-            user=req.student,
-            request=req,
-            message=f"Great news! Your request '{req.title}' has been approved by the Head of Department!"
-        )
+        notifications.notify(req.student, req, 'hod_approved')
         
         messages.success(request, "Request approved successfully!")
         return redirect("head_of_dept:dashboard")
@@ -240,11 +272,7 @@ def reject_request(request: HttpRequest, request_id: int) -> HttpResponse:
         )
         
         # Notify student
-        Notification.objects.create(
-            user=req.student,
-            request=req,
-            message=f"Your request '{req.title}' has been rejected by the Head of Department. Reason: {notes}"
-        )
+        notifications.notify(req.student, req, 'hod_rejected', reason=notes)
         
         messages.success(request, "Request rejected.")
         return redirect("head_of_dept:dashboard")
@@ -269,11 +297,7 @@ def add_final_notes(request: HttpRequest, request_id: int) -> HttpResponse:
         req.save()
         
         # Notify student
-        Notification.objects.create(
-            user=req.student,
-            request=req,
-            message=f"Final notes have been added to your request '{req.title}'."
-        )
+        notifications.notify(req.student, req, 'final_notes')
         
         messages.success(request, "Final notes added successfully.")
     
@@ -317,7 +341,7 @@ def api_pending_requests(request: HttpRequest) -> JsonResponse:
     date_to = request.GET.get('date_to')
     request_type = request.GET.get('request_type')
     
-    query = Request.objects.filter(status=Request.STATUS_SENT_TO_HOD)
+    query = Request.objects.filter(status=Request.STATUS_SENT_TO_HOD).select_related('student')
     
     if date_from:
         try:
@@ -359,50 +383,26 @@ def api_pending_requests(request: HttpRequest) -> JsonResponse:
 @login_required
 @hod_required_api
 @require_http_methods(["GET"])
+@replica_view
 def api_statistics(request: HttpRequest) -> JsonResponse:
     """API: Get statistics."""
-    all_requests = Request.objects.all()
-    
-    total = all_requests.count()
-    approved = all_requests.filter(status=Request.STATUS_APPROVED).count()
-    rejected = all_requests.filter(status=Request.STATUS_REJECTED).count()
-    pending = all_requests.filter(status=Request.STATUS_SENT_TO_HOD).count()
-    in_progress = all_requests.filter(
-        status__in=[Request.STATUS_NEW, Request.STATUS_IN_PROGRESS, 
-                    Request.STATUS_SENT_TO_LECTURER, Request.STATUS_NEEDS_INFO]
-    ).count()
-    
-    processed = approved + rejected
-    approval_rate = (approved / processed * 100) if processed > 0 else 0
-    rejection_rate = (rejected / processed * 100) if processed > 0 else 0
-    
-    type_stats = {}
-    for req_type, label in Request.REQUEST_TYPE_CHOICES:
-        type_requests = all_requests.filter(request_type=req_type)
-        type_total = type_requests.count()
-        type_approved = type_requests.filter(status=Request.STATUS_APPROVED).count()
-        type_rejected = type_requests.filter(status=Request.STATUS_REJECTED).count()
-        type_processed = type_approved + type_rejected
-        
-        type_stats[req_type] = {
-            'total': type_total,
-            'approved': type_approved,
-            'rejected': type_rejected,
-            'pending': type_requests.filter(status=Request.STATUS_SENT_TO_HOD).count(),
-            'approval_rate': round((type_approved / type_processed * 100), 2) if type_processed > 0 else 0,
-        }
+    stats = _request_statistics()
+    type_stats = {
+        req_type: {key: value for key, value in type_stat.items() if key != 'label'}
+        for req_type, type_stat in stats['type_stats'].items()
+    }
     
     return JsonResponse({
         'success': True,
         'statistics': {
-            'total': total,
-            'approved': approved,
-            'rejected': rejected,
-            'pending': pending,
-            'in_progress': in_progress,
-            'processed': processed,
-            'approval_rate': round(approval_rate, 2),
-            'rejection_rate': round(rejection_rate, 2),
+            'total': stats['total'],
+            'approved': stats['approved'],
+            'rejected': stats['rejected'],
+            'pending': stats['pending'],
+            'in_progress': stats['in_progress'],
+            'processed': stats['processed'],
+            'approval_rate': stats['approval_rate'],
+            'rejection_rate': stats['rejection_rate'],
             'by_type': type_stats
         }
     })
@@ -12,8 +12,9 @@ from django.db.models import Q
 
 from core.models import User
 from requests_unified.models import (
-    Request, StatusHistory, Notification, ApprovalLog, Comment
+    Request, StatusHistory, ApprovalLog, Comment
 )
+from requests_unified import notifications
 # BSSEF25T9-66 HOD Approve/Reject
 # BSSEF25T9-161 Lecturer Approve/Reject
 
@@ -53,7 +54,7 @@ def dashboard(request: HttpRequest) -> HttpResponse:
             course__in=taught_courses
         ) |
         Q(assigned_lecturer=user)
-    ).distinct().order_by("-created_at")
+    ).distinct().select_related("student").order_by("-created_at")
     
     # Count statistics
     total = requests_qs.count()
@@ -134,11 +135,7 @@ def approve_request(request: HttpRequest, request_id: int) -> HttpResponse:
         )
         
         # Notify student
-        Notification.objects.create(
-            user=req.student,
-            request=req,
-            message=f"Your request '{req.title}' has been approved by a lecturer!"
-        )
+        notifications.notify(req.student, req, 'lecturer_approved')
         
         messages.success(request, "Request approved successfully!")
         return redirect("lecturers:dashboard")
@@ -182,11 +179,7 @@ def reject_request(request: HttpRequest, request_id: int) -> HttpResponse:
         )
         
         # Notify student
-        Notification.objects.create(
-            user=req.student,
-            request=req,
-            message=f"Your request '{req.title}' has been rejected. Reason: {feedback}"
-        )
+        notifications.notify(req.student, req, 'lecturer_rejected', reason=feedback)
         
         messages.success(request, "Request rejected.")
         return redirect("lecturers:dashboard")
@@ -233,11 +226,7 @@ def needs_info(request: HttpRequest, request_id: int) -> HttpResponse:
         )
         
         # Notify student
-        Notification.objects.create(
-            user=req.student,
-            request=req,
-            message=f"More information needed for your request '{req.title}': {feedback}"
-        )
+        notifications.notify(req.student, req, 'needs_info', feedback=feedback)
         
         messages.success(request, "Request marked as needing more information.")
         return redirect("lecturers:dashboard")
@@ -278,11 +267,7 @@ def forward_to_hod(request: HttpRequest, request_id: int) -> HttpResponse:
         )
         
         # Notify student
-        Notification.objects.create(
-            user=req.student,
-            request=req,
-            message=f"Your request '{req.title}' has been forwarded to the Head of Department."
-        )
+        notifications.notify(req.student, req, 'lecturer_sent_to_hod')
         
         messages.success(request, "Request forwarded to Head of Department.")
         return redirect("lecturers:dashboard")
@@ -0,0 +1,31 @@
+"""
+Pagination helpers for large admin lists.
+"""
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that stops counting after `count_limit` rows.
+
+    Search results only need to know whether there are "more than N" matches,
+    so the count query is bounded instead of scanning every match.
+    `is_estimate` tells templates to render the count as "N+".
+    """
+
+    def __init__(self, object_list, per_page, count_limit=1000, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_limit = count_limit
+        self.is_estimate = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return len(self.object_list)
+        count = self.object_list[:self.count_limit + 1].count()
+        if count > self.count_limit:
+            self.is_estimate = True
+            return self.count_limit
+        return count
@@ -26,4 +26,6 @@ urlpatterns = [
     path('courses/add/', views.course_add, name='course_add'),
     path('courses/<int:course_id>/edit/', views.course_edit, name='course_edit'),
     path('courses/<int:course_id>/delete/', views.course_delete, name='course_delete'),
+    path('profiles/', views.profile_list, name='profile_list'),
+    path('profiles/<str:filename>/', views.profile_download, name='profile_download'),
 ]
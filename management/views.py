@@ -3,15 +3,21 @@ Admin user management views.
 """
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
+from django.http import FileResponse, Http404
 from django.core.paginator import Paginator
 from django.db.models import Q, Count
 
+from core import profiling
 from core.models import User
+from core.routers import replica_view
+from core.search import search_users
 from requests_unified.models import Degree, Course
 from .decorators import admin_required, course_manager_required
+from .pagination import EstimatedCountPaginator
 
 
 @admin_required
+@replica_view
 def dashboard(request):
     """Admin dashboard with user statistics."""
     # Get user counts by role
@@ -40,31 +46,29 @@ def dashboard(request):
 @admin_required
 def user_list(request):
     """List all users with search and filter."""
-    users = User.objects.all().order_by('-date_joined')
-    
-    # Search
-    search = request.GET.get('search', '').strip()
-    if search:
-        users = users.filter(
-            Q(email__icontains=search) |
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(student_id__icontains=search) |
-            Q(employee_id__icontains=search)
-        )
+    users = User.objects.select_related('degree').order_by('-date_joined')
     
     # Filter by role
     role_filter = request.GET.get('role', '')
     if role_filter:
         users = users.filter(role=role_filter)
     
-    # Pagination
-    paginator = Paginator(users, 15)
+    # Search (indexed prefix match, fuzzy fallback - see core.search)
+    search = request.GET.get('search', '').strip()
+    fuzzy = False
+    if search:
+        users, fuzzy = search_users(users, search)
+        paginator = EstimatedCountPaginator(users, 15)
+    else:
+        paginator = Paginator(users, 15)
+    
     page = request.GET.get('page', 1)
     users_page = paginator.get_page(page)
     
     context = {
         'users': users_page,
+        'paginator': paginator,
+        'fuzzy': fuzzy,
         'search': search,
         'role_filter': role_filter,
         'role_choices': User.ROLE_CHOICES,
@@ -412,7 +416,7 @@ def course_list(request):
     courses = courses.annotate(
         lecturer_count=Count('lecturers', distinct=True),
         request_count=Count('requests', distinct=True)
-    ).distinct()
+    ).distinct().prefetch_related('degrees')
     
     degrees = Degree.objects.filter(is_active=True)
     
@@ -453,7 +457,7 @@ def course_add(request):
             return render(request, 'management/course_form.html', {
                 'form_data': request.POST,
                 'degrees': Degree.objects.filter(is_active=True),
-                'lecturers': User.objects.filter(role=User.ROLE_LECTURER, is_active=True),
+                'lecturers': User.objects.filter(role=User.ROLE_LECTURER, id__in=lecturer_ids),
                 'selected_degrees': degree_ids,
                 'selected_lecturers': lecturer_ids,
                 'is_edit': False,
@@ -473,7 +477,7 @@ def course_add(request):
     
     context = {
         'degrees': Degree.objects.filter(is_active=True),
-        'lecturers': User.objects.filter(role=User.ROLE_LECTURER, is_active=True),
+        'lecturers': User.objects.none(),
         'is_edit': False,
     }
     return render(request, 'management/course_form.html', context)
@@ -510,7 +514,7 @@ def course_edit(request, course_id):
                 'course': course,
                 'form_data': request.POST,
                 'degrees': Degree.objects.filter(is_active=True),
-                'lecturers': User.objects.filter(role=User.ROLE_LECTURER, is_active=True),
+                'lecturers': User.objects.filter(role=User.ROLE_LECTURER, id__in=lecturer_ids),
                 'selected_degrees': degree_ids,
                 'selected_lecturers': lecturer_ids,
                 'is_edit': True,
@@ -529,7 +533,7 @@ def course_edit(request, course_id):
     context = {
         'course': course,
         'degrees': Degree.objects.filter(is_active=True),
-        'lecturers': User.objects.filter(role=User.ROLE_LECTURER, is_active=True),
+        'lecturers': course.lecturers.all(),
         'selected_degrees': list(course.degrees.values_list('id', flat=True)),
         'selected_lecturers': list(course.lecturers.values_list('id', flat=True)),
         'is_edit': True,
@@ -556,3 +560,23 @@ def course_delete(request, course_id):
         'request_count': request_count,
     }
     return render(request, 'management/course_delete.html', context)
+
+
+@admin_required
+def profile_list(request):
+    """List stored request profiles and show the header token for profiling a request."""
+    context = {
+        'profiles': profiling.list_profiles(),
+        'profile_header': profiling.PROFILE_HEADER,
+        'profile_token': profiling.make_token(request.user),
+    }
+    return render(request, 'management/profile_list.html', context)
+
+
+@admin_required
+def profile_download(request, filename):
+    """Download a .prof or .collapsed profile file."""
+    path = profiling.get_profile_file(filename)
+    if path is None:
+        raise Http404("Profile not found.")
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=filename)
@@ -13,7 +13,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 django.setup()
 
 from django.contrib.auth import get_user_model
-from requests_unified.models import Request, StatusHistory, Notification, Degree, Course
+from requests_unified import notifications
+from requests_unified.models import Request, StatusHistory, Degree, Course
 
 User = get_user_model()
 
@@ -377,11 +378,7 @@ def create_sample_requests(users, degrees, courses):
             )
         
         # Create notification
-        Notification.objects.create(
-            user=student,
-            request=request,
-            message=f"Your request '{request.title}' has been submitted."
-        )
+        notifications.notify(student, request, 'submitted')
         
         print(f"  Created: {req_data['title']} ({request.get_status_display()})")
 
@@ -1,10 +1,16 @@
 from django.contrib import admin
 from .models import (
     Request, StatusHistory, StaffNote, RequestDocument,
-    MissingDocument, Comment, ApprovalLog, Notification
+    MissingDocument, Comment, ApprovalLog, Notification, ArchivedRequest, RequestDetails
 )
 
 
+class RequestDetailsInline(admin.StackedInline):
+    model = RequestDetails
+    can_delete = False
+    extra = 0
+
+
 @admin.register(Request)
 class RequestAdmin(admin.ModelAdmin):
     list_display = ('request_id', 'title', 'student', 'request_type', 'status', 'priority', 'created_at')
@@ -12,6 +18,7 @@ class RequestAdmin(admin.ModelAdmin):
     search_fields = ('request_id', 'title', 'student__email', 'student__username')
     readonly_fields = ('request_id', 'created_at', 'updated_at')
     date_hierarchy = 'created_at'
+    inlines = [RequestDetailsInline]
     
     fieldsets = (
         ('Request Info', {
@@ -82,6 +89,14 @@ class ApprovalLogAdmin(admin.ModelAdmin):
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ('user', 'request', 'is_read', 'created_at')
-    list_filter = ('is_read', 'created_at')
+    list_display = ('user', 'request', 'code', 'is_read', 'created_at')
+    list_filter = ('code', 'is_read', 'created_at')
     search_fields = ('user__email', 'message')
+
+
+@admin.register(ArchivedRequest)
+class ArchivedRequestAdmin(admin.ModelAdmin):
+    list_display = ('request_id', 'title', 'student', 'request_type', 'status', 'created_at', 'archived_at')
+    list_filter = ('status', 'request_type', 'archived_at')
+    search_fields = ('request_id', 'title', 'student__email')
+    readonly_fields = [field.name for field in ArchivedRequest._meta.fields]
@@ -0,0 +1,234 @@
+"""
+Versioned JSON API (/api/v1/) for requests, shared by every role.
+
+Rows are read with values() and turned into dicts by serializers compiled
+once per call from the requested fields, so no model instances are built
+and only the columns (and joins) the client asked for with ?fields= are
+selected. Lists are keyset-paginated newest first with an opaque cursor.
+
+Responses carry a weak ETag derived from the ids and updated_at of the rows
+they contain; a matching If-None-Match is answered with 304 before the
+rows are read and serialized. Changes that do not touch updated_at, such as
+a renamed course or student, are picked up once the request next changes.
+"""
+import base64
+import binascii
+import hashlib
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from operator import itemgetter
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.models import User
+from .models import Request
+
+API_VERSION = 'v1'
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class APIError(Exception):
+    """Bad client input; the view answers 400 with the message."""
+
+
+# ============================================
+# SCOPING
+# ============================================
+
+API_ROLES = [User.ROLE_STUDENT, User.ROLE_SECRETARY, User.ROLE_LECTURER, User.ROLE_HEAD_OF_DEPT]
+
+
+def visible_requests(user):
+    """Requests the user may read, matching what their dashboards and detail pages show."""
+    if user.role == User.ROLE_STUDENT:
+        return Request.objects.filter(student=user)
+    if user.role == User.ROLE_LECTURER:
+        return Request.objects.filter(
+            Q(status__in=[Request.STATUS_SENT_TO_LECTURER, Request.STATUS_NEEDS_INFO],
+              course__in=user.taught_courses.all())
+            | Q(assigned_lecturer=user)
+        )
+    if user.role in (User.ROLE_SECRETARY, User.ROLE_HEAD_OF_DEPT):
+        return Request.objects.all()
+    return Request.objects.none()
+
+
+# ============================================
+# SERIALIZERS
+# ============================================
+
+def _full_name(prefix):
+    first, last, username = f'{prefix}__first_name', f'{prefix}__last_name', f'{prefix}__username'
+
+    def get(row):
+        if row[username] is None:
+            return None
+        return f'{row[first]} {row[last]}'.strip() or row[username]
+    return (first, last, username), get
+
+
+# API field -> values() lookup, or (lookups, function of the row)
+REQUEST_FIELDS = {
+    'id': 'id',
+    'request_id': 'request_id',
+    'title': 'title',
+    'description': 'description',
+    'request_type': 'request_type',
+    'status': 'status',
+    'priority': 'priority',
+    'course': 'course__code',
+    'student_name': _full_name('student'),
+    'student_email': 'student__email',
+    'lecturer_name': _full_name('assigned_lecturer'),
+    'lecturer_feedback': 'lecturer_feedback',
+    'final_notes': 'final_notes',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+DEFAULT_LIST_FIELDS = [
+    'id', 'request_id', 'title', 'request_type', 'status', 'priority', 'course', 'student_name',
+    'created_at', 'updated_at',
+]
+
+
+def parse_fields(value, default):
+    """Requested field names from ?fields=a,b (default if absent); APIError on unknown names."""
+    if not value:
+        return list(default)
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in REQUEST_FIELDS]
+    if unknown:
+        raise APIError(f"Unknown field(s): {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+
+def compile_serializer(fields):
+    """(values() lookups, function turning one values() row into the API dict) for fields."""
+    lookups, getters = ['id'], []
+    for name in fields:
+        source = REQUEST_FIELDS[name]
+        if isinstance(source, str):
+            lookups.append(source)
+            getters.append((name, itemgetter(source)))
+        else:
+            lookups.extend(source[0])
+            getters.append((name, source[1]))
+    lookups = list(dict.fromkeys(lookups))
+
+    def serialize(row):
+        return {name: get(row) for name, get in getters}
+    return lookups, serialize
+
+
+# ============================================
+# FILTERING
+# ============================================
+
+def _choices(value, choices, name):
+    allowed = {key for key, _ in choices}
+    values = [v.strip() for v in value.split(',') if v.strip()]
+    unknown = [v for v in values if v not in allowed]
+    if unknown:
+        raise APIError(f"Unknown {name}: {', '.join(unknown)}")
+    return values
+
+
+def _day_start(value, name, days=0):
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        raise APIError(f"{name} must be a date (YYYY-MM-DD)")
+    # Compare the column with bounds rather than created_at__date so the index is used.
+    return timezone.make_aware(datetime.combine(day + timedelta(days=days), time.min))
+
+
+def filter_requests(queryset, params):
+    """Apply ?status=, type=, priority=, course=, created_from=, created_to= and updated_since=."""
+    if params.get('status'):
+        queryset = queryset.filter(status__in=_choices(params['status'], Request.STATUS_CHOICES, 'status'))
+    if params.get('type'):
+        queryset = queryset.filter(
+            request_type__in=_choices(params['type'], Request.REQUEST_TYPE_CHOICES, 'type')
+        )
+    if params.get('priority'):
+        queryset = queryset.filter(
+            priority__in=_choices(params['priority'], Request.PRIORITY_CHOICES, 'priority')
+        )
+    if params.get('course'):
+        queryset = queryset.filter(course__code__iexact=params['course'])
+    if params.get('created_from'):
+        queryset = queryset.filter(created_at__gte=_day_start(params['created_from'], 'created_from'))
+    if params.get('created_to'):
+        queryset = queryset.filter(created_at__lt=_day_start(params['created_to'], 'created_to', days=1))
+    if params.get('updated_since'):
+        since = parse_datetime(params['updated_since'])
+        if since is None:
+            raise APIError("updated_since must be an ISO 8601 date-time")
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        queryset = queryset.filter(updated_at__gt=since)
+    return queryset
+
+
+# ============================================
+# PAGINATION AND ETAGS
+# ============================================
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_cursor(created_at, pk):
+    micros = (created_at - EPOCH) // timedelta(microseconds=1)
+    return base64.urlsafe_b64encode(f'{micros}:{pk}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    try:
+        micros, pk = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode().split(':')
+        created_at = EPOCH + timedelta(microseconds=int(micros))
+        return created_at, int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError, OverflowError):
+        raise APIError("Invalid cursor")
+
+
+def page_size(value):
+    if not value:
+        return PAGE_SIZE
+    try:
+        size = int(value)
+    except ValueError:
+        raise APIError("limit must be an integer")
+    return min(max(size, 1), MAX_PAGE_SIZE)
+
+
+def page_keys(queryset, cursor=None, size=PAGE_SIZE):
+    """
+    (pks, updated_at values, next cursor) of one page, newest first. Only
+    reads the ordering columns, so it is cheap enough to run before deciding
+    whether the page has to be sent at all.
+    """
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    keys = list(queryset.order_by('-created_at', '-pk').values_list('pk', 'created_at', 'updated_at')[:size + 1])
+    next_cursor = encode_cursor(keys[size - 1][1], keys[size - 1][0]) if len(keys) > size else None
+    keys = keys[:size]
+    return [pk for pk, _, _ in keys], [updated_at for _, _, updated_at in keys], next_cursor
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(repr((API_VERSION,) + parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match', '')
+    return header.strip() == '*' or etag in [tag.strip() for tag in header.split(',')]
+
+
+def fetch(queryset, pks, lookups, serialize):
+    """Serialized rows for pks, in the order given."""
+    rows = {row['id']: row for row in queryset.filter(pk__in=pks).order_by().values(*lookups)}
+    return [serialize(rows[pk]) for pk in pks if pk in rows]
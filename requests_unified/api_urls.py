@@ -0,0 +1,13 @@
+"""
+Version 1 of the JSON REST API (see requests_unified.api).
+"""
+from django.urls import path
+from . import views
+
+app_name = "api_v1"
+
+urlpatterns = [
+    path("requests/", views.api_request_list, name="request_list"),
+    path("requests/<str:request_id>/", views.api_request_detail, name="request_detail"),
+    path("batch/", views.api_batch, name="batch"),
+]
@@ -0,0 +1,167 @@
+"""
+Archival of old closed requests into cold storage.
+
+Approved and rejected requests that have not changed for a while are moved,
+with every row that cascades from them (status history, comments, notes,
+approval logs, documents, notifications...), into ArchivedRequest: a few
+indexed columns for listings and statistics plus a JSON copy of everything.
+The hot tables, and all of their indexes, only keep live requests.
+
+Archived requests are rebuilt on demand as ordinary (unsaved) Request
+instances whose related managers are pre-filled, so the existing detail
+templates render them unchanged.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import CASCADE, Count, FileField
+from django.http import Http404
+
+from . import notifications, sync
+from .models import ArchivedDocumentFile, ArchivedRequest, ChangeLog, Notification, Request
+
+CLOSED_STATUSES = [Request.STATUS_APPROVED, Request.STATUS_REJECTED]
+
+
+def child_relations():
+    """Reverse relations whose rows are deleted with a Request (and so must be archived)."""
+    return [
+        rel for rel in Request._meta.related_objects
+        if (rel.one_to_many or rel.one_to_one) and rel.on_delete is CASCADE
+    ]
+
+
+def dump_instance(obj):
+    """Concrete field values of a model instance, keyed by attname."""
+    row = {}
+    for field in obj._meta.concrete_fields:
+        value = field.value_from_object(obj)
+        if isinstance(field, FileField):
+            value = value.name
+        row[field.attname] = value
+    return row
+
+
+def load_instance(model, row):
+    """Rebuild an unsaved-but-not-new instance from dump_instance() output."""
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    obj = model(**{name: fields[name].to_python(value) for name, value in row.items() if name in fields})
+    obj._state.adding = False
+    return obj
+
+
+# ============================================
+# ARCHIVING
+# ============================================
+
+def archivable_requests(before):
+    """Closed requests last updated before the cutoff."""
+    return Request.objects.filter(status__in=CLOSED_STATUSES, updated_at__lt=before)
+
+
+@transaction.atomic
+def archive_batch(pks):
+    """Move one batch of requests (and their child rows) into the archive. Returns the number moved."""
+    requests = list(Request.objects.filter(pk__in=pks, status__in=CLOSED_STATUSES))
+    if not requests:
+        return 0
+    pks = [req.pk for req in requests]
+
+    children = {req.pk: {} for req in requests}
+    files = []
+    for rel in child_relations():
+        file_fields = [f for f in rel.related_model._meta.concrete_fields if isinstance(f, FileField)]
+        for child in rel.related_model._base_manager.filter(**{f'{rel.field.name}__in': pks}).order_by('pk'):
+            request_pk = getattr(child, rel.field.attname)
+            children[request_pk].setdefault(rel.get_accessor_name(), []).append(dump_instance(child))
+            files.extend(
+                ArchivedDocumentFile(request_id=request_pk, file=getattr(child, f.attname).name)
+                for f in file_fields if getattr(child, f.attname)
+            )
+
+    ArchivedRequest.objects.bulk_create([
+        ArchivedRequest(
+            id=req.pk,
+            request_id=req.request_id,
+            student_id=req.student_id,
+            course_id=req.course_id,
+            title=req.title,
+            request_type=req.request_type,
+            status=req.status,
+            priority=req.priority,
+            created_at=req.created_at,
+            updated_at=req.updated_at,
+            data={'request': dump_instance(req), 'children': children[req.pk]},
+        )
+        for req in requests
+    ])
+    ArchivedDocumentFile.objects.bulk_create(files)
+
+    cascaded = list(Notification.objects.filter(request_id__in=pks).values_list('pk', 'user_id', 'is_read'))
+    Request.objects.filter(pk__in=pks).delete()
+    notifications.recount({user_id for _, user_id, is_read in cascaded if not is_read})
+    # Request deletions are logged by signals; notifications go with their request
+    # but are logged too, for users who do not sync the request itself.
+    sync.record((user_id, ChangeLog.ENTITY_NOTIFICATION, pk) for pk, user_id, _ in cascaded)
+    return len(pks)
+
+
+def restore_request(archived):
+    """Rebuild an archived request as a Request instance with pre-fetched child rows."""
+    req = load_instance(Request, archived.data['request'])
+    req.is_archived = True
+    req.archived_at = archived.archived_at
+
+    stored = archived.data.get('children', {})
+    req._prefetched_objects_cache = {}
+    for rel in child_relations():
+        rows = [load_instance(rel.related_model, row) for row in stored.get(rel.get_accessor_name(), [])]
+        for row in rows:
+            rel.field.set_cached_value(row, req)
+        if rel.one_to_one:
+            rel.set_cached_value(req, rows[0] if rows else None)
+            continue
+
+        # Rows were stored in pk (creation) order; match a newest-first Meta.ordering.
+        ordering = rel.related_model._meta.ordering
+        if ordering and ordering[0].startswith('-'):
+            rows.reverse()
+
+        # Same shape as prefetch_related(): a queryset whose results are already known.
+        queryset = rel.related_model._default_manager.all()
+        queryset._result_cache = rows
+        queryset._prefetch_done = True
+        req._prefetched_objects_cache[rel.cache_name] = queryset
+    return req
+
+
+# ============================================
+# READING
+# ============================================
+
+def get_request_or_404(**lookup):
+    """Fetch a request from the hot table, falling back to the archive."""
+    try:
+        return Request.objects.get(**lookup)
+    except Request.DoesNotExist:
+        pass
+    archived = ArchivedRequest.objects.filter(**lookup).first()
+    if archived is None:
+        raise Http404("No request matches the given query.")
+    return archived.as_request()
+
+
+def status_type_counts(student=None):
+    """
+    Counter of (status, request_type) -> number of requests, over hot and archived
+    requests together. Two grouped queries instead of one count per combination.
+    """
+    counts = Counter()
+    for model in (Request, ArchivedRequest):
+        queryset = model.objects.all()
+        if student is not None:
+            queryset = queryset.filter(student=student)
+        rows = queryset.order_by().values('status', 'request_type').annotate(n=Count('pk'))
+        for row in rows:
+            counts[row['status'], row['request_type']] += row['n']
+    return counts
@@ -0,0 +1,122 @@
+"""
+Batch workflow operations: several review actions in one API call.
+
+Each operation names one of the existing workflow views (OPERATIONS), the
+request it applies to and the form data the view expects. Operations run
+in order inside a single transaction by calling the view itself with a
+POST sub-request, so validation, permissions, status history and
+notifications are exactly those of the regular forms. The redirect the
+view answers with is not followed, so no page is rendered; the messages it
+adds become the operation's result.
+
+The first operation that fails (an error message, a 4xx response, or a
+missing request) rolls the whole batch back and the remaining operations
+are skipped.
+"""
+from django.contrib.messages import constants as message_constants
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import resolve, reverse
+
+MAX_OPERATIONS = 50
+
+# Operation name -> URL name of the view that performs it (all take the request pk).
+OPERATIONS = {
+    'staff.add_note': 'staff:add_note',
+    'staff.request_docs': 'staff:request_docs',
+    'staff.send_to_lecturer': 'staff:send_to_lecturer',
+    'staff.send_to_hod': 'staff:send_to_hod',
+    'lecturer.approve': 'lecturers:approve',
+    'lecturer.reject': 'lecturers:reject',
+    'lecturer.needs_info': 'lecturers:needs_info',
+    'lecturer.forward_to_hod': 'lecturers:forward_to_hod',
+    'hod.approve': 'head_of_dept:approve',
+    'hod.reject': 'head_of_dept:reject',
+    'hod.add_notes': 'head_of_dept:add_notes',
+    'hod.add_comment': 'head_of_dept:add_comment',
+}
+
+
+class BatchError(Exception):
+    """The batch itself is malformed; nothing was run."""
+
+
+class _CollectedMessages(list):
+    """Stands in for the messages storage of a sub-request."""
+
+    def add(self, level, message, extra_tags=''):
+        self.append((level, str(message)))
+
+
+def parse(payload):
+    """Validated [(op, request pk, data)] from the decoded JSON body; BatchError otherwise."""
+    operations = payload.get('operations') if isinstance(payload, dict) else None
+    if not isinstance(operations, list) or not operations:
+        raise BatchError("'operations' must be a non-empty list")
+    if len(operations) > MAX_OPERATIONS:
+        raise BatchError(f"At most {MAX_OPERATIONS} operations per batch")
+
+    parsed = []
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise BatchError(f"Operation {index} must be an object")
+        op, request_pk, data = operation.get('op'), operation.get('request'), operation.get('data', {})
+        if op not in OPERATIONS:
+            raise BatchError(f"Operation {index}: unknown op {op!r}")
+        if not isinstance(request_pk, int) or isinstance(request_pk, bool):
+            raise BatchError(f"Operation {index}: 'request' must be a request id")
+        if not isinstance(data, dict) or not all(isinstance(v, (str, int, float)) for v in data.values()):
+            raise BatchError(f"Operation {index}: 'data' must map field names to values")
+        parsed.append((op, request_pk, data))
+    return parsed
+
+
+def _sub_request(request, path, data):
+    sub = HttpRequest()
+    sub.method = 'POST'
+    sub.path = sub.path_info = path
+    sub.META = request.META.copy()
+    sub.COOKIES = request.COOKIES
+    sub.POST = QueryDict(mutable=True)
+    for key, value in data.items():
+        sub.POST[key] = str(value)
+    sub.user = request.user
+    sub.session = request.session
+    sub._messages = _CollectedMessages()
+    return sub
+
+
+def execute(request, operations):
+    """Run parsed operations in one transaction; returns (all succeeded, per-operation results)."""
+    results = []
+    with transaction.atomic():
+        for index, (op, request_pk, data) in enumerate(operations):
+            path = reverse(OPERATIONS[op], args=[request_pk])
+            sub = _sub_request(request, path, data)
+            match = resolve(path)
+            sub.resolver_match = match
+            try:
+                response = match.func(sub, *match.args, **match.kwargs)
+                status = response.status_code
+            except Http404:
+                status = 404
+            except PermissionDenied:
+                status = 403
+            errors = [text for level, text in sub._messages if level >= message_constants.ERROR]
+            ok = status < 400 and not errors
+            results.append({
+                'index': index,
+                'op': op,
+                'request': request_pk,
+                'ok': ok,
+                'status': status,
+                'messages': [text for _, text in sub._messages],
+            })
+            if not ok:
+                transaction.set_rollback(True)
+                break
+    succeeded = len(results) == len(operations) and all(result['ok'] for result in results)
+    for index, (op, request_pk, _) in enumerate(operations[len(results):], start=len(results)):
+        results.append({'index': index, 'op': op, 'request': request_pk, 'ok': False, 'skipped': True})
+    return succeeded, results
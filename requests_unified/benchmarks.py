@@ -0,0 +1,265 @@
+"""
+View-level benchmarks: query count, wall time and peak memory per view.
+
+Each entry of VIEW_BENCHMARKS names a URL, the role that opens it and how to
+pick its arguments from the current data. run_benchmarks() drives them
+through the test client, so it needs a populated database (see the
+benchmark_views command, which builds one with generate_load_data) and
+check_budgets() compares the results with settings.VIEW_BENCHMARK_BUDGETS.
+compare_serialization() times the per-row cost of the JSON endpoints,
+measure_transfer() the body bytes each view sends, before and after
+minification and compression, and measure_user_search() the user search
+behind the management user list.
+"""
+import statistics
+import time
+import tracemalloc
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from core.models import User
+from core.routers import get_replica_alias
+from core.search import search_users
+from . import api
+from .models import Request
+
+METRICS = ('queries', 'ms', 'memory_kb')
+
+
+def _busiest(role, related):
+    """The user of `role` with the most related rows: the worst case for their pages."""
+    return (
+        User.objects.filter(role=role, is_active=True)
+        .annotate(n=Count(related)).order_by('-n', 'pk').first()
+    )
+
+
+def _busiest_request(**filters):
+    """The request with the longest history, i.e. the heaviest detail page."""
+    return (
+        Request.objects.filter(**filters)
+        .annotate(n=Count('status_history')).order_by('-n', 'pk').first()
+    )
+
+
+def pick_fixtures():
+    """Users and requests the benchmarks open, chosen from the current data."""
+    student = _busiest(User.ROLE_STUDENT, 'student_requests')
+    lecturer = _busiest(User.ROLE_LECTURER, 'lecturer_assigned_requests')
+    admin = User.objects.filter(role=User.ROLE_ADMIN, is_active=True).order_by('pk').first()
+    if admin is None:
+        admin = User.objects.create_user(
+            username='benchmark.admin', email='benchmark.admin@sce.ac.il', password=None,
+            role=User.ROLE_ADMIN, first_name='Benchmark', last_name='Admin',
+        )
+    return {
+        User.ROLE_STUDENT: student,
+        User.ROLE_SECRETARY: _busiest(User.ROLE_SECRETARY, 'staff_assigned_requests'),
+        User.ROLE_LECTURER: lecturer,
+        User.ROLE_HEAD_OF_DEPT: _busiest(User.ROLE_HEAD_OF_DEPT, 'hod_assigned_requests'),
+        User.ROLE_ADMIN: admin,
+        'student_request': _busiest_request(student=student),
+        'lecturer_request': _busiest_request(assigned_lecturer=lecturer) or _busiest_request(),
+        'request': _busiest_request(),
+    }
+
+
+# (url name, role, fixture key whose value supplies the URL argument, attribute)
+VIEW_BENCHMARKS = [
+    ('students:dashboard', User.ROLE_STUDENT, None, None),
+    ('students:request_detail', User.ROLE_STUDENT, 'student_request', 'request_id'),
+    ('staff:dashboard', User.ROLE_SECRETARY, None, None),
+    ('staff:request_detail', User.ROLE_SECRETARY, 'request', 'pk'),
+    ('lecturers:dashboard', User.ROLE_LECTURER, None, None),
+    ('lecturers:request_detail', User.ROLE_LECTURER, 'lecturer_request', 'pk'),
+    ('head_of_dept:dashboard', User.ROLE_HEAD_OF_DEPT, None, None),
+    ('head_of_dept:statistics', User.ROLE_HEAD_OF_DEPT, None, None),
+    ('head_of_dept:request_detail', User.ROLE_HEAD_OF_DEPT, 'request', 'pk'),
+    ('head_of_dept:api_pending_requests', User.ROLE_HEAD_OF_DEPT, None, None),
+    ('head_of_dept:api_statistics', User.ROLE_HEAD_OF_DEPT, None, None),
+    ('api_v1:request_list', User.ROLE_HEAD_OF_DEPT, None, None),
+    ('api_v1:request_detail', User.ROLE_STUDENT, 'student_request', 'request_id'),
+    ('management:dashboard', User.ROLE_ADMIN, None, None),
+    ('management:user_list', User.ROLE_ADMIN, None, None),
+    ('management:degree_list', User.ROLE_ADMIN, None, None),
+    ('management:course_list', User.ROLE_ADMIN, None, None),
+]
+
+
+def measure(client, url, repeat=3):
+    """Query count, median wall time (ms) and peak traced memory (KiB) of GET url."""
+    response = client.get(url)  # warm-up: template loading, lazy imports, caches
+    if response.status_code != 200:
+        raise RuntimeError(f'GET {url} returned {response.status_code}')
+
+    timings = []
+    for _ in range(max(repeat, 1)):
+        # replica_view pages read from the replica when one is configured.
+        aliases = {DEFAULT_DB_ALIAS, get_replica_alias() or DEFAULT_DB_ALIAS}
+        with ExitStack() as stack:
+            captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in aliases]
+            started = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = sum(len(capture) for capture in captured)
+
+    # Measured separately: tracemalloc slows allocation-heavy code several-fold.
+    tracemalloc.start()
+    try:
+        client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'queries': queries, 'ms': statistics.median(timings), 'memory_kb': peak / 1024}
+
+
+def _targets(names=None):
+    """(url name, user, url) of every benchmark (or the given url names) the current data can open."""
+    fixtures = pick_fixtures()
+    for name, role, fixture, attr in VIEW_BENCHMARKS:
+        if names and name not in names:
+            continue
+        user = fixtures[role]
+        if user is None or (fixture and fixtures[fixture] is None):
+            continue  # the dataset has nobody/nothing to open this page with
+        args = [getattr(fixtures[fixture], attr)] if fixture else []
+        yield name, user, reverse(name, args=args)
+
+
+def _client_for(clients, user):
+    if user.pk not in clients:
+        clients[user.pk] = Client()
+        clients[user.pk].force_login(user)
+    return clients[user.pk]
+
+
+def run_benchmarks(names=None, repeat=3):
+    """Measure every benchmark (or the given url names); returns {name: metrics}."""
+    clients = {}
+    return {
+        name: measure(_client_for(clients, user), url, repeat=repeat)
+        for name, user, url in _targets(names)
+    }
+
+
+def measure_transfer(names=None):
+    """
+    Response body bytes of every benchmark (or the given url names):
+    {name: {'raw', 'minified', 'gzip'}}. "raw" is the page with HTML_MINIFY
+    off; "gzip" is the minified page as the middleware sends it, padding
+    included. Views are never sent with Brotli (see CompressionMiddleware).
+    """
+    results = {}
+    clients, raw_clients = {}, {}
+    for name, user, url in _targets(names):
+        client = _client_for(clients, user)
+        with override_settings(HTML_MINIFY=False):
+            # Middleware settings are read when a client's handler is first used.
+            raw = len(_client_for(raw_clients, user).get(url).content)
+        results[name] = {
+            'raw': raw,
+            'minified': len(client.get(url).content),
+            'gzip': len(client.get(url, HTTP_ACCEPT_ENCODING='gzip').content),
+        }
+    return results
+
+
+# The fields head_of_dept:api_pending_requests returns, requested from the v1 API.
+SERIALIZATION_FIELDS = [
+    'id', 'request_id', 'title', 'description', 'request_type', 'status', 'priority', 'created_at',
+    'student_name', 'student_email',
+]
+
+
+def compare_serialization(repeat=3):
+    """
+    Per-row cost of the HOD's pending-requests endpoint (model instances,
+    one dict built per row) and of the v1 API (values() rows) returning the
+    same rows and fields; {url name: measure() metrics + rows, us_per_row}.
+    """
+    hod = User.objects.filter(role=User.ROLE_HEAD_OF_DEPT, is_active=True).order_by('pk').first()
+    if hod is None:
+        return {}
+    client = Client()
+    client.force_login(hod)
+    pending = Request.objects.filter(status=Request.STATUS_SENT_TO_HOD).count()
+    urls = {
+        'head_of_dept:api_pending_requests': (reverse('head_of_dept:api_pending_requests'), pending),
+        'api_v1:request_list': (
+            f"{reverse('api_v1:request_list')}?status={Request.STATUS_SENT_TO_HOD}"
+            f"&limit={api.MAX_PAGE_SIZE}&fields={','.join(SERIALIZATION_FIELDS)}",
+            min(pending, api.MAX_PAGE_SIZE),
+        ),
+    }
+    results = {}
+    for name, (url, rows) in urls.items():
+        measured = measure(client, url, repeat=repeat)
+        measured.update(rows=rows, us_per_row=measured['ms'] * 1000 / rows if rows else 0.0)
+        results[name] = measured
+    return results
+
+
+def user_search_queries():
+    """{label: query} for the user search, built from a student in the middle of the table."""
+    students = User.objects.filter(role=User.ROLE_STUDENT).order_by('pk')
+    user = students[students.count() // 2] if students.exists() else None
+    if user is None:
+        return {}
+    last = user.last_name.split()[0]
+    return {
+        'first name prefix': user.first_name[:3],
+        'full name': f'{user.first_name} {user.last_name}',
+        'email': user.email,
+        # One letter dropped, so no token matches and the trigram fallback runs.
+        'misspelled (fuzzy)': last[:2] + last[3:] if len(last) > 3 else last + 'x',
+    }
+
+
+def measure_user_search(repeat=3):
+    """
+    Median wall time (ms) of core.search.search_users() over every user plus
+    reading the first page of 15, as the management user list does;
+    {label: {'query', 'ms', 'fuzzy'}}.
+    """
+    results = {}
+    users = User.objects.select_related('degree').order_by('-date_joined')
+    for label, query in user_search_queries().items():
+        timings = []
+        for _ in range(max(repeat, 1) + 1):  # the first run warms the page cache
+            started = time.perf_counter()
+            matches, fuzzy = search_users(users, query)
+            list(matches[:15])
+            timings.append((time.perf_counter() - started) * 1000)
+        results[label] = {'query': query, 'ms': statistics.median(timings[1:]), 'fuzzy': fuzzy}
+    return results
+
+
+def get_budgets(overrides=None):
+    """Per-view budgets: settings defaults, per-view settings, then `overrides`."""
+    layers = [getattr(settings, 'VIEW_BENCHMARK_BUDGETS', {}), overrides or {}]
+    budgets = {}
+    for name, _, _, _ in VIEW_BENCHMARKS:
+        budgets[name] = {}
+        for layer in layers:
+            budgets[name].update(layer.get('default', {}))
+        for layer in layers:
+            budgets[name].update(layer.get(name, {}))
+    return budgets
+
+
+def check_budgets(results, budgets, metrics=METRICS):
+    """Human-readable descriptions of every metric over its budget."""
+    violations = []
+    for name, measured in results.items():
+        for metric in metrics:
+            limit = budgets.get(name, {}).get(metric)
+            if limit is not None and measured[metric] > limit:
+                violations.append(f'{name}: {metric} {measured[metric]:.0f} > budget {limit}')
+    return violations
@@ -0,0 +1,14 @@
+"""
+Template context shared by every page.
+"""
+from django.utils.functional import SimpleLazyObject
+
+from . import notifications
+
+
+def unread_notifications(request):
+    """Unread notification count for the navbar badge, only queried if a template uses it."""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    return {'unread_notifications': SimpleLazyObject(lambda: notifications.unread_count(user.pk))}
@@ -0,0 +1,76 @@
+"""
+Structured request details (RequestDetails).
+
+The request form used to pack its per-type fields into the description text
+("Semester: Spring 2026\\nReason: ..."). The same fields are now stored as
+typed, indexed columns. clean_details() validates raw form values and
+parse_description() recovers them from existing descriptions for the backfill.
+"""
+import re
+
+from django.utils.dateparse import parse_date
+
+from .models import RequestDetails
+
+# Description line label -> RequestDetails field
+DESCRIPTION_LABELS = {
+    'Department': 'department',
+    'Semester': 'semester',
+    'Semester to Postpone': 'semester',
+    'Grade Received': 'grade_received',
+    'Expected Grade': 'expected_grade',
+    'Reason Type': 'reason_type',
+    'Expected Return Date': 'return_date',
+    'Category': 'category',
+}
+EMPTY_VALUES = {'', 'Not specified'}
+
+LINE_RE = re.compile(r'^\s*([A-Za-z ]+?)\s*:\s*(.*?)\s*$', re.MULTILINE)
+GRADE_RE = re.compile(r'\d{1,3}')
+
+REASON_TYPES = {value for value, _ in RequestDetails.REASON_TYPE_CHOICES}
+
+
+def normalize_semester(value):
+    """'  spring   2026' -> 'Spring 2026', so filters can use an exact (indexed) match."""
+    return ' '.join((value or '').split()).title()
+
+
+def parse_grade(value):
+    match = GRADE_RE.search(value or '')
+    if match and int(match.group()) <= 100:
+        return int(match.group())
+    return None
+
+
+def clean_details(raw):
+    """Typed RequestDetails field values from raw strings (form input or parsed text)."""
+    raw = {key: (value or '').strip() for key, value in raw.items()}
+    raw = {key: value for key, value in raw.items() if value not in EMPTY_VALUES}
+
+    details = {}
+    if 'semester' in raw:
+        details['semester'] = normalize_semester(raw['semester'])[:50]
+    for field in ('grade_received', 'expected_grade'):
+        if field in raw:
+            details[field] = parse_grade(raw[field])
+    if raw.get('reason_type') in REASON_TYPES:
+        details['reason_type'] = raw['reason_type']
+    if 'return_date' in raw:
+        try:
+            details['return_date'] = parse_date(raw['return_date'])
+        except ValueError:
+            pass
+    if 'category' in raw:
+        details['category'] = raw['category'][:100]
+    return details
+
+
+def parse_description(description):
+    """Raw field values found in a generated description (unknown lines are ignored)."""
+    raw = {}
+    for label, value in LINE_RE.findall(description or ''):
+        field = DESCRIPTION_LABELS.get(label)
+        if field and field not in raw:
+            raw[field] = value
+    return raw
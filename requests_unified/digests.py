@@ -0,0 +1,124 @@
+"""
+Email delivery of notifications, immediately or as digests.
+
+Notifications with emailed_at NULL form the email queue. Each run of
+`manage.py send_notification_emails` groups the queue by recipient and
+applies the recipient's NotificationPreference (or the settings default
+for their role):
+
+- immediate: one email per notification;
+- digest: one summary of everything queued, once the oldest queued
+  notification is digest_hours old;
+- none: the queue is cleared without sending.
+
+Messages go out over one backend connection per batch of
+NOTIFICATION_EMAIL_BATCH_SIZE, and a batch's notifications are marked
+emailed only after the batch was sent, so a failed run is retried.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Count, Min
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from core.models import User
+from .models import Notification, NotificationPreference
+
+# Digests list at most this many notifications, then "... and N more"
+DIGEST_MAX_ITEMS = 50
+
+
+def default_delivery(role):
+    defaults = getattr(settings, 'NOTIFICATION_EMAIL_ROLE_DEFAULTS', {})
+    return defaults.get(role, getattr(settings, 'NOTIFICATION_EMAIL_DEFAULT', NotificationPreference.DELIVERY_IMMEDIATE))
+
+
+def get_delivery(user, preference=None):
+    """(email_delivery, digest_hours) for user, given their preference row if they have one."""
+    if preference is not None:
+        return preference.email_delivery, preference.digest_hours
+    return default_delivery(user.role), getattr(settings, 'NOTIFICATION_DIGEST_HOURS', 24)
+
+
+def plan(now=None):
+    """
+    (messages, skipped) for the current queue. messages is a list of
+    (EmailMessage, notification pks it covers); skipped are the pks of
+    queued notifications for users who get no email.
+    """
+    now = now or timezone.now()
+    queued = {
+        row['user_id']: row for row in
+        Notification.objects.filter(emailed_at__isnull=True).order_by()
+        .values('user_id').annotate(oldest=Min('created_at'), n=Count('pk'))
+    }
+    if not queued:
+        return [], []
+    users = User.objects.in_bulk(list(queued))
+    preferences = NotificationPreference.objects.in_bulk(list(queued))
+
+    due, skip_users = {}, []
+    for user_id, row in queued.items():
+        user = users.get(user_id)
+        delivery, hours = get_delivery(user, preferences.get(user_id)) if user else (None, 0)
+        if user is None or not user.email or delivery == NotificationPreference.DELIVERY_NONE:
+            skip_users.append(user_id)
+        elif delivery == NotificationPreference.DELIVERY_IMMEDIATE:
+            due[user_id] = delivery
+        elif row['oldest'] <= now - timedelta(hours=hours):
+            due[user_id] = delivery
+
+    skipped = list(
+        Notification.objects.filter(user_id__in=skip_users, emailed_at__isnull=True).values_list('pk', flat=True)
+    )
+    pending = {}
+    for notification in (
+        Notification.objects.filter(user_id__in=list(due), emailed_at__isnull=True)
+        .select_related('request').order_by('user_id', 'created_at', 'pk')
+    ):
+        pending.setdefault(notification.user_id, []).append(notification)
+
+    messages = []
+    for user_id, items in pending.items():
+        user = users[user_id]
+        if due[user_id] == NotificationPreference.DELIVERY_IMMEDIATE:
+            messages.extend((single_message(user, item), [item.pk]) for item in items)
+        else:
+            messages.append((digest_message(user, items), [item.pk for item in items]))
+    return messages, skipped
+
+
+def single_message(user, notification):
+    request = notification.request
+    subject = f'SCE Portal - {request.request_id}' if request else 'SCE Portal - Notification'
+    body = render_to_string('emails/notification.txt', {'user': user, 'notification': notification})
+    return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email])
+
+
+def digest_message(user, notifications):
+    subject = f"SCE Portal - {len(notifications)} new notification{'s' if len(notifications) != 1 else ''}"
+    body = render_to_string('emails/notification_digest.txt', {
+        'user': user,
+        'notifications': notifications[:DIGEST_MAX_ITEMS],
+        'more': max(len(notifications) - DIGEST_MAX_ITEMS, 0),
+    })
+    return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email])
+
+
+def deliver(messages, skipped, batch_size=None):
+    """Send planned messages over one connection per batch; returns (emails sent, connections opened)."""
+    batch_size = batch_size or getattr(settings, 'NOTIFICATION_EMAIL_BATCH_SIZE', 100)
+    if skipped:
+        Notification.objects.filter(pk__in=skipped).update(emailed_at=timezone.now())
+
+    sent = connections = 0
+    for start in range(0, len(messages), batch_size):
+        batch = messages[start:start + batch_size]
+        connection = get_connection(fail_silently=False)
+        connection.send_messages([message for message, _ in batch])
+        connections += 1
+        sent += len(batch)
+        Notification.objects.filter(pk__in=[pk for _, pks in batch for pk in pks]).update(emailed_at=timezone.now())
+    return sent, connections
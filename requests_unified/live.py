@@ -0,0 +1,186 @@
+"""
+Live notifications over server-sent events.
+
+The database is the source of truth: a stream keeps a cursor (last
+Notification id, last StatusHistory id) and sends every row after it that
+concerns its user, so a reconnecting browser resumes from Last-Event-ID
+without gaps. The in-process pub/sub below is only a doorbell: when a row
+is committed, publish() wakes that user's streams in this process at once.
+Streams in other worker processes never hear the doorbell and pick the row
+up on their next poll (settings.LIVE_NOTIFICATIONS_POLL_INTERVAL).
+
+Holding a stream open needs an ASGI server. Under WSGI (runserver, or
+gunicorn with sync workers) each open stream would hold a worker thread, so
+poll() answers instead: it sends what is pending and ends. The browser
+reconnects after the `retry` interval with Last-Event-ID, which makes it a
+short poll over the same protocol.
+"""
+import asyncio
+import json
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .models import Notification, Request, StatusHistory
+from .notification_messages import render as render_message
+
+BATCH_SIZE = 50
+
+_subscribers = {}  # user id -> {asyncio.Event: its event loop}
+_lock = threading.Lock()
+
+
+def subscribe(user_id):
+    """An asyncio.Event set whenever something is published for user_id; call from the stream's loop."""
+    event = asyncio.Event()
+    with _lock:
+        _subscribers.setdefault(user_id, {})[event] = asyncio.get_running_loop()
+    return event
+
+
+def unsubscribe(user_id, event):
+    with _lock:
+        events = _subscribers.get(user_id, {})
+        events.pop(event, None)
+        if not events:
+            _subscribers.pop(user_id, None)
+
+
+def publish(user_id):
+    """Wake every stream of user_id in this process (safe from any thread)."""
+    with _lock:
+        events = list(_subscribers.get(user_id, {}).items())
+    for event, loop in events:
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:  # the stream's loop has closed
+            pass
+
+
+# ============================================
+# CURSORS AND EVENTS
+# ============================================
+
+def parse_cursor(value):
+    """'<notification id>-<status history id>' from Last-Event-ID, or None."""
+    try:
+        notification_id, history_id = (int(part) for part in value.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    return notification_id, history_id
+
+
+def format_cursor(cursor):
+    return f'{cursor[0]}-{cursor[1]}'
+
+
+def current_cursor(user_id):
+    """The newest ids now, so a fresh stream only sends what happens from here on."""
+    notification_id = (
+        Notification.objects.filter(user_id=user_id).order_by('-pk').values_list('pk', flat=True).first()
+    )
+    history_id = (
+        StatusHistory.objects.filter(request__student_id=user_id).order_by('-pk').values_list('pk', flat=True).first()
+    )
+    return notification_id or 0, history_id or 0
+
+
+def fetch_events(user_id, cursor):
+    """
+    (events, new cursor) for rows after cursor. Each event is (name, cursor
+    after it, data), so a client that drops mid-batch resumes at that event.
+    """
+    notification_after, history_after = cursor
+    events = []
+
+    notifications = (
+        Notification.objects.filter(user_id=user_id, pk__gt=notification_after)
+        .order_by('pk').values(
+            'pk', 'code', 'params', 'message', 'is_read', 'created_at', 'request__request_id', 'request__title',
+        )[:BATCH_SIZE]
+    )
+    for row in notifications:
+        notification_after = row['pk']
+        events.append(('notification', (notification_after, history_after), {
+            'id': row['pk'],
+            'message': render_message(row['code'], row['params'], row['request__title'], row['message']),
+            'is_read': row['is_read'],
+            'request_id': row['request__request_id'],
+            'created_at': row['created_at'].isoformat(),
+        }))
+
+    status_labels = dict(Request.STATUS_CHOICES)
+    history = (
+        StatusHistory.objects.filter(request__student_id=user_id, pk__gt=history_after)
+        .order_by('pk').values('pk', 'status', 'description', 'created_at', 'request__request_id')[:BATCH_SIZE]
+    )
+    for row in history:
+        history_after = row['pk']
+        events.append(('status', (notification_after, history_after), {
+            'id': row['pk'],
+            'request_id': row['request__request_id'],
+            'status': row['status'],
+            'status_display': status_labels.get(row['status'], row['status']),
+            'description': row['description'],
+            'created_at': row['created_at'].isoformat(),
+        }))
+
+    return events, (notification_after, history_after)
+
+
+def encode(name, data, cursor):
+    return f'event: {name}\nid: {format_cursor(cursor)}\ndata: {json.dumps(data)}\n\n'
+
+
+async def stream(user_id, cursor=None):
+    """
+    SSE body for user_id: new notifications and status changes, a comment
+    line as keep-alive, and an end after LIVE_NOTIFICATIONS_MAX_AGE seconds
+    (the browser reconnects with Last-Event-ID).
+    """
+    poll_interval = getattr(settings, 'LIVE_NOTIFICATIONS_POLL_INTERVAL', 5)
+    keepalive = getattr(settings, 'LIVE_NOTIFICATIONS_KEEPALIVE', 15)
+    deadline = time.monotonic() + getattr(settings, 'LIVE_NOTIFICATIONS_MAX_AGE', 300)
+
+    event = subscribe(user_id)
+    try:
+        if cursor is None:
+            cursor = await sync_to_async(current_cursor)(user_id)
+        yield f'retry: {int(poll_interval * 1000)}\n\n'
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            event.clear()  # before fetching: a publish during the fetch rings again
+            events, cursor = await sync_to_async(fetch_events)(user_id, cursor)
+            for name, event_cursor, data in events:
+                yield encode(name, data, event_cursor)
+            if events:
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= keepalive:
+                yield ': keepalive\n\n'
+                last_sent = time.monotonic()
+            if len(events) >= BATCH_SIZE:
+                continue  # more rows are waiting
+            try:
+                await asyncio.wait_for(event.wait(), timeout=min(poll_interval, max(deadline - time.monotonic(), 0)))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        unsubscribe(user_id, event)
+
+
+def poll(user_id, cursor=None):
+    """
+    Short-poll SSE body for WSGI servers: the rows pending now, then the end
+    of the response. The final id line moves the browser's Last-Event-ID
+    past them even when nothing was sent.
+    """
+    poll_interval = getattr(settings, 'LIVE_NOTIFICATIONS_POLL_INTERVAL', 5)
+    if cursor is None:
+        cursor = current_cursor(user_id)
+    yield f'retry: {int(poll_interval * 1000)}\n\n'
+    events, cursor = fetch_events(user_id, cursor)
+    for name, event_cursor, data in events:
+        yield encode(name, data, event_cursor)
+    yield f'id: {format_cursor(cursor)}\n\n'
@@ -0,0 +1,318 @@
+"""
+Role-mix HTTP load generator (see the load_test command).
+
+Each virtual user is a thread with its own cookie jar. It logs in through
+the real two-step login: after the password step it reads its verification
+code straight from the database (the server under test must share the
+database and should use a non-sending mail backend, e.g.
+EMAIL_BACKEND=django.core.mail.backends.locmem.EmailBackend). It then runs
+weighted scenarios for its role, with exponential think time between them,
+until the deadline. Every scenario run is timed end to end; summarize()
+reports throughput and latency percentiles per scenario.
+"""
+import http.cookiejar
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+
+from django.db import close_old_connections, connection
+from django.urls import reverse
+
+from core.models import User, VerificationCode
+
+
+class LoadTestError(Exception):
+    pass
+
+
+def _id_pattern(url_name):
+    """Regex capturing the id from links to `url_name` (whose single argument is an id)."""
+    return re.compile(re.escape(reverse(url_name, args=[987654321])).replace('987654321', r'(\d+)'))
+
+
+class VirtualUser:
+    """An HTTP session for one synthetic user."""
+
+    def __init__(self, base_url, user, password, rng, timeout=30, bulk_size=5):
+        self.base_url = base_url.rstrip('/')
+        self.user = user
+        self.password = password
+        self.rng = rng
+        self.timeout = timeout
+        self.bulk_size = bulk_size
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+
+    # -- HTTP ------------------------------------------------------------
+
+    def _csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == 'csrftoken':
+                return cookie.value
+        return ''
+
+    def request(self, path, data=None, files=None):
+        """GET (or POST when data/files are given) and return (final url, body text)."""
+        headers = {}
+        body = None
+        if files:
+            boundary = uuid.uuid4().hex
+            body = _multipart(data or {}, files, boundary)
+            headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
+        elif data is not None:
+            body = urllib.parse.urlencode(data).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if body is not None:
+            headers['X-CSRFToken'] = self._csrf_token()
+            headers['Referer'] = self.base_url + path
+
+        req = urllib.request.Request(self.base_url + path, data=body, headers=headers)
+        try:
+            with self.opener.open(req, timeout=self.timeout) as response:
+                return response.geturl(), response.read().decode('utf-8', 'replace')
+        except urllib.error.HTTPError as exc:
+            raise LoadTestError(f'{exc.code} on {path}') from exc
+        except urllib.error.URLError as exc:
+            raise LoadTestError(f'{exc.reason} on {path}') from exc
+        except OSError as exc:  # timeouts and dropped connections while reading
+            raise LoadTestError(f'{exc} on {path}') from exc
+
+    def get(self, url_name, *args, query=''):
+        return self.request(reverse(url_name, args=args) + query)
+
+    def post(self, url_name, *args, data=None, files=None):
+        return self.request(reverse(url_name, args=args), data=data or {}, files=files)
+
+    # -- Login -------------------------------------------------------------
+
+    def login(self):
+        """Password step, then the emailed code, read from the database."""
+        self.get('core:login')
+        url, _ = self.post('core:login', data={'email': self.user.email, 'password': self.password})
+        if reverse('core:verify_code') not in url:
+            raise LoadTestError(f'password step failed for {self.user.email}')
+
+        code = (
+            VerificationCode.objects.filter(user_id=self.user.pk, is_used=False)
+            .order_by('-created_at').values_list('code', flat=True).first()
+        )
+        url, _ = self.post('core:verify_code', data={'code': code or ''})
+        if reverse('core:verify_code') in url or reverse('core:login') in url:
+            raise LoadTestError(f'verification step failed for {self.user.email}')
+
+
+def _multipart(fields, files, boundary):
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, filename, content_type, content in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + content + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts)
+
+
+# ============================================
+# SCENARIOS
+# ============================================
+
+ATTACHMENT = b'%PDF-1.4\n% synthetic load-test attachment\n' + b'0' * 20000 + b'\n%%EOF\n'
+
+
+def student_dashboard(vu):
+    vu.get('students:dashboard')
+
+
+def _select_options(html, name):
+    """(option values, selected value or None) of the <select name="..."> in html."""
+    select = re.search(rf'<select name="{name}".*?</select>', html, re.DOTALL)
+    if not select:
+        return [], None
+    values = re.findall(r'<option value="(\d+)"', select.group())
+    selected = re.search(r'<option value="(\d+)"\s*selected', select.group())
+    return values, selected.group(1) if selected else None
+
+
+def student_submit(vu):
+    """Fill in the appeal form as a student would: department select, course typeahead, attachment."""
+    _, html = vu.get('students:submit_request')
+    departments, own = _select_options(html, 'department')
+    department = own or (vu.rng.choice(departments) if departments else '')
+    # The course field is a typeahead, so a student picks from its suggestions.
+    _, body = vu.get('typeahead:courses', query=f'?degree={department}' if department else '')
+    courses = [str(item['id']) for item in json.loads(body).get('results', [])]
+    vu.post('students:submit_request', data={
+        'request_type': 'Appeal',
+        'title': f'Load test appeal {uuid.uuid4().hex[:8]}',
+        'priority': 'medium',
+        'department': department,
+        'course': vu.rng.choice(courses) if courses else '',
+        'grade_received': str(vu.rng.randint(40, 70)),
+        'expected_grade': str(vu.rng.randint(71, 95)),
+        'reason': 'Grading error in question 3.',
+    }, files=[('file', 'grades.pdf', 'application/pdf', ATTACHMENT)])
+
+
+def staff_dashboard(vu):
+    vu.get('staff:dashboard')
+
+
+def staff_forward(vu):
+    """Open a new request and forward it to one of the offered lecturers."""
+    _, html = vu.get('staff:dashboard', query='?status=new')
+    ids = _id_pattern('staff:request_detail').findall(html)
+    if not ids:
+        return
+    request_id = vu.rng.choice(ids[:20])
+    _, detail = vu.get('staff:request_detail', request_id)
+    select = re.search(r'name="lecturer_id".*?</select>', detail, re.DOTALL)
+    lecturers = re.findall(r'<option value="(\d+)"', select.group()) if select else []
+    if lecturers:
+        vu.post('staff:send_to_lecturer', request_id, data={'lecturer_id': vu.rng.choice(lecturers)})
+
+
+def lecturer_dashboard(vu):
+    vu.get('lecturers:dashboard')
+
+
+def lecturer_decision(vu):
+    """Review a pending request and approve, reject or forward it to the HOD."""
+    _, html = vu.get('lecturers:dashboard', query='?status=pending')
+    ids = _id_pattern('lecturers:request_detail').findall(html)
+    if not ids:
+        return
+    request_id = vu.rng.choice(ids[:20])
+    vu.get('lecturers:request_detail', request_id)
+    action = vu.rng.choices(['lecturers:forward_to_hod', 'lecturers:approve', 'lecturers:reject'], [6, 3, 1])[0]
+    vu.post(action, request_id, data={'feedback': 'Reviewed during load test.'})
+
+
+def hod_dashboard(vu):
+    vu.get('head_of_dept:dashboard')
+
+
+def hod_bulk_review(vu):
+    """Fetch the pending queue and decide a batch of it."""
+    _, body = vu.get('head_of_dept:api_pending_requests')
+    pending = [item['id'] for item in json.loads(body).get('requests', [])]
+    for request_id in pending[:vu.bulk_size]:
+        action = 'head_of_dept:approve' if vu.rng.random() < 0.8 else 'head_of_dept:reject'
+        vu.post(action, request_id, data={'notes': 'Bulk reviewed.'})
+
+
+# role -> [(scenario name, weight, function)]
+SCENARIOS = {
+    User.ROLE_STUDENT: [
+        ('student_dashboard', 6, student_dashboard),
+        ('student_submit', 1, student_submit),
+    ],
+    User.ROLE_SECRETARY: [
+        ('staff_dashboard', 4, staff_dashboard),
+        ('staff_forward', 1, staff_forward),
+    ],
+    User.ROLE_LECTURER: [
+        ('lecturer_dashboard', 4, lecturer_dashboard),
+        ('lecturer_decision', 1, lecturer_decision),
+    ],
+    User.ROLE_HEAD_OF_DEPT: [
+        ('hod_dashboard', 3, hod_dashboard),
+        ('hod_bulk_review', 1, hod_bulk_review),
+    ],
+}
+
+
+# ============================================
+# RUNNER
+# ============================================
+
+def _virtual_user(base_url, user, password, deadline, think_time, seed, results, errors, start_delay, options):
+    rng = random.Random(seed)
+    names, weights, functions = zip(*SCENARIOS[user.role])
+    samples = []
+    try:
+        time.sleep(start_delay)
+        vu = VirtualUser(base_url, user, password, rng, **options)
+        started = time.perf_counter()
+        try:
+            vu.login()
+            samples.append(('login', time.perf_counter() - started, True))
+        except Exception as exc:
+            samples.append(('login', time.perf_counter() - started, False))
+            errors.append(f'login: {exc}')
+            return
+        finally:
+            close_old_connections()
+
+        while time.monotonic() < deadline:
+            index = rng.choices(range(len(names)), weights)[0]
+            started = time.perf_counter()
+            try:
+                functions[index](vu)
+                samples.append((names[index], time.perf_counter() - started, True))
+            except Exception as exc:
+                samples.append((names[index], time.perf_counter() - started, False))
+                errors.append(f'{names[index]}: {exc}')
+            if think_time > 0:
+                time.sleep(min(rng.expovariate(1 / think_time), max(deadline - time.monotonic(), 0)))
+    finally:
+        results.extend(samples)  # list.extend is atomic
+        connection.close()
+
+
+def run_load(base_url, users, password, duration, think_time=1.0, ramp_up=0.0, seed=42, timeout=30, bulk_size=5):
+    """Run every user in `users` as a virtual user for `duration` seconds; returns (samples, errors, elapsed)."""
+    results, errors = [], []
+    started = time.monotonic()
+    deadline = started + ramp_up + duration
+    options = {'timeout': timeout, 'bulk_size': bulk_size}
+    threads = []
+    for i, user in enumerate(users):
+        delay = ramp_up * i / max(len(users), 1)
+        thread = threading.Thread(
+            target=_virtual_user,
+            args=(base_url, user, password, deadline, think_time, seed + i, results, errors, delay, options),
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return results, errors, time.monotonic() - started
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    """{scenario: {'count', 'errors', 'rps', 'p50', 'p90', 'p95', 'p99', 'max'}} with latencies in ms."""
+    by_scenario = {}
+    for name, seconds, ok in samples:
+        by_scenario.setdefault(name, []).append((seconds * 1000, ok))
+    summary = {}
+    for name, values in sorted(by_scenario.items()):
+        latencies = sorted(ms for ms, _ in values)
+        summary[name] = {
+            'count': len(values),
+            'errors': sum(1 for _, ok in values if not ok),
+            'rps': len(values) / elapsed if elapsed else 0.0,
+            'p50': percentile(latencies, 0.50),
+            'p90': percentile(latencies, 0.90),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+            'max': latencies[-1],
+        }
+    return summary
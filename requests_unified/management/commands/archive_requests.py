@@ -0,0 +1,55 @@
+"""
+Move old closed requests into the archive tables.
+
+Requests are processed in primary-key order, one transaction per batch, so the
+command can be interrupted and re-run safely and never holds the write lock
+for long.
+"""
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from requests_unified.archive import archivable_requests, archive_batch
+
+
+class Command(BaseCommand):
+    help = 'Archive approved/rejected requests that have not changed since a cutoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=365,
+                            help='Archive requests last updated more than N days ago (default: 365)')
+        parser.add_argument('--before', help='Archive requests last updated before this date (YYYY-MM-DD)')
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help='Requests moved per transaction (default: 200)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many requests would be archived')
+
+    def handle(self, *args, **options):
+        if options['before']:
+            try:
+                cutoff = timezone.make_aware(datetime.strptime(options['before'], '%Y-%m-%d'))
+            except ValueError:
+                raise CommandError('--before must be a date in YYYY-MM-DD format.')
+        else:
+            cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+
+        candidates = archivable_requests(cutoff)
+        if options['dry_run']:
+            self.stdout.write(f'Would archive {candidates.count()} requests closed before {cutoff:%Y-%m-%d}.')
+            return
+
+        archived = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                candidates.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not pks:
+                break
+            archived += archive_batch(pks)
+            last_pk = pks[-1]
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  ... archived {archived} requests')
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} requests closed before {cutoff:%Y-%m-%d}.'))
@@ -0,0 +1,48 @@
+"""
+Create RequestDetails rows for requests submitted before structured details
+existed, by parsing the fields back out of their generated descriptions.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from requests_unified.details import clean_details, parse_description
+from requests_unified.models import Degree, Request, RequestDetails
+
+
+class Command(BaseCommand):
+    help = 'Parse request descriptions into RequestDetails for requests that have none'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Requests parsed and inserted per transaction (default: 1000)')
+
+    def handle(self, *args, **options):
+        degrees = dict(Degree.objects.values_list('name', 'pk'))
+        missing = Request.objects.filter(details__isnull=True).order_by('pk')
+
+        created = 0
+        last_pk = 0
+        while True:
+            rows = list(
+                missing.filter(pk__gt=last_pk).values_list('pk', 'description')[:options['batch_size']]
+            )
+            if not rows:
+                break
+
+            details = []
+            for pk, description in rows:
+                raw = parse_description(description)
+                details.append(RequestDetails(
+                    request_id=pk,
+                    department_id=degrees.get(raw.pop('department', None)),
+                    **clean_details(raw),
+                ))
+            with transaction.atomic():
+                RequestDetails.objects.bulk_create(details, ignore_conflicts=True)
+
+            created += len(details)
+            last_pk = rows[-1][0]
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  ... parsed {created} requests')
+
+        self.stdout.write(self.style.SUCCESS(f'Created details for {created} requests.'))
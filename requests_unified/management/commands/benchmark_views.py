@@ -0,0 +1,158 @@
+"""
+Benchmark every role's main views against generated datasets.
+
+For each dataset size a scratch test database is filled with
+generate_load_data, then each view in requests_unified.benchmarks is opened
+through the test client and its query count, median wall time and peak
+memory are compared with settings.VIEW_BENCHMARK_BUDGETS (optionally
+overridden by a JSON file). Exits with an error if any budget is exceeded:
+
+    manage.py benchmark_views --sizes 100,1000,10000 --budgets budgets.json
+
+--serialization also compares the per-row cost of the HOD's pending-requests
+endpoint with the values()-based v1 API returning the same rows, and
+--transfer reports each view's body bytes as rendered, minified and
+gzipped as the compression middleware sends it. --user-search N times the
+management user search over a separate dataset of N students and checks it
+against settings.USER_SEARCH_BUDGET_MS:
+
+    manage.py benchmark_views --sizes 100 --user-search 100000
+
+The real database is never touched.
+"""
+import json
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+
+from requests_unified.benchmarks import (
+    METRICS, VIEW_BENCHMARKS, check_budgets, compare_serialization, get_budgets, measure_transfer,
+    measure_user_search, run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure queries, latency and memory of the main views and check them against budgets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,1000',
+                            help='Comma-separated request counts to generate (default: 100,1000)')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed requests per view (default: 3)')
+        parser.add_argument('--views', default='',
+                            help='Comma-separated URL names to run (default: all)')
+        parser.add_argument('--budgets', help='JSON file with budgets overriding VIEW_BENCHMARK_BUDGETS')
+        parser.add_argument('--seed', type=int, default=42, help='Dataset seed (default: 42)')
+        parser.add_argument('--json', dest='json_path', help='Also write the raw results to this file')
+        parser.add_argument('--serialization', action='store_true',
+                            help='Also compare per-row serialization cost of the JSON endpoints')
+        parser.add_argument('--transfer', action='store_true',
+                            help='Also report response bytes before and after minification and compression')
+        parser.add_argument('--user-search', type=int, default=0, metavar='USERS',
+                            help='Also time the user search over this many generated students (default: 0, skipped)')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        except ValueError:
+            raise CommandError('--sizes must be comma-separated integers.')
+        names = {name.strip() for name in options['views'].split(',') if name.strip()}
+        unknown = names - {name for name, _, _, _ in VIEW_BENCHMARKS}
+        if unknown:
+            raise CommandError(f"Unknown view(s): {', '.join(sorted(unknown))}.")
+
+        overrides = {}
+        if options['budgets']:
+            with open(options['budgets']) as fh:
+                overrides = json.load(fh)
+        budgets = get_budgets(overrides)
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            results = {}
+            for size in sizes:
+                call_command('flush', interactive=False, verbosity=0)
+                call_command(
+                    'generate_load_data', requests=size, students=max(size // 10, 10),
+                    lecturers=max(size // 200, 5), courses=max(size // 50, 10),
+                    seed=options['seed'], verbosity=0, stdout=self.stdout,
+                )
+                results[size] = run_benchmarks(names=names, repeat=options['repeat'])
+                self.report(size, results[size], budgets)
+                if options['serialization']:
+                    self.report_serialization(compare_serialization(repeat=options['repeat']))
+                if options['transfer']:
+                    self.report_transfer(measure_transfer(names=names))
+            search = {}
+            if options['user_search']:
+                call_command('flush', interactive=False, verbosity=0)
+                call_command(
+                    'generate_load_data', requests=max(options['user_search'] // 100, 100),
+                    students=options['user_search'], lecturers=5, courses=10,
+                    seed=options['seed'], verbosity=0, stdout=self.stdout,
+                )
+                search = measure_user_search(repeat=options['repeat'])
+                self.report_user_search(options['user_search'], search)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({str(size): result for size, result in results.items()}, fh, indent=2)
+
+        violations = [
+            f'[{size} requests] {violation}'
+            for size, result in results.items() for violation in check_budgets(result, budgets)
+        ]
+        search_budget = getattr(settings, 'USER_SEARCH_BUDGET_MS', 50)
+        violations += [
+            f"[{options['user_search']} users] user search {measured['query']!r}: "
+            f"ms {measured['ms']:.0f} > budget {search_budget}"
+            for measured in search.values() if measured['ms'] > search_budget
+        ]
+        if violations:
+            raise CommandError('Budgets exceeded:\n  ' + '\n  '.join(violations))
+        self.stdout.write(self.style.SUCCESS(f'All views within budget for sizes {options["sizes"]}.'))
+
+    def report(self, size, results, budgets):
+        self.stdout.write(f'\n{size} requests')
+        self.stdout.write(f"{'view':<38}{'queries':>8}{'ms':>10}{'peak KiB':>10}")
+        for name, measured in results.items():
+            over = check_budgets({name: measured}, budgets)
+            line = (f"{name:<38}{measured['queries']:>8}{measured['ms']:>10.1f}"
+                    f"{measured['memory_kb']:>10.0f}")
+            self.stdout.write(self.style.ERROR(line) if over else line)
+
+    def report_serialization(self, results):
+        self.stdout.write(f"{'serialization':<38}{'rows':>8}{'ms':>10}{'us/row':>10}")
+        for name, measured in results.items():
+            self.stdout.write(
+                f"{name:<38}{measured['rows']:>8}{measured['ms']:>10.1f}{measured['us_per_row']:>10.1f}"
+            )
+
+    def report_transfer(self, results):
+        encodings = [key for key in next(iter(results.values()), {}) if key not in ('raw', 'minified')]
+        self.stdout.write(
+            f"{'bytes':<38}{'raw':>10}{'minified':>10}" + ''.join(f'{encoding:>10}' for encoding in encodings)
+            + f"{'saved':>8}"
+        )
+        for name, sizes in results.items():
+            smallest = min(sizes.values())
+            saved = 1 - smallest / sizes['raw'] if sizes['raw'] else 0.0
+            self.stdout.write(
+                f"{name:<38}{sizes['raw']:>10}{sizes['minified']:>10}"
+                + ''.join(f'{sizes[encoding]:>10}' for encoding in encodings) + f'{saved:>8.0%}'
+            )
+
+    def report_user_search(self, users, results):
+        self.stdout.write(f'\n{users} users')
+        self.stdout.write(f"{'user search':<38}{'ms':>10}")
+        budget = getattr(settings, 'USER_SEARCH_BUDGET_MS', 50)
+        for label, measured in results.items():
+            line = f"{label + ': ' + measured['query']:<38}{measured['ms']:>10.1f}"
+            self.stdout.write(self.style.ERROR(line) if measured['ms'] > budget else line)
@@ -0,0 +1,69 @@
+"""
+Delete old read notifications and sync change-log rows, and repair the
+unread counters.
+
+Unread notifications are never removed. Read ones older than the cutoff are
+deleted in primary-key batches, each its own short statement, so the
+command can run alongside normal traffic and be interrupted safely.
+Afterwards every unread counter is recomputed from the table.
+
+Change-log rows (see requests_unified.sync) older than their own cutoff are
+deleted the same way; clients whose cursor is older get a new snapshot.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from requests_unified import sync
+from requests_unified.notifications import compact_batch, compactable, recount_all
+
+
+class Command(BaseCommand):
+    help = 'Delete read notifications and change-log rows older than a cutoff and recount unread notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=90,
+                            help='Delete read notifications created more than N days ago (default: 90)')
+        parser.add_argument('--change-log-days', type=int, default=30,
+                            help='Delete sync change-log rows created more than N days ago (default: 30)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Notifications deleted per statement (default: 1000)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many notifications would be deleted')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+        log_cutoff = timezone.now() - timedelta(days=options['change_log_days'])
+
+        if options['dry_run']:
+            self.stdout.write(
+                f'Would delete {compactable(cutoff).count()} read notifications from before {cutoff:%Y-%m-%d} '
+                f'and {sync.compactable(log_cutoff).count()} change-log rows from before {log_cutoff:%Y-%m-%d}.'
+            )
+            return
+
+        deleted = 0
+        while True:
+            batch = compact_batch(cutoff, options['batch_size'])
+            if not batch:
+                break
+            deleted += batch
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  ... deleted {deleted} notifications')
+
+        # After the notifications, whose deletion is itself logged.
+        log_deleted = 0
+        while True:
+            batch = sync.compact_batch(log_cutoff, options['batch_size'])
+            if not batch:
+                break
+            log_deleted += batch
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  ... deleted {log_deleted} change-log rows')
+
+        users = recount_all()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} read notifications from before {cutoff:%Y-%m-%d} '
+            f'and {log_deleted} change-log rows from before {log_cutoff:%Y-%m-%d}; recounted {users} users.'
+        ))
@@ -0,0 +1,135 @@
+"""
+Delete uploaded files that no RequestDocument row references any more.
+
+Deleting a Request, User or Course cascades away RequestDocument rows but leaves
+their files on disk. Files of archived requests (ArchivedDocumentFile) are
+kept. This command walks the upload directory lazily, checks each batch of
+paths against the database with a single IN query, and removes files that are
+unreferenced and older than a grace period (so in-flight uploads whose row is
+not committed yet are never touched). Orphaned cached previews are swept the
+same way.
+"""
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from requests_unified.models import ArchivedDocumentFile, RequestDocument
+from requests_unified.previews import get_preview_dir, preview_names
+
+
+def iter_files(root):
+    """Yield (path, mtime) for every file under root without building a full listing."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry.path, entry.stat(follow_symlinks=False).st_mtime
+        except FileNotFoundError:
+            continue
+
+
+def iter_batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Command(BaseCommand):
+    help = 'Delete media files that are no longer referenced by any RequestDocument'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would be deleted without deleting anything')
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help='Only delete files older than this many hours (default: 24)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of paths checked per database query (default: 1000)')
+        parser.add_argument('--progress-every', type=int, default=10000,
+                            help='Print progress after this many scanned files, 0 for none (default: 10000)')
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.verbosity = options['verbosity']
+        self.batch_size = options['batch_size']
+        self.progress_every = options['progress_every']
+        self.cutoff = time.time() - options['grace_hours'] * 3600
+
+        self.scanned = self.deleted = self.freed = 0
+
+        upload_dir = RequestDocument._meta.get_field('file').upload_to.strip('/')
+        self.sweep(os.path.join(settings.MEDIA_ROOT, upload_dir), self.referenced_files)
+        self.sweep(get_preview_dir(), self.referenced_previews)
+
+        verb = 'Would delete' if self.dry_run else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {self.deleted} of {self.scanned} scanned files '
+            f'({self.freed / (1024 * 1024):.1f} MB).'
+        ))
+
+    def sweep(self, root, find_referenced):
+        """Scan root in batches and remove the entries find_referenced() does not return."""
+        media_root = str(settings.MEDIA_ROOT)
+        for batch in iter_batches(iter_files(root), self.batch_size):
+            names = {
+                os.path.relpath(path, media_root).replace(os.sep, '/'): (path, mtime)
+                for path, mtime in batch
+            }
+            referenced = find_referenced(names)
+
+            for name, (path, mtime) in names.items():
+                self.scanned += 1
+                if self.progress_every > 0 and self.scanned % self.progress_every == 0:
+                    self.stdout.write(f'  ... scanned {self.scanned} files, {self.deleted} orphaned')
+                if name in referenced or mtime > self.cutoff:
+                    continue
+                self.remove(path, name)
+
+    def referenced_files(self, names):
+        names = list(names)
+        return set(
+            RequestDocument.objects.filter(file__in=names).values_list('file', flat=True)
+        ) | set(
+            ArchivedDocumentFile.objects.filter(file__in=names).values_list('file', flat=True)
+        )
+
+    def referenced_previews(self, names):
+        """
+        Previews are named '<document pk>-<token>-<kind>.png'; keep the current
+        names of existing documents. Any other name, such as the guessable
+        '<pk>-<kind>.png' used before, is swept.
+        """
+        pks = set()
+        for name in names:
+            prefix = os.path.basename(name).split('-', 1)[0]
+            if prefix.isdigit():
+                pks.add(int(prefix))
+        preview_dir = os.path.relpath(get_preview_dir(), settings.MEDIA_ROOT).replace(os.sep, '/')
+        current = {
+            f'{preview_dir}/{preview}'
+            for document in RequestDocument.objects.filter(pk__in=list(pks)).only('pk')
+            for preview in preview_names(document)
+        }
+        return current & set(names)
+
+    def remove(self, path, name):
+        try:
+            size = os.path.getsize(path)
+            if not self.dry_run:
+                os.remove(path)
+        except FileNotFoundError:
+            return
+        self.deleted += 1
+        self.freed += size
+        if self.verbosity > 1:
+            self.stdout.write(f'  {"would delete" if self.dry_run else "deleted"}: {name}')
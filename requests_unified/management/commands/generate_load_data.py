@@ -0,0 +1,408 @@
+"""
+Generate a large, realistic synthetic dataset for load and benchmark testing.
+
+Creates users of every role, degrees, courses (with lecturers) and requests
+with full workflow trails: StatusHistory, ApprovalLog, Notification and
+Comment rows, plus RequestDetails. Everything is written with bulk_create in
+batches with explicit primary keys, so millions of rows take minutes rather
+than hours; signals are bypassed and the derived search indexes are rebuilt
+once at the end.
+
+The output is fully determined by --seed. Request types, final statuses and
+the time spent in each workflow stage follow configurable distributions:
+
+    manage.py generate_load_data --requests 1000000 --students 50000 \\
+        --types "General=4,Appeal=3,Study Approval=2,Postponement=1" \\
+        --statuses "approved=6,rejected=2,sent_to_hod=1,new=1" \\
+        --stage-hours "in_progress=12,sent_to_lecturer=36,sent_to_hod=72,final=48"
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from core.models import User
+from requests_unified.models import (
+    ApprovalLog, Comment, Course, Degree, Notification, Request, RequestDetails, StatusHistory,
+)
+
+FIRST_NAMES = [
+    'Noa', 'Yosef', 'Maya', 'David', 'Tamar', 'Daniel', 'Shira', 'Ariel', 'Yael', 'Omer',
+    'Adi', 'Itai', 'Lior', 'Michal', 'Eitan', 'Roni', 'Amit', 'Dana', 'Nadav', 'Hila',
+]
+LAST_NAMES = [
+    'Cohen', 'Levi', 'Mizrahi', 'Peretz', 'Biton', 'Dahan', 'Avraham', 'Friedman', 'Azulay', 'Katz',
+    'Yosef', 'Malka', 'Amar', 'Ohana', 'Shapiro', 'Ben David', 'Golan', 'Hadad', 'Vaknin', 'Segal',
+]
+SEMESTERS = ['Fall 2024', 'Spring 2025', 'Summer 2025', 'Fall 2025', 'Spring 2026']
+CATEGORIES = ['Registration', 'Certificate', 'Tuition', 'Exam Schedule', 'Other']
+COMMENTS = [
+    'Please attach the medical certificate.',
+    'Forwarded for review.',
+    'Checked against the course syllabus.',
+    'The grade sheet was uploaded.',
+    'Thank you, waiting for a decision.',
+]
+# Notification (code, params) the student gets for each workflow step after submission.
+NOTIFICATIONS = {
+    Request.STATUS_IN_PROGRESS: ('in_progress', {}),
+    Request.STATUS_NEEDS_INFO: ('needs_info', {'feedback': 'Please attach the missing documents.'}),
+    Request.STATUS_SENT_TO_LECTURER: ('forwarded_to_lecturer', {'lecturer': 'the course lecturer'}),
+    Request.STATUS_SENT_TO_HOD: ('lecturer_sent_to_hod', {}),
+    Request.STATUS_APPROVED: ('hod_approved', {}),
+    Request.STATUS_REJECTED: ('hod_rejected', {'reason': 'Does not meet the requirements.'}),
+}
+
+# Workflow order; a request ending in a status passes through every earlier step.
+PATH_TO = {
+    Request.STATUS_NEW: [Request.STATUS_NEW],
+    Request.STATUS_IN_PROGRESS: [Request.STATUS_NEW, Request.STATUS_IN_PROGRESS],
+    Request.STATUS_NEEDS_INFO: [Request.STATUS_NEW, Request.STATUS_IN_PROGRESS, Request.STATUS_NEEDS_INFO],
+    Request.STATUS_SENT_TO_LECTURER: [
+        Request.STATUS_NEW, Request.STATUS_IN_PROGRESS, Request.STATUS_SENT_TO_LECTURER,
+    ],
+    Request.STATUS_SENT_TO_HOD: [
+        Request.STATUS_NEW, Request.STATUS_IN_PROGRESS, Request.STATUS_SENT_TO_LECTURER,
+        Request.STATUS_SENT_TO_HOD,
+    ],
+}
+for _final in (Request.STATUS_APPROVED, Request.STATUS_REJECTED):
+    PATH_TO[_final] = PATH_TO[Request.STATUS_SENT_TO_HOD] + [_final]
+
+DEFAULT_TYPES = 'General=4,Appeal=3,Study Approval=2,Postponement=1'
+DEFAULT_STATUSES = 'approved=6,rejected=2,sent_to_hod=1,sent_to_lecturer=1,in_progress=1,needs_info=1,new=1'
+DEFAULT_STAGE_HOURS = 'in_progress=12,needs_info=24,sent_to_lecturer=36,sent_to_hod=72,final=48'
+
+
+def parse_weights(value, valid, option):
+    """'a=3,b=1' -> ({'a': 3.0, 'b': 1.0}), validating keys against `valid`."""
+    weights = {}
+    for part in value.split(','):
+        key, sep, weight = part.partition('=')
+        key = key.strip()
+        if not sep or key not in valid:
+            raise CommandError(f"{option}: expected key=number pairs with keys from {sorted(valid)}, got '{part}'.")
+        try:
+            weights[key] = float(weight)
+        except ValueError:
+            raise CommandError(f"{option}: '{weight}' is not a number.")
+    return weights
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/updated_at values we set (auto_now* would overwrite them)."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate synthetic users, courses and requests with full workflow trails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=10000, help='Requests to create (default: 10000)')
+        parser.add_argument('--students', type=int, default=1000, help='Students to create (default: 1000)')
+        parser.add_argument('--lecturers', type=int, default=50, help='Lecturers to create (default: 50)')
+        parser.add_argument('--secretaries', type=int, default=5, help='Secretaries to create (default: 5)')
+        parser.add_argument('--hods', type=int, default=2, help='Heads of department to create (default: 2)')
+        parser.add_argument('--courses', type=int, default=200, help='Courses to create (default: 200)')
+        parser.add_argument('--degrees', type=int, default=5,
+                            help='Make sure at least this many degrees exist (default: 5)')
+        parser.add_argument('--days', type=int, default=730,
+                            help='Spread request creation over the last N days (default: 730)')
+        parser.add_argument('--max-comments', type=int, default=2,
+                            help='Up to this many comments per request (default: 2)')
+        parser.add_argument('--types', default=DEFAULT_TYPES, help=f'Request type weights (default: "{DEFAULT_TYPES}")')
+        parser.add_argument('--statuses', default=DEFAULT_STATUSES,
+                            help=f'Final status weights (default: "{DEFAULT_STATUSES}")')
+        parser.add_argument('--stage-hours', default=DEFAULT_STAGE_HOURS,
+                            help='Mean hours before entering each status, exponentially distributed; '
+                                 f'"final" is the HOD decision (default: "{DEFAULT_STAGE_HOURS}")')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument('--batch-size', type=int, default=2000,
+                            help='Requests per bulk insert transaction (default: 2000)')
+        parser.add_argument('--password', default='LoadTest123!',
+                            help='Password shared by all generated users (hashed once)')
+        parser.add_argument('--prefix', default='load', help='Username/email prefix (default: "load")')
+        parser.add_argument('--skip-indexes', action='store_true',
+                            help='Do not rebuild the user and request search indexes afterwards')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        self.prefix = options['prefix']
+        self.now = timezone.now()
+
+        self.type_weights = parse_weights(
+            options['types'], {value for value, _ in Request.REQUEST_TYPE_CHOICES}, '--types')
+        self.status_weights = parse_weights(options['statuses'], set(PATH_TO), '--statuses')
+        self.stage_hours = parse_weights(
+            options['stage_hours'], set(PATH_TO) - {Request.STATUS_NEW, Request.STATUS_APPROVED,
+                                                    Request.STATUS_REJECTED} | {'final'}, '--stage-hours')
+
+        started = time.perf_counter()
+        with explicit_timestamps(User, Degree, Course, Request, StatusHistory, ApprovalLog, Notification, Comment):
+            degrees = self.create_degrees(options['degrees'])
+            # Hash once: make_password is deliberately slow and would dominate the run.
+            self.password = make_password(options['password'])
+            self.students = self.create_users(User.ROLE_STUDENT, options['students'], degrees)
+            self.lecturers = self.create_users(User.ROLE_LECTURER, options['lecturers'], degrees)
+            self.secretaries = self.create_users(User.ROLE_SECRETARY, options['secretaries'], degrees)
+            self.hods = self.create_users(User.ROLE_HEAD_OF_DEPT, options['hods'], degrees)
+            self.courses = self.create_courses(options['courses'], degrees)
+            self.degrees = degrees
+            created = self.create_requests(options['requests'])
+
+        self.reset_sequences()
+        if not options['skip_indexes']:
+            self.rebuild_indexes()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(self.students) + len(self.lecturers) + len(self.secretaries) + len(self.hods)} users, "
+            f"{len(self.courses)} courses and {created['requests']} requests "
+            f"({sum(created.values())} rows) in {elapsed:.1f}s."
+        ))
+
+    # ------------------------------------------------------------------
+    # Reference data
+    # ------------------------------------------------------------------
+
+    def next_pk(self, model):
+        return (model.objects.aggregate(m=Max('pk'))['m'] or 0) + 1
+
+    def create_degrees(self, minimum):
+        degrees = list(Degree.objects.filter(is_active=True).values_list('pk', flat=True))
+        missing = max(minimum - len(degrees), 0)
+        if missing:
+            start = self.next_pk(Degree)
+            Degree.objects.bulk_create([
+                Degree(pk=pk, name=f'{self.prefix.title()} Degree {pk}', code=f'{self.prefix.upper()}{pk}',
+                       created_at=self.now, updated_at=self.now)
+                for pk in range(start, start + missing)
+            ])
+            degrees.extend(range(start, start + missing))
+        if not degrees:
+            raise CommandError('No degrees to attach users and courses to (use --degrees).')
+        return degrees
+
+    def create_users(self, role, count, degrees):
+        start = self.next_pk(User)
+        short = {User.ROLE_STUDENT: 'student', User.ROLE_LECTURER: 'lecturer',
+                 User.ROLE_SECRETARY: 'secretary', User.ROLE_HEAD_OF_DEPT: 'hod'}[role]
+        users = []
+        for pk in range(start, start + count):
+            username = f'{self.prefix}.{short}{pk}'
+            users.append(User(
+                pk=pk,
+                username=username,
+                email=f'{username}@sce.ac.il',
+                password=self.password,
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                role=role,
+                degree_id=self.rng.choice(degrees),
+                student_id=f'L{pk:09d}' if role == User.ROLE_STUDENT else None,
+                employee_id=None if role == User.ROLE_STUDENT else f'LE-{pk:07d}',
+                date_joined=self.now - timedelta(days=self.rng.uniform(0, self.options['days'])),
+            ))
+        User.objects.bulk_create(users, batch_size=self.options['batch_size'])
+        return list(range(start, start + count))
+
+    def create_courses(self, count, degrees):
+        start = self.next_pk(Course)
+        pks = list(range(start, start + count))
+        Course.objects.bulk_create([
+            Course(pk=pk, code=f'{self.prefix.upper()}{pk}', name=f'Course {pk}',
+                   created_at=self.now, updated_at=self.now)
+            for pk in pks
+        ], batch_size=self.options['batch_size'])
+
+        self.course_lecturers = {}
+        degree_links, lecturer_links = [], []
+        for pk in pks:
+            for degree in self.rng.sample(degrees, k=min(len(degrees), self.rng.randint(1, 2))):
+                degree_links.append(Course.degrees.through(course_id=pk, degree_id=degree))
+            lecturers = self.rng.sample(self.lecturers, k=min(len(self.lecturers), self.rng.randint(1, 2)))
+            self.course_lecturers[pk] = lecturers
+            lecturer_links.extend(Course.lecturers.through(course_id=pk, user_id=user) for user in lecturers)
+        Course.degrees.through.objects.bulk_create(degree_links, batch_size=self.options['batch_size'])
+        Course.lecturers.through.objects.bulk_create(lecturer_links, batch_size=self.options['batch_size'])
+        return pks
+
+    # ------------------------------------------------------------------
+    # Requests and their trails
+    # ------------------------------------------------------------------
+
+    def create_requests(self, count):
+        if count and not self.students:
+            raise CommandError('Requests need at least one student (use --students).')
+        if count and not (self.secretaries and self.lecturers and self.hods):
+            raise CommandError('Requests need at least one secretary, lecturer and head of department.')
+
+        types, type_weights = zip(*self.type_weights.items())
+        statuses, status_weights = zip(*self.status_weights.items())
+        created = dict.fromkeys(['requests', 'details', 'history', 'approvals', 'notifications', 'comments'], 0)
+
+        start = self.next_pk(Request)
+        batch_size = self.options['batch_size']
+        for batch_start in range(start, start + count, batch_size):
+            rows = {key: [] for key in created}
+            for pk in range(batch_start, min(batch_start + batch_size, start + count)):
+                self.build_request(
+                    pk, self.rng.choices(types, type_weights)[0], self.rng.choices(statuses, status_weights)[0], rows,
+                )
+            with transaction.atomic():
+                Request.objects.bulk_create(rows['requests'])
+                RequestDetails.objects.bulk_create(rows['details'])
+                StatusHistory.objects.bulk_create(rows['history'])
+                ApprovalLog.objects.bulk_create(rows['approvals'])
+                Notification.objects.bulk_create(rows['notifications'])
+                Comment.objects.bulk_create(rows['comments'])
+            for key, values in rows.items():
+                created[key] += len(values)
+            if self.options['verbosity'] > 1:
+                self.stdout.write(f"  ... {created['requests']}/{count} requests")
+        return created
+
+    def stage_delay(self, status):
+        mean = self.stage_hours.get(status, 24)
+        return timedelta(hours=self.rng.expovariate(1 / mean) if mean > 0 else 0)
+
+    def build_request(self, pk, request_type, target_status, rows):
+        rng = self.rng
+        student = rng.choice(self.students)
+        course = rng.choice(self.courses) if request_type != Request.TYPE_POSTPONEMENT else None
+        lecturer = rng.choice(self.course_lecturers[course]) if course else rng.choice(self.lecturers)
+        secretary = rng.choice(self.secretaries)
+        hod = rng.choice(self.hods)
+        created_at = self.now - timedelta(days=rng.uniform(0, self.options['days']))
+
+        # Walk the workflow until the target status, or until we would pass "now".
+        trail = [(Request.STATUS_NEW, created_at)]
+        for status in PATH_TO[target_status][1:]:
+            stage = 'final' if status in (Request.STATUS_APPROVED, Request.STATUS_REJECTED) else status
+            at = trail[-1][1] + self.stage_delay(stage)
+            if at > self.now:
+                break
+            trail.append((status, at))
+        status, updated_at = trail[-1]
+
+        semester = rng.choice(SEMESTERS)
+        details = RequestDetails(request_id=pk, department_id=rng.choice(self.degrees))
+        if request_type == Request.TYPE_APPEAL:
+            details.grade_received = rng.randint(40, 75)
+            details.expected_grade = details.grade_received + rng.randint(5, 25)
+            description = (f"Grade Received: {details.grade_received}\nExpected Grade: {details.expected_grade}\n"
+                           f"Reason: The exam was graded incorrectly.")
+        elif request_type == Request.TYPE_POSTPONEMENT:
+            details.semester = semester
+            details.reason_type = rng.choice(RequestDetails.REASON_TYPE_CHOICES)[0]
+            description = f"Semester to Postpone: {semester}\nReason Type: {details.reason_type}\nExplanation: -"
+        elif request_type == Request.TYPE_STUDY_APPROVAL:
+            details.semester = semester
+            description = f"Semester: {semester}\nReason: Required for my degree plan."
+        else:
+            details.category = rng.choice(CATEGORIES)
+            description = f"Category: {details.category}\nDescription: Please assist with my request."
+
+        reached = {step for step, _ in trail}
+        rows['requests'].append(Request(
+            pk=pk,
+            request_id=f'REQ-{pk * 2654435761 % 2 ** 32:08X}',  # odd multiplier: unique per pk
+            student_id=student,
+            title=f'{request_type} request {pk}',
+            description=description,
+            request_type=request_type,
+            status=status,
+            priority=rng.choices([Request.PRIORITY_LOW, Request.PRIORITY_MEDIUM, Request.PRIORITY_HIGH], [2, 5, 1])[0],
+            course_id=course,
+            assigned_staff_id=secretary if Request.STATUS_IN_PROGRESS in reached else None,
+            assigned_lecturer_id=lecturer if Request.STATUS_SENT_TO_LECTURER in reached else None,
+            head_of_dept_id=hod if Request.STATUS_SENT_TO_HOD in reached else None,
+            lecturer_feedback='Reviewed, recommend approval.' if Request.STATUS_SENT_TO_HOD in reached else '',
+            created_at=created_at,
+            updated_at=updated_at,
+        ))
+        rows['details'].append(details)
+
+        actors = {
+            Request.STATUS_NEW: (student, StatusHistory.ROLE_STUDENT, 'Request submitted by student.'),
+            Request.STATUS_IN_PROGRESS: (secretary, StatusHistory.ROLE_STAFF, 'Request is being handled by staff.'),
+            Request.STATUS_NEEDS_INFO: (secretary, StatusHistory.ROLE_STAFF, 'More information requested.'),
+            Request.STATUS_SENT_TO_LECTURER: (secretary, StatusHistory.ROLE_STAFF, 'Forwarded to lecturer.'),
+            Request.STATUS_SENT_TO_HOD: (lecturer, StatusHistory.ROLE_LECTURER, 'Sent to Head of Department.'),
+            Request.STATUS_APPROVED: (hod, StatusHistory.ROLE_HEAD_OF_DEPT, 'Request approved.'),
+            Request.STATUS_REJECTED: (hod, StatusHistory.ROLE_HEAD_OF_DEPT, 'Request rejected.'),
+        }
+        approval_actions = {
+            Request.STATUS_NEEDS_INFO: ApprovalLog.ACTION_NEEDS_INFO,
+            Request.STATUS_SENT_TO_LECTURER: ApprovalLog.ACTION_FORWARDED,
+            Request.STATUS_APPROVED: ApprovalLog.ACTION_APPROVED,
+            Request.STATUS_REJECTED: ApprovalLog.ACTION_REJECTED,
+        }
+        for step, at in trail:
+            actor, role, text = actors[step]
+            rows['history'].append(StatusHistory(
+                request_id=pk, status=step, description=text, role=role, changed_by_id=actor, created_at=at,
+            ))
+            if step in approval_actions:
+                rows['approvals'].append(ApprovalLog(
+                    request_id=pk, approver_id=actor, action=approval_actions[step], created_at=at,
+                ))
+            if step != Request.STATUS_NEW:
+                code, params = NOTIFICATIONS[step]
+                rows['notifications'].append(Notification(
+                    user_id=student, request_id=pk, code=code, params=params,
+                    is_read=rng.random() < 0.7, created_at=at, emailed_at=at,
+                ))
+
+        span = (updated_at - created_at).total_seconds()
+        for _ in range(rng.randint(0, self.options['max_comments'])):
+            rows['comments'].append(Comment(
+                request_id=pk,
+                author_id=rng.choice([student, secretary, lecturer]),
+                comment=rng.choice(COMMENTS),
+                created_at=created_at + timedelta(seconds=rng.uniform(0, span)),
+                updated_at=updated_at,
+            ))
+
+    # ------------------------------------------------------------------
+    # Finishing up
+    # ------------------------------------------------------------------
+
+    def reset_sequences(self):
+        """Explicit primary keys bypass sequences on PostgreSQL and friends; catch them up."""
+        statements = connection.ops.sequence_reset_sql(no_style(), [User, Degree, Course, Request])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def rebuild_indexes(self):
+        from core.search import rebuild_index as rebuild_user_index
+        from requests_unified import search, typeahead
+
+        if self.options['verbosity'] > 1:
+            self.stdout.write('  ... rebuilding search indexes')
+        with transaction.atomic():
+            rebuild_user_index(batch_size=self.options['batch_size'])
+            search.rebuild_index()
+        typeahead.invalidate(*typeahead.BUILDERS)
@@ -0,0 +1,101 @@
+"""
+Drive a running server with a realistic mix of students, secretaries,
+lecturers and heads of department (see requests_unified.loadtest).
+
+Virtual users are taken from the database by role and username prefix,
+normally the accounts created by generate_load_data, and all share one
+password. The server must use the same database, and should send mail to a
+sink so the 2FA step does not hit SMTP:
+
+    EMAIL_BACKEND=django.core.mail.backends.locmem.EmailBackend manage.py runserver --noreload
+    manage.py load_test --duration 120 --students 50 --lecturers 8
+
+The run mutates data (requests are submitted, forwarded and decided), so
+point it at a scratch database.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from requests_unified.loadtest import run_load, summarize
+
+ROLE_OPTIONS = (
+    ('students', User.ROLE_STUDENT),
+    ('secretaries', User.ROLE_SECRETARY),
+    ('lecturers', User.ROLE_LECTURER),
+    ('hods', User.ROLE_HEAD_OF_DEPT),
+)
+
+
+class Command(BaseCommand):
+    help = 'Run a role-mix HTTP load test against a running server and report latency per scenario'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000',
+                            help='Server to test (default: http://127.0.0.1:8000)')
+        parser.add_argument('--students', type=int, default=20, help='Virtual students (default: 20)')
+        parser.add_argument('--secretaries', type=int, default=2, help='Virtual secretaries (default: 2)')
+        parser.add_argument('--lecturers', type=int, default=4, help='Virtual lecturers (default: 4)')
+        parser.add_argument('--hods', type=int, default=1, help='Virtual heads of department (default: 1)')
+        parser.add_argument('--duration', type=float, default=60, help='Seconds to run after ramp-up (default: 60)')
+        parser.add_argument('--ramp-up', type=float, default=10,
+                            help='Seconds over which virtual users start (default: 10)')
+        parser.add_argument('--think-time', type=float, default=1.0,
+                            help='Mean pause between scenarios in seconds (default: 1.0)')
+        parser.add_argument('--bulk-size', type=int, default=5,
+                            help='Requests decided per HOD bulk review (default: 5)')
+        parser.add_argument('--timeout', type=float, default=30, help='HTTP timeout in seconds (default: 30)')
+        parser.add_argument('--password', default='LoadTest123!', help='Password of the accounts (default: LoadTest123!)')
+        parser.add_argument('--prefix', default='load', help='Username prefix of the accounts (default: load)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument('--json', dest='json_path', help='Also write the summary to this file')
+
+    def handle(self, *args, **options):
+        users = []
+        for option, role in ROLE_OPTIONS:
+            wanted = options[option]
+            if wanted <= 0:
+                continue
+            found = list(
+                User.objects.filter(role=role, is_active=True, username__startswith=f"{options['prefix']}.")
+                .order_by('pk')[:wanted]
+            )
+            if len(found) < wanted:
+                raise CommandError(
+                    f"Only {len(found)} {option} with prefix '{options['prefix']}' (wanted {wanted}); "
+                    f"run generate_load_data first."
+                )
+            users.extend(found)
+        if not users:
+            raise CommandError('No virtual users requested.')
+
+        if options['verbosity'] > 1:
+            self.stdout.write(f"Starting {len(users)} virtual users against {options['base_url']}...")
+        samples, errors, elapsed = run_load(
+            options['base_url'], users, options['password'], options['duration'],
+            think_time=options['think_time'], ramp_up=options['ramp_up'], seed=options['seed'],
+            timeout=options['timeout'], bulk_size=options['bulk_size'],
+        )
+        summary = summarize(samples, elapsed)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{'scenario':<20} {'count':>7} {'errors':>7} {'req/s':>8} "
+            f"{'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+        ))
+        for name, stats in summary.items():
+            self.stdout.write(
+                f"{name:<20} {stats['count']:>7} {stats['errors']:>7} {stats['rps']:>8.2f} "
+                + ' '.join(f"{stats[key]:>6.0f}ms" for key in ('p50', 'p90', 'p95', 'p99', 'max'))
+            )
+        for error in sorted(set(errors))[:10]:
+            self.stdout.write(self.style.WARNING(f'  {error}'))
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({'elapsed': elapsed, 'scenarios': summary}, fh, indent=2)
+
+        total = sum(stats['count'] for stats in summary.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} scenario runs by {len(users)} virtual users in {elapsed:.1f}s, {len(errors)} errors.'
+        ))
@@ -0,0 +1,22 @@
+"""
+Rebuild the full-text search index for requests from scratch.
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from requests_unified.search import rebuild_index, uses_fts
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index over requests, comments and staff notes'
+
+    def handle(self, *args, **options):
+        if not uses_fts():
+            self.stdout.write(self.style.WARNING(
+                f'The {connection.vendor} backend searches natively; there is no index to rebuild.'
+            ))
+            return
+
+        with transaction.atomic():
+            count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} requests.'))
@@ -0,0 +1,36 @@
+"""
+Email queued notifications, individually or as digests (see requests_unified.digests).
+
+Meant to run every few minutes from cron: immediate recipients get their
+notifications on the next run, digest recipients once their window is up.
+"""
+from django.core.management.base import BaseCommand
+
+from requests_unified.digests import deliver, plan
+
+
+class Command(BaseCommand):
+    help = 'Send queued notification emails, one connection per batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Emails sent per connection (default: NOTIFICATION_EMAIL_BATCH_SIZE)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report what would be sent')
+
+    def handle(self, *args, **options):
+        messages, skipped = plan()
+        covered = sum(len(pks) for _, pks in messages)
+
+        if options['dry_run']:
+            self.stdout.write(
+                f'Would send {len(messages)} emails covering {covered} notifications '
+                f'and skip {len(skipped)} for recipients without email delivery.'
+            )
+            return
+
+        sent, connections = deliver(messages, skipped, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Sent {sent} emails covering {covered} notifications over {connections} connections; '
+            f'skipped {len(skipped)}.'
+        ))
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+FTS_TABLE = 'requests_unified_request_fts'
+
+
+def create_search_index(apps, schema_editor):
+    """Create and populate the FTS5 table (SQLite only; other backends search natively)."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "title, description, reason, lecturer_feedback, comments, notes, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(f"""
+        INSERT INTO {FTS_TABLE} (rowid, title, description, reason, lecturer_feedback, comments, notes)
+        SELECT r.id, r.title, r.description, r.reason, r.lecturer_feedback,
+               (SELECT group_concat(c.comment, ' ') FROM requests_unified_comment c WHERE c.request_id = r.id),
+               (SELECT group_concat(n.note, ' ') FROM requests_unified_staffnote n WHERE n.request_id = r.id)
+        FROM requests_unified_request r
+    """)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests_unified', '0002_degree_alter_request_assigned_staff_course_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
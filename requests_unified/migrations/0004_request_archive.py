@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:08
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests_unified', '0003_request_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRequest',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('request_id', models.CharField(max_length=32, unique=True)),
+                ('title', models.CharField(max_length=255)),
+                ('request_type', models.CharField(choices=[('Study Approval', 'Study Approval'), ('Appeal', 'Appeal'), ('Postponement', 'Postponement'), ('General', 'General')], max_length=50)),
+                ('status', models.CharField(choices=[('new', 'New'), ('in_progress', 'In Progress'), ('sent_to_lecturer', 'Sent to Lecturer'), ('sent_to_hod', 'Sent to Head of Department'), ('needs_info', 'Needs More Information'), ('approved', 'Approved'), ('rejected', 'Rejected')], max_length=32)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='requests_unified.course')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_requests', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedDocumentFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.CharField(db_index=True, max_length=255)),
+                ('request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='files', to='requests_unified.archivedrequest')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedrequest',
+            index=models.Index(fields=['status', 'request_type'], name='archived_request_status_type'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests_unified', '0004_request_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestDetails',
+            fields=[
+                ('request', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='details', serialize=False, to='requests_unified.request')),
+                ('semester', models.CharField(blank=True, max_length=50)),
+                ('grade_received', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('expected_grade', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('reason_type', models.CharField(blank=True, choices=[('Medical', 'Medical'), ('Personal', 'Personal'), ('Financial', 'Financial'), ('Military', 'Military Service'), ('Other', 'Other')], max_length=20)),
+                ('return_date', models.DateField(blank=True, null=True)),
+                ('category', models.CharField(blank=True, max_length=100)),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='requests_unified.degree')),
+            ],
+            options={
+                'verbose_name_plural': 'Request details',
+                'indexes': [models.Index(fields=['semester'], name='request_details_semester'), models.Index(fields=['reason_type', 'semester'], name='request_details_reason'), models.Index(fields=['category'], name='request_details_category'), models.Index(fields=['return_date'], name='request_details_return_date')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_existing_emailed(apps, schema_editor):
+    """Only notifications created from now on are emailed, not the whole history."""
+    Notification = apps.get_model('requests_unified', 'Notification')
+    Notification.objects.filter(emailed_at__isnull=True).update(emailed_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_user_search_terms'),
+        ('requests_unified', '0006_notification_center'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationPreference',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_preference', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('email_delivery', models.CharField(choices=[('immediate', 'Email each notification'), ('digest', 'Email a digest'), ('none', 'No email')], default='digest', max_length=10)),
+                ('digest_hours', models.PositiveSmallIntegerField(default=24)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='emailed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_existing_emailed, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('emailed_at__isnull', True)), fields=['user', 'created_at'], name='notification_email_queue'),
+        ),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:35
+
+import re
+
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 1000
+
+# notification_messages.MESSAGES as of this migration; free-text messages
+# that match one of them are converted, anything else stays free text.
+MESSAGES = {
+    'submitted': "Your request '{title}' has been submitted successfully.",
+    'document_requested': "Additional document requested: {document}. Please check your request details.",
+    'assigned': "A new request has been assigned to you: {title}",
+    'forwarded_to_lecturer': "Your request has been forwarded to {lecturer} for review.",
+    'sent_to_hod': "Your request has been forwarded to the Head of Department.",
+    'routed_to_hod': "Your request has been automatically routed to the Head of Department due to: {reason}",
+    'lecturer_approved': "Your request '{title}' has been approved by a lecturer!",
+    'lecturer_rejected': "Your request '{title}' has been rejected. Reason: {reason}",
+    'needs_info': "More information needed for your request '{title}': {feedback}",
+    'lecturer_sent_to_hod': "Your request '{title}' has been forwarded to the Head of Department.",
+    'hod_approved': "Great news! Your request '{title}' has been approved by the Head of Department!",
+    'hod_rejected': "Your request '{title}' has been rejected by the Head of Department. Reason: {reason}",
+    'final_notes': "Final notes have been added to your request '{title}'.",
+}
+
+
+def _pattern(template):
+    parts = re.split(r'\{(\w+)\}', template)
+    # Odd indexes are placeholder names, even ones literal text.
+    return re.compile('^' + ''.join(
+        f'(?P<{part}>.*?)' if i % 2 else re.escape(part) for i, part in enumerate(parts)
+    ) + '$', re.DOTALL)
+
+
+PATTERNS = [(code, _pattern(template)) for code, template in MESSAGES.items()]
+
+
+def encode(message, title):
+    """(code, params) for a rendered message, or None if it is not one of MESSAGES."""
+    for code, pattern in PATTERNS:
+        match = pattern.match(message)
+        if match is None:
+            continue
+        params = match.groupdict()
+        # The title is read from the request when rendering; only convert
+        # if that still gives the same sentence.
+        if 'title' in params and params.pop('title') != title:
+            continue
+        return code, params
+    return None
+
+
+def _batches(Notification, queryset):
+    last = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last).select_related('request').order_by('pk')
+            .only('pk', 'code', 'params', 'message', 'request__title')[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        last = batch[-1].pk
+        yield batch
+
+
+def to_codes(apps, schema_editor):
+    Notification = apps.get_model('requests_unified', 'Notification')
+    for batch in _batches(Notification, Notification.objects.filter(code='')):
+        changed = []
+        for notification in batch:
+            encoded = encode(notification.message, notification.request.title if notification.request_id else None)
+            if encoded:
+                notification.code, notification.params = encoded
+                notification.message = ''
+                changed.append(notification)
+        with transaction.atomic():
+            Notification.objects.bulk_update(changed, ['code', 'params', 'message'])
+
+
+def to_messages(apps, schema_editor):
+    Notification = apps.get_model('requests_unified', 'Notification')
+    for batch in _batches(Notification, Notification.objects.exclude(code='')):
+        for notification in batch:
+            template = MESSAGES.get(notification.code)
+            if template is None:
+                continue
+            title = notification.request.title if notification.request_id else ''
+            notification.message = template.format(title=title, **notification.params)
+            notification.code, notification.params = '', {}
+        with transaction.atomic():
+            Notification.objects.bulk_update(batch, ['code', 'params', 'message'])
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own so converting a large table neither holds
+    # the write lock throughout nor starts over if interrupted.
+    atomic = False
+
+    dependencies = [
+        ('requests_unified', '0007_notification_email_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='code',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='params',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='message',
+            field=models.TextField(blank=True),
+        ),
+        migrations.RunPython(to_codes, to_messages),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests_unified', '0010_request_created_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='changelog',
+            name='entity',
+            field=models.CharField(choices=[('request', 'Request'), ('status', 'Status history'), ('notification', 'Notification'), ('all_read', 'All notifications read')], max_length=12),
+        ),
+    ]
@@ -1,8 +1,11 @@
 import uuid
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
 
+from .notification_messages import render as render_message
+
 
 class Degree(models.Model):
     """
@@ -200,6 +203,10 @@ class Request(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the REST API, newest first
+            models.Index(fields=['created_at', 'id'], name='request_created'),
+        ]
     
     def __str__(self):
         return f"{self.request_id} - {self.title}"
@@ -209,6 +216,61 @@ class Request(models.Model):
         return f"badge--{self.status}"
 
 
+class RequestDetails(models.Model):
+    """
+    Structured fields from the request form, one row per request.
+    Which fields are filled depends on the request type; the same values are
+    also rendered into Request.description for display.
+    """
+    
+    REASON_MEDICAL = 'Medical'
+    REASON_PERSONAL = 'Personal'
+    REASON_FINANCIAL = 'Financial'
+    REASON_MILITARY = 'Military'
+    REASON_OTHER = 'Other'
+    
+    REASON_TYPE_CHOICES = [
+        (REASON_MEDICAL, 'Medical'),
+        (REASON_PERSONAL, 'Personal'),
+        (REASON_FINANCIAL, 'Financial'),
+        (REASON_MILITARY, 'Military Service'),
+        (REASON_OTHER, 'Other'),
+    ]
+    
+    request = models.OneToOneField(
+        Request,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='details',
+    )
+    department = models.ForeignKey(
+        Degree,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    # Normalized with requests_unified.details.normalize_semester (e.g. "Spring 2026")
+    semester = models.CharField(max_length=50, blank=True)
+    grade_received = models.PositiveSmallIntegerField(null=True, blank=True)
+    expected_grade = models.PositiveSmallIntegerField(null=True, blank=True)
+    reason_type = models.CharField(max_length=20, choices=REASON_TYPE_CHOICES, blank=True)
+    return_date = models.DateField(null=True, blank=True)
+    category = models.CharField(max_length=100, blank=True)
+    
+    class Meta:
+        verbose_name_plural = 'Request details'
+        indexes = [
+            models.Index(fields=['semester'], name='request_details_semester'),
+            models.Index(fields=['reason_type', 'semester'], name='request_details_reason'),
+            models.Index(fields=['category'], name='request_details_category'),
+            models.Index(fields=['return_date'], name='request_details_return_date'),
+        ]
+    
+    def __str__(self):
+        return f"Details for {self.request.request_id}"
+
+
 class StatusHistory(models.Model):
     """Track all status changes for a request."""
     
@@ -311,6 +373,16 @@ class RequestDocument(models.Model):
         if self.file:
             return self.file.name.split('/')[-1]
         return self.filename
+    
+    def preview_url(self):
+        """URL of the cached first-page preview, or '' if not rendered yet."""
+        from .previews import preview_url
+        return preview_url(self)
+    
+    def thumbnail_url(self):
+        """URL of the cached thumbnail, or '' if not rendered yet."""
+        from .previews import preview_url
+        return preview_url(self, thumbnail=True)
 
 
 class MissingDocument(models.Model):
@@ -416,12 +488,188 @@ class Notification(models.Model):
         null=True,
         blank=True
     )
-    message = models.TextField()
+    # Event code and parameters rendered through notification_messages.MESSAGES;
+    # message is only used for free-text notifications (empty code).
+    code = models.CharField(max_length=32, blank=True)
+    params = models.JSONField(default=dict, blank=True)
+    message = models.TextField(blank=True)
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set once emailed (alone or in a digest) or skipped because the user opted out;
+    # NULL rows are the email queue (see requests_unified.digests).
+    emailed_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the notification center, newest first
+            models.Index(fields=['user', 'created_at', 'id'], name='notification_user_created'),
+            models.Index(fields=['user', 'is_read'], name='notification_user_unread'),
+            models.Index(
+                fields=['user', 'created_at'], name='notification_email_queue',
+                condition=models.Q(emailed_at__isnull=True),
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Notification for {self.user}: {self.text[:50]}"
+    
+    @property
+    def text(self):
+        """The rendered message (loads the request for its title unless already selected)."""
+        if not self.code:
+            return self.message
+        title = self.request.title if self.request_id else ''
+        return render_message(self.code, self.params, title, self.message)
+
+
+class NotificationPreference(models.Model):
+    """How a user wants notifications emailed; users without a row get the settings default for their role."""
+    
+    DELIVERY_IMMEDIATE = 'immediate'
+    DELIVERY_DIGEST = 'digest'
+    DELIVERY_NONE = 'none'
+    
+    DELIVERY_CHOICES = [
+        (DELIVERY_IMMEDIATE, 'Email each notification'),
+        (DELIVERY_DIGEST, 'Email a digest'),
+        (DELIVERY_NONE, 'No email'),
+    ]
+    
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='notification_preference'
+    )
+    email_delivery = models.CharField(max_length=10, choices=DELIVERY_CHOICES, default=DELIVERY_DIGEST)
+    digest_hours = models.PositiveSmallIntegerField(default=24)
+    
+    def __str__(self):
+        return f"{self.user}: {self.email_delivery}"
+
+
+class NotificationCounter(models.Model):
+    """
+    Unread notification count per user, kept in step with Notification by
+    requests_unified.notifications so the navbar badge is a primary-key read.
+    """
+    
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='notification_counter'
+    )
+    unread = models.IntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.user}: {self.unread} unread"
+
+
+class ChangeLog(models.Model):
+    """
+    Append-only feed of changed rows per user for delta sync (see
+    requests_unified.sync). The id is the sync position; rows only name what
+    changed, the current state is read from the table itself.
+    """
+
+    ENTITY_REQUEST = 'request'
+    ENTITY_STATUS = 'status'
+    ENTITY_NOTIFICATION = 'notification'
+    # Every notification of the user was marked read; object_id is the user's id.
+    ENTITY_ALL_READ = 'all_read'
+
+    ENTITY_CHOICES = [
+        (ENTITY_REQUEST, 'Request'),
+        (ENTITY_STATUS, 'Status history'),
+        (ENTITY_NOTIFICATION, 'Notification'),
+        (ENTITY_ALL_READ, 'All notifications read'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False,  # covered by changelog_user_position
+        # Deleting a user cascades to their requests, whose deletion is logged
+        # after this table was already cleared; those leftover rows are harmless.
+        db_constraint=False,
+    )
+    entity = models.CharField(max_length=12, choices=ENTITY_CHOICES)
+    object_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id'], name='changelog_user_position'),
+        ]
+
+    def __str__(self):
+        return f"{self.id}: {self.entity} {self.object_id} for {self.user_id}"
+
+
+# =============================================================================
+# ARCHIVE (cold storage for old closed requests, see requests_unified.archive)
+# =============================================================================
+
+class ArchivedRequest(models.Model):
+    """
+    A closed request moved out of the hot tables.
+    The columns needed for listing and statistics are kept as real columns;
+    the full request row and all of its child rows are stored in `data`.
+    """
+    
+    # Same primary key as the original Request
+    id = models.BigIntegerField(primary_key=True)
+    request_id = models.CharField(max_length=32, unique=True)
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_requests',
+    )
+    course = models.ForeignKey(
+        'Course',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    title = models.CharField(max_length=255)
+    request_type = models.CharField(max_length=50, choices=Request.REQUEST_TYPE_CHOICES)
+    status = models.CharField(max_length=32, choices=Request.STATUS_CHOICES)
+    priority = models.CharField(max_length=20, choices=Request.PRIORITY_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    
+    is_archived = True
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'request_type'], name='archived_request_status_type'),
+        ]
+    
+    def __str__(self):
+        return f"{self.request_id} - {self.title} (archived)"
+    
+    def as_request(self):
+        """Rebuild the original Request, with its child rows pre-fetched."""
+        from .archive import restore_request
+        return restore_request(self)
+
+
+class ArchivedDocumentFile(models.Model):
+    """Upload paths still referenced by archived documents (kept by gc_media)."""
+    
+    request = models.ForeignKey(
+        ArchivedRequest,
+        on_delete=models.CASCADE,
+        related_name='files',
+    )
+    file = models.CharField(max_length=255, db_index=True)
     
     def __str__(self):
-        return f"Notification for {self.user}: {self.message[:50]}"
+        return self.file
@@ -0,0 +1,42 @@
+"""
+Message templates for template-coded notifications.
+
+A Notification stores a short event code and only the parameters its
+template cannot get elsewhere, instead of the rendered English sentence.
+{title} is never stored: it is read from the notification's request when
+the message is displayed, so fetch notifications with
+select_related('request') (or values('request__title')) before rendering
+many of them. Rows with an empty code are free text (Notification.message).
+"""
+
+MESSAGES = {
+    'submitted': "Your request '{title}' has been submitted successfully.",
+    'in_progress': "Your request '{title}' is being handled by staff.",
+    'document_requested': "Additional document requested: {document}. Please check your request details.",
+    'assigned': "A new request has been assigned to you: {title}",
+    'forwarded_to_lecturer': "Your request has been forwarded to {lecturer} for review.",
+    'sent_to_hod': "Your request has been forwarded to the Head of Department.",
+    'routed_to_hod': "Your request has been automatically routed to the Head of Department due to: {reason}",
+    'lecturer_approved': "Your request '{title}' has been approved by a lecturer!",
+    'lecturer_rejected': "Your request '{title}' has been rejected. Reason: {reason}",
+    'needs_info': "More information needed for your request '{title}': {feedback}",
+    'lecturer_sent_to_hod': "Your request '{title}' has been forwarded to the Head of Department.",
+    'hod_approved': "Great news! Your request '{title}' has been approved by the Head of Department!",
+    'hod_rejected': "Your request '{title}' has been rejected by the Head of Department. Reason: {reason}",
+    'final_notes': "Final notes have been added to your request '{title}'.",
+}
+
+
+class _Params(dict):
+    """Missing parameters render as empty strings rather than raising."""
+
+    def __missing__(self, key):
+        return ''
+
+
+def render(code, params=None, title='', fallback=''):
+    """The message for code with params; fallback (the free-text message) for unknown codes."""
+    template = MESSAGES.get(code)
+    if template is None:
+        return fallback
+    return template.format_map(_Params(params or {}, title=title or ''))
@@ -0,0 +1,15 @@
+"""
+Notification endpoints shared by every role.
+"""
+from django.urls import path
+from . import views
+
+app_name = "notifications"
+
+urlpatterns = [
+    path("", views.notification_center, name="center"),
+    path("read/", views.mark_all_notifications_read, name="mark_all_read"),
+    path("<int:notification_id>/read/", views.mark_notification_read, name="mark_read"),
+    path("preferences/", views.notification_preferences, name="preferences"),
+    path("stream/", views.notification_stream, name="stream"),
+]
@@ -0,0 +1,157 @@
+"""
+Notification center: creating notifications, keyset pagination, unread
+counters and retention.
+
+NotificationCounter holds each user's unread count. Signals add one per
+new unread notification; mark_read()/mark_all_read() subtract exactly the
+number of rows their single UPDATE changed. Code that removes unread rows
+behind their back (e.g. archiving) calls recount() for the users involved,
+a missing counter row is rebuilt on first read, and the retention job
+recounts everyone to repair any drift.
+"""
+from datetime import datetime, timezone
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .models import ChangeLog, Notification, NotificationCounter
+from .notification_messages import MESSAGES
+from . import sync
+
+PAGE_SIZE = 20
+
+
+# ============================================
+# CREATING
+# ============================================
+
+def notify(user, request, code, **params):
+    """Create a template-coded notification (see notification_messages)."""
+    if code not in MESSAGES:
+        raise ValueError(f"Unknown notification code: {code!r}")
+    return Notification.objects.create(user=user, request=request, code=code, params=params)
+
+
+# ============================================
+# UNREAD COUNTERS
+# ============================================
+
+def recount(user_ids):
+    """Recompute the unread counters of user_ids from the notification table."""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    counts = dict(
+        Notification.objects.filter(user_id__in=user_ids, is_read=False)
+        .order_by().values_list('user_id').annotate(n=Count('pk'))
+    )
+    NotificationCounter.objects.bulk_create(
+        [NotificationCounter(user_id=user_id, unread=counts.get(user_id, 0)) for user_id in user_ids],
+        update_conflicts=True, unique_fields=['user'], update_fields=['unread'], batch_size=500,
+    )
+
+
+def recount_all():
+    """Recompute every counter (repairs drift); returns the number of users counted."""
+    user_ids = set(NotificationCounter.objects.values_list('user_id', flat=True))
+    user_ids |= set(Notification.objects.filter(is_read=False).order_by().values_list('user_id', flat=True).distinct())
+    recount(user_ids)
+    return len(user_ids)
+
+
+def add_unread(user_id, amount=1):
+    """Adjust a counter by amount with one UPDATE, creating it from a recount if missing."""
+    if not NotificationCounter.objects.filter(user_id=user_id).update(unread=F('unread') + amount):
+        recount([user_id])  # an upsert, so a concurrently created row is simply overwritten
+
+
+def unread_count(user_id):
+    unread = NotificationCounter.objects.filter(user_id=user_id).values_list('unread', flat=True).first()
+    if unread is None:
+        recount([user_id])
+        return unread_count(user_id)
+    return max(unread, 0)
+
+
+def _logged(entries):
+    """Record entries in the sync change log once the UPDATE has committed."""
+    # After commit, a client that sees the log row also sees the rows it names.
+    entries = list(entries)
+    transaction.on_commit(lambda: sync.record(entries))
+
+
+def mark_read(user_id, pks):
+    """Mark the user's notifications pks as read; returns how many were unread."""
+    changed = Notification.objects.filter(user_id=user_id, pk__in=pks, is_read=False).update(is_read=True)
+    if changed:
+        add_unread(user_id, -changed)
+        _logged((user_id, ChangeLog.ENTITY_NOTIFICATION, pk) for pk in pks)
+    return changed
+
+
+def mark_all_read(user_id):
+    """Mark every notification of the user read in a single UPDATE; returns how many changed."""
+    changed = Notification.objects.filter(user_id=user_id, is_read=False).update(is_read=True)
+    if changed:
+        add_unread(user_id, -changed)
+        _logged([(user_id, ChangeLog.ENTITY_ALL_READ, user_id)])
+    return changed
+
+
+# ============================================
+# KEYSET PAGINATION
+# ============================================
+
+def encode_position(notification):
+    """Opaque '<created_at in microseconds>-<id>' position of a row."""
+    micros = int(notification.created_at.timestamp()) * 1_000_000 + notification.created_at.microsecond
+    return f'{micros}-{notification.pk}'
+
+
+def decode_position(value):
+    try:
+        micros, pk = (int(part) for part in value.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    seconds, micro = divmod(micros, 1_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=micro), pk
+
+
+def page(user_id, before=None, unread_only=False, size=PAGE_SIZE):
+    """
+    (notifications, next position or None), newest first, starting after the
+    position `before`. Uses the (user, created_at, id) index, so the cost of
+    a page does not grow with how deep it is.
+    """
+    queryset = Notification.objects.filter(user_id=user_id).select_related('request')
+    if unread_only:
+        queryset = queryset.filter(is_read=False)
+    position = decode_position(before) if before else None
+    if position:
+        created_at, pk = position
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    rows = list(queryset.order_by('-created_at', '-pk')[:size + 1])
+    if len(rows) > size:
+        return rows[:size], encode_position(rows[size - 1])
+    return rows, None
+
+
+# ============================================
+# RETENTION
+# ============================================
+
+def compactable(before):
+    """Read notifications created before the cutoff."""
+    return Notification.objects.filter(is_read=True, created_at__lt=before)
+
+
+def compact_batch(before, batch_size):
+    """Delete one batch of old read notifications; returns the number deleted."""
+    rows = list(compactable(before).order_by('pk').values_list('pk', 'user_id')[:batch_size])
+    if not rows:
+        return 0
+    # Notifications have no dependent rows or delete signals, so this is a single DELETE.
+    # Read rows do not count towards unread counters, which stay as they are.
+    deleted, _ = Notification.objects.filter(pk__in=[pk for pk, _ in rows], is_read=True).delete()
+    sync.record((user_id, ChangeLog.ENTITY_NOTIFICATION, pk) for pk, user_id in rows)
+    return deleted
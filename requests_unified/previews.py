@@ -0,0 +1,164 @@
+"""
+First-page previews and thumbnails for uploaded request documents.
+
+Rendering runs in a small background process pool so uploads return immediately.
+Images are rendered with Pillow and PDFs with PyMuPDF; both are optional, and
+documents that cannot be rendered simply have no preview.
+
+Previews are served straight from MEDIA_ROOT without a permission check, so
+their names carry an HMAC of the document's pk (keyed by SECRET_KEY) and
+cannot be guessed from sequential ids.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+from django.conf import settings
+from django.utils.crypto import salted_hmac
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'}
+PDF_EXTENSIONS = {'.pdf'}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_preview_dir():
+    """Absolute directory where previews are cached."""
+    return os.path.join(settings.MEDIA_ROOT, getattr(settings, 'DOCUMENT_PREVIEW_DIR', 'previews'))
+
+
+def preview_names(document):
+    """Return the (preview, thumbnail) file names for a document, relative to the cache dir."""
+    token = salted_hmac('requests_unified.previews', str(document.pk), algorithm='sha256').hexdigest()[:32]
+    return f"{document.pk}-{token}-preview.png", f"{document.pk}-{token}-thumb.png"
+
+
+def preview_url(document, thumbnail=False):
+    """Return the URL of a cached preview, or an empty string if none has been rendered."""
+    if not document.pk:
+        return ""
+    name = preview_names(document)[1 if thumbnail else 0]
+    if not os.path.exists(os.path.join(get_preview_dir(), name)):
+        return ""
+    return f"{settings.MEDIA_URL}{getattr(settings, 'DOCUMENT_PREVIEW_DIR', 'previews')}/{name}"
+
+
+def get_document_kind(filename):
+    """Classify a file as 'image', 'pdf' or None based on its extension."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in IMAGE_EXTENSIONS:
+        return 'image'
+    if ext in PDF_EXTENSIONS:
+        return 'pdf'
+    return None
+
+
+def _save_atomically(save, path):
+    """Call save(tmp_path) and move the result into place so readers never see partial files."""
+    tmp_path = f"{path}.tmp"
+    save(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _render_image(source, preview_path, thumb_path, preview_size, thumb_size):
+    try:
+        from PIL import Image
+    except ImportError:
+        return False
+
+    with Image.open(source) as img:
+        img = img.convert('RGB')
+        for path, size in ((preview_path, preview_size), (thumb_path, thumb_size)):
+            copy = img.copy()
+            copy.thumbnail(size)
+            _save_atomically(lambda tmp: copy.save(tmp, format='PNG'), path)
+    return True
+
+
+def _render_pdf(source, preview_path, thumb_path, preview_size, thumb_size):
+    try:
+        import fitz
+    except ImportError:
+        return False
+
+    with fitz.open(source) as pdf:
+        if pdf.page_count == 0:
+            return False
+        page = pdf.load_page(0)
+        for path, (width, height) in ((preview_path, preview_size), (thumb_path, thumb_size)):
+            zoom = min(width / page.rect.width, height / page.rect.height)
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            _save_atomically(lambda tmp: pixmap.save(tmp, output='png'), path)
+    return True
+
+
+def render_document_previews(source, preview_path, thumb_path, preview_size, thumb_size):
+    """
+    Render the first page of a document into a preview and a thumbnail PNG.
+    Runs inside a worker process, so it must not touch the database.
+    Returns True if both images were written.
+    """
+    kind = get_document_kind(source)
+    if kind is None or not os.path.exists(source):
+        return False
+
+    os.makedirs(os.path.dirname(preview_path), exist_ok=True)
+    try:
+        if kind == 'image':
+            return _render_image(source, preview_path, thumb_path, preview_size, thumb_size)
+        return _render_pdf(source, preview_path, thumb_path, preview_size, thumb_size)
+    except Exception:
+        logger.exception("Failed to render preview for %s", source)
+        return False
+
+
+def get_executor():
+    """Return the shared, lazily created process pool."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'DOCUMENT_PREVIEW_WORKERS', 2),
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def _render_args(document):
+    preview_name, thumb_name = preview_names(document)
+    preview_dir = get_preview_dir()
+    return (
+        document.file.path,
+        os.path.join(preview_dir, preview_name),
+        os.path.join(preview_dir, thumb_name),
+        tuple(getattr(settings, 'DOCUMENT_PREVIEW_SIZE', (800, 1100))),
+        tuple(getattr(settings, 'DOCUMENT_THUMBNAIL_SIZE', (200, 260))),
+    )
+
+
+def schedule_previews(document, inline=False):
+    """
+    Queue preview rendering for a document.
+    Rendering happens inline when asked to or when DOCUMENT_PREVIEW_WORKERS is 0.
+    """
+    if not document.file or get_document_kind(document.file.name) is None:
+        return None
+
+    args = _render_args(document)
+    if inline or getattr(settings, 'DOCUMENT_PREVIEW_WORKERS', 2) <= 0:
+        return render_document_previews(*args)
+    return get_executor().submit(render_document_previews, *args)
+
+
+def delete_previews(document):
+    """Remove any cached previews for a document."""
+    for name in preview_names(document):
+        try:
+            os.remove(os.path.join(get_preview_dir(), name))
+        except FileNotFoundError:
+            pass
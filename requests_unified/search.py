@@ -0,0 +1,199 @@
+"""
+Full-text search over request content.
+
+On SQLite the text of each request (title, description, reason, lecturer
+feedback, comments and staff notes) is mirrored into an FTS5 virtual table,
+one row per request with rowid = Request.id, kept in sync by signal handlers.
+PostgreSQL uses its native search vectors instead, and other backends fall back
+to a plain icontains scan.
+"""
+import re
+
+from django.db import connection, connections
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+FTS_TABLE = 'requests_unified_request_fts'
+
+# Column order matters: it is used by bm25() weights and snippet().
+FTS_COLUMNS = ['title', 'description', 'reason', 'lecturer_feedback', 'comments', 'notes']
+FTS_WEIGHTS = [10.0, 4.0, 2.0, 2.0, 1.0, 1.0]
+
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_TOKENS = 12
+
+DEFAULT_LIMIT = 50
+
+REBUILD_SQL = f"""
+    INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)})
+    SELECT r.id, r.title, r.description, r.reason, r.lecturer_feedback,
+           (SELECT group_concat(c.comment, ' ') FROM requests_unified_comment c WHERE c.request_id = r.id),
+           (SELECT group_concat(n.note, ' ') FROM requests_unified_staffnote n WHERE n.request_id = r.id)
+    FROM requests_unified_request r
+"""
+
+
+def uses_fts():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(text):
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+    Every word is quoted (so operators in user input are literal) and prefix-matched.
+    """
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def render_snippet(snippet):
+    """Escape a raw snippet and turn the match markers into <mark> tags."""
+    html = escape(snippet or '')
+    return mark_safe(html.replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>'))
+
+
+# ============================================
+# INDEX MAINTENANCE (SQLite only)
+# ============================================
+
+def index_request(request_pk):
+    """Re-index one request, or drop it from the index if it no longer exists."""
+    if not uses_fts():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [request_pk])
+        cursor.execute(REBUILD_SQL + " WHERE r.id = %s", [request_pk])
+
+
+def remove_request(request_pk):
+    if not uses_fts():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [request_pk])
+
+
+def rebuild_index():
+    """Rebuild the whole index in one set-based statement. Returns the number of indexed requests."""
+    if not uses_fts():
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(REBUILD_SQL)
+        cursor.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
+
+
+# ============================================
+# QUERYING
+# ============================================
+
+def search_requests(text, queryset=None, limit=DEFAULT_LIMIT):
+    """
+    Search request content and return a ranked list of Request objects.
+    Each result carries `search_snippet` (safe HTML with <mark> highlights).
+    When a queryset is given, results are restricted to it.
+    """
+    from .models import Request
+
+    if queryset is None:
+        queryset = Request.objects.all()
+    text = (text or '').strip()
+    if not text:
+        return []
+
+    if uses_fts():
+        return _search_fts(text, queryset, limit)
+    if connection.vendor == 'postgresql':
+        return _search_postgres(text, queryset, limit)
+    return _search_fallback(text, queryset, limit)
+
+
+def _search_fts(text, queryset, limit):
+    match = build_match_query(text)
+    if not match:
+        return []
+
+    scope_sql, scope_params = queryset.order_by().values('pk').query.sql_with_params()
+    weights = ', '.join(str(w) for w in FTS_WEIGHTS)
+    sql = f"""
+        SELECT rowid,
+               snippet({FTS_TABLE}, -1, %s, %s, '…', {SNIPPET_TOKENS}),
+               bm25({FTS_TABLE}, {weights}) AS rank
+        FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH %s AND rowid IN ({scope_sql})
+        ORDER BY rank
+        LIMIT %s
+    """
+    # Read from wherever the queryset reads (e.g. the replica on dashboards).
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, [SNIPPET_START, SNIPPET_END, match, *scope_params, limit])
+        rows = cursor.fetchall()
+
+    by_pk = queryset.select_related('student').in_bulk([pk for pk, _, _ in rows])
+    results = []
+    for pk, snippet, rank in rows:
+        req = by_pk.get(pk)
+        if req is not None:
+            req.search_snippet = render_snippet(snippet)
+            req.search_rank = rank
+            results.append(req)
+    return results
+
+
+def _search_postgres(text, queryset, limit):
+    from django.contrib.postgres.aggregates import StringAgg
+    from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+    from django.db.models import OuterRef, Subquery, Value
+    from django.db.models.functions import Coalesce
+    from .models import Comment, StaffNote
+
+    def aggregated(model, field):
+        return Coalesce(Subquery(
+            model.objects.filter(request=OuterRef('pk')).values('request')
+            .annotate(text=StringAgg(field, ' ')).values('text')
+        ), Value(''))
+
+    query = SearchQuery(text, search_type='websearch')
+    vector = (
+        SearchVector('title', weight='A')
+        + SearchVector('description', weight='B')
+        + SearchVector('reason', 'lecturer_feedback', weight='C')
+        + SearchVector('comment_text', 'note_text', weight='D')
+    )
+    results = list(
+        queryset.select_related('student')
+        .annotate(comment_text=aggregated(Comment, 'comment'), note_text=aggregated(StaffNote, 'note'))
+        .annotate(search_rank=SearchRank(vector, query))
+        .filter(search_rank__gt=0)
+        .annotate(raw_snippet=SearchHeadline(
+            'description', query, start_sel=SNIPPET_START, stop_sel=SNIPPET_END, max_words=SNIPPET_TOKENS,
+        ))
+        .order_by('-search_rank')[:limit]
+    )
+    for req in results:
+        req.search_snippet = render_snippet(req.raw_snippet)
+    return results
+
+
+def _search_fallback(text, queryset, limit):
+    condition = Q()
+    for field in ['title', 'description', 'reason', 'lecturer_feedback',
+                  'comments__comment', 'staff_notes__note']:
+        condition |= Q(**{f'{field}__icontains': text})
+
+    results = list(queryset.select_related('student').filter(condition).distinct()[:limit])
+    pattern = re.compile(re.escape(text), re.IGNORECASE)
+    for req in results:
+        source = next((value for value in (req.title, req.description, req.reason, req.lecturer_feedback)
+                       if value and pattern.search(value)), req.title)
+        match = pattern.search(source)
+        start = max(match.start() - 60, 0) if match else 0
+        excerpt = pattern.sub(lambda m: f'{SNIPPET_START}{m.group(0)}{SNIPPET_END}', source[start:start + 160])
+        req.search_snippet = render_snippet(excerpt)
+        req.search_rank = 0
+    return results
@@ -1,15 +1,26 @@
 """
 Signal handlers for handling orphaned requests when courses or lecturers are deleted.
 Routes pending requests to Head of Department.
-Also handles automatic initialization of required data (degrees).
+Also handles automatic initialization of required data (degrees)
+background preview rendering for uploaded documents,
+keeping the full-text search and typeahead indexes in sync,
+counting submissions and decisions for /metrics,
+waking live notification streams and maintaining unread notification counters.
 """
 import sys
-from django.db.models.signals import pre_delete, m2m_changed, post_migrate
+from django.db import transaction
+from django.db.models.signals import pre_delete, post_delete, post_save, m2m_changed, post_migrate
 from django.dispatch import receiver
 from django.conf import settings
 
+from core import metrics
 from core.models import User
-from .models import Course, Request, StatusHistory, Notification, Degree
+from .models import (
+    ApprovalLog, ChangeLog, Course, Request, StatusHistory, Notification, Degree, RequestDocument, Comment,
+    StaffNote,
+)
+from .previews import schedule_previews, delete_previews
+from . import live, notifications, search, sync, typeahead
 
 
 # =============================================================================
@@ -97,11 +108,7 @@ def route_requests_to_hod(requests_queryset, reason):
         )
         
         # Notify student
-        Notification.objects.create(
-            user=req.student,
-            request=req,
-            message=f"Your request has been automatically routed to the Head of Department due to: {reason}"
-        )
+        notifications.notify(req.student, req, 'routed_to_hod', reason=reason)
 
 
 @receiver(pre_delete, sender=Course)
@@ -147,3 +154,125 @@ def handle_lecturer_deletion(sender, instance, **kwargs):
             Request.objects.filter(assigned_lecturer=instance),
             f"Lecturer '{instance.get_full_name()}' account was removed"
         )
+
+
+@receiver(post_save, sender=RequestDocument)
+def render_document_previews(sender, instance, created, **kwargs):
+    """
+    Queue preview/thumbnail rendering once the upload is committed.
+    Rendering is done inline during tests so results are deterministic.
+    """
+    if created and instance.file:
+        transaction.on_commit(lambda: schedule_previews(instance, inline=is_testing()))
+
+
+@receiver(post_delete, sender=RequestDocument)
+def remove_document_previews(sender, instance, **kwargs):
+    """Drop cached previews together with the document row."""
+    delete_previews(instance)
+
+
+@receiver(post_save, sender=Request)
+def index_saved_request(sender, instance, **kwargs):
+    """Keep the request's full-text index row in sync."""
+    search.index_request(instance.pk)
+
+
+@receiver(post_delete, sender=Request)
+def unindex_deleted_request(sender, instance, **kwargs):
+    search.remove_request(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=StaffNote)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=StaffNote)
+def reindex_request_text(sender, instance, **kwargs):
+    """Comments and staff notes are indexed as part of their request."""
+    search.index_request(instance.request_id)
+
+
+def invalidate_typeahead(*names):
+    """Drop cached typeahead indexes now and again once the transaction commits."""
+    typeahead.invalidate(*names)
+    transaction.on_commit(lambda: typeahead.invalidate(*names))
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_typeahead(sender, **kwargs):
+    invalidate_typeahead('courses')
+
+
+@receiver(m2m_changed, sender=Course.degrees.through)
+def invalidate_course_degree_typeahead(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate_typeahead('courses')
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_typeahead_on_save(sender, update_fields=None, **kwargs):
+    """Logins only touch last_login, which the typeahead does not show."""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_typeahead('lecturers', 'students')
+
+
+@receiver(post_delete, sender=User)
+def invalidate_user_typeahead_on_delete(sender, **kwargs):
+    invalidate_typeahead('lecturers', 'students')
+
+
+@receiver(post_save, sender=Request)
+def count_submission(sender, instance, created, **kwargs):
+    if created:
+        request_type = instance.request_type
+        transaction.on_commit(lambda: metrics.workflow_submissions.inc(request_type=request_type))
+
+
+@receiver(post_save, sender=ApprovalLog)
+def count_decision(sender, instance, created, **kwargs):
+    if created:
+        role, action = instance.approver.role, instance.action
+        transaction.on_commit(lambda: metrics.workflow_decisions.inc(role=role, action=action))
+
+
+@receiver(post_save, sender=Notification)
+def publish_notification(sender, instance, created, **kwargs):
+    if created:
+        user_id = instance.user_id
+        transaction.on_commit(lambda: live.publish(user_id))
+
+
+@receiver(post_save, sender=StatusHistory)
+def publish_status_change(sender, instance, created, **kwargs):
+    if created:
+        student_id = instance.request.student_id
+        transaction.on_commit(lambda: live.publish(student_id))
+
+
+@receiver(post_save, sender=Notification)
+def count_unread_notification(sender, instance, created, **kwargs):
+    """New unread rows add one; any other save (e.g. is_read edited directly) recounts the user."""
+    if created:
+        if not instance.is_read:
+            notifications.add_unread(instance.user_id)
+    else:
+        notifications.recount([instance.user_id])
+
+
+@receiver(post_save, sender=Request)
+@receiver(post_delete, sender=Request)
+def log_request_change(sender, instance, **kwargs):
+    """Delta sync change log (see requests_unified.sync)."""
+    sync.record([(instance.student_id, ChangeLog.ENTITY_REQUEST, instance.pk)])
+
+
+@receiver(post_save, sender=StatusHistory)
+def log_status_change(sender, instance, **kwargs):
+    sync.record([(instance.request.student_id, ChangeLog.ENTITY_STATUS, instance.pk)])
+
+
+@receiver(post_save, sender=Notification)
+def log_notification_change(sender, instance, **kwargs):
+    sync.record([(instance.user_id, ChangeLog.ENTITY_NOTIFICATION, instance.pk)])
@@ -0,0 +1,208 @@
+"""
+Delta sync: the requests, status history entries and notifications a
+user's client has to update since its last poll.
+
+Workflow signals (and the bulk helpers that bypass them, see
+notifications.mark_read() and archive.archive_batch()) append a ChangeLog
+row per changed object and affected user. Its autoincrement id is the sync
+position: SQLite serializes writers, so ids become visible in order and a
+client at position N has seen every change up to N.
+
+A client starts without a cursor and gets a snapshot plus a cursor, then
+polls with the cursor it was last given. Each changed object is sent once
+in its current state, however often it changed; objects that no longer
+exist (or are no longer the user's) are listed under "deleted". A deleted
+request takes its status history and notifications with it. Marking all
+notifications read is logged once per user, not per notification: the delta
+then has notifications_read set, and every notification the client already
+holds is read.
+
+The compact_notifications command deletes change-log rows older than its
+retention window. A cursor from before the oldest row left can no longer
+be served: changes() raises CursorExpired and the client has to start over
+from a snapshot.
+"""
+import base64
+import binascii
+
+from django.db.models import Max, Min
+
+from .models import ChangeLog, Notification, Request, StatusHistory
+from .notification_messages import render as render_message
+
+# Change-log rows read per poll; has_more tells the client to poll again.
+MAX_CHANGES = 500
+# The snapshot includes only the most recent notifications.
+SNAPSHOT_NOTIFICATIONS = 100
+
+REQUEST_FIELDS = (
+    'id', 'request_id', 'title', 'description', 'request_type', 'status', 'priority',
+    'course', 'created_at', 'updated_at',
+)
+STATUS_FIELDS = ('id', 'request', 'status', 'description', 'role', 'created_at')
+
+
+class CursorExpired(Exception):
+    """The changes after a cursor have been compacted away; the client needs a new snapshot."""
+
+
+# ============================================
+# RECORDING CHANGES
+# ============================================
+
+def record(entries):
+    """Append (user_id, entity, object_id) entries to the change log in one INSERT."""
+    rows = [
+        ChangeLog(user_id=user_id, entity=entity, object_id=object_id)
+        for user_id, entity, object_id in entries if user_id
+    ]
+    if rows:
+        ChangeLog.objects.bulk_create(rows, batch_size=500)
+
+
+# ============================================
+# CURSORS
+# ============================================
+
+def encode_cursor(position):
+    return base64.urlsafe_b64encode(f'v1:{position}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """Position encoded in a cursor; ValueError if it is not one of ours."""
+    try:
+        version, position = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode().split(':')
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {value!r}")
+    if version != 'v1' or not position.isdigit():
+        raise ValueError(f"Invalid cursor: {value!r}")
+    return int(position)
+
+
+def latest_position():
+    return ChangeLog.objects.aggregate(position=Max('id'))['position'] or 0
+
+
+def oldest_position():
+    return ChangeLog.objects.aggregate(position=Min('id'))['position'] or 0
+
+
+# ============================================
+# SERIALIZATION
+# ============================================
+
+def _requests(queryset):
+    return [
+        {**row, 'created_at': row['created_at'].isoformat(), 'updated_at': row['updated_at'].isoformat()}
+        for row in queryset.order_by('pk').values(*REQUEST_FIELDS)
+    ]
+
+
+def _status_history(queryset):
+    return [
+        {**row, 'created_at': row['created_at'].isoformat()}
+        for row in queryset.order_by('pk').values(*STATUS_FIELDS)
+    ]
+
+
+def _notifications(rows):
+    return [
+        {
+            'id': row['pk'],
+            'request': row['request'],
+            'code': row['code'],
+            'message': render_message(row['code'], row['params'], row['request__title'], row['message']),
+            'is_read': row['is_read'],
+            'created_at': row['created_at'].isoformat(),
+        }
+        for row in rows.values(
+            'pk', 'request', 'code', 'params', 'message', 'request__title', 'is_read', 'created_at',
+        )
+    ]
+
+
+def _payload(position, has_more, requests, status_history, notifications, deleted=None, all_read=False):
+    return {
+        'cursor': encode_cursor(position),
+        'has_more': has_more,
+        'requests': requests,
+        'status_history': status_history,
+        'notifications': notifications,
+        'notifications_read': all_read,
+        'deleted': deleted or {'requests': [], 'status_history': [], 'notifications': []},
+    }
+
+
+# ============================================
+# FEED
+# ============================================
+
+def snapshot(user):
+    """Everything a new client needs, with the cursor to poll from."""
+    # Read the position first: anything changing meanwhile is sent again on the next poll.
+    position = latest_position()
+    recent = list(
+        Notification.objects.filter(user=user).order_by('-created_at', '-pk')
+        .values_list('pk', flat=True)[:SNAPSHOT_NOTIFICATIONS]
+    )
+    return _payload(
+        position, False,
+        _requests(Request.objects.filter(student=user)),
+        _status_history(StatusHistory.objects.filter(request__student=user)),
+        _notifications(Notification.objects.filter(pk__in=recent).order_by('pk')),
+    )
+
+
+def changes(user, position, limit=MAX_CHANGES):
+    """Objects changed after position, in their current state, and the new position."""
+    # Ids are never reused, so a gap below the oldest row means rows were compacted.
+    if position < oldest_position() - 1:
+        raise CursorExpired(f"Changes after position {position} are no longer kept")
+    entries = list(
+        ChangeLog.objects.filter(user=user, id__gt=position).order_by('id')
+        .values_list('id', 'entity', 'object_id')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if entries:
+        position = entries[-1][0]
+
+    changed = {entity: set() for entity, _ in ChangeLog.ENTITY_CHOICES}
+    for _, entity, object_id in entries:
+        changed[entity].add(object_id)
+
+    requests = _requests(Request.objects.filter(student=user, pk__in=changed[ChangeLog.ENTITY_REQUEST]))
+    history = _status_history(
+        StatusHistory.objects.filter(request__student=user, pk__in=changed[ChangeLog.ENTITY_STATUS])
+    )
+    notifications = _notifications(
+        Notification.objects.filter(user=user, pk__in=changed[ChangeLog.ENTITY_NOTIFICATION]).order_by('pk')
+    )
+
+    def missing(entity, rows):
+        return sorted(changed[entity] - {row['id'] for row in rows})
+
+    return _payload(position, has_more, requests, history, notifications, {
+        'requests': missing(ChangeLog.ENTITY_REQUEST, requests),
+        'status_history': missing(ChangeLog.ENTITY_STATUS, history),
+        'notifications': missing(ChangeLog.ENTITY_NOTIFICATION, notifications),
+    }, all_read=bool(changed[ChangeLog.ENTITY_ALL_READ]))
+
+
+# ============================================
+# RETENTION
+# ============================================
+
+def compactable(before):
+    """Change-log rows created before the cutoff, except the newest row."""
+    # Keeping the newest row keeps oldest_position() at the compaction horizon.
+    return ChangeLog.objects.filter(created_at__lt=before, id__lt=latest_position())
+
+
+def compact_batch(before, batch_size):
+    """Delete one batch of old change-log rows; returns the number deleted."""
+    pks = list(compactable(before).order_by('pk').values_list('pk', flat=True)[:batch_size])
+    if not pks:
+        return 0
+    deleted, _ = ChangeLog.objects.filter(pk__in=pks).delete()
+    return deleted
@@ -0,0 +1,158 @@
+"""
+In-process prefix indexes for typeahead/autocomplete endpoints.
+
+Each index is a sorted array of lowercase keys (course code, name words, user
+names, email...) searched with bisect, so a lookup costs O(log n + k) and never
+touches the database. Indexes are built lazily, dropped by model signals when
+their source data changes, and rebuilt after TYPEAHEAD_MAX_AGE seconds so that
+other worker processes (which do not see our signals) converge too. Scopes
+come from the client (?degree=<id>), so at most TYPEAHEAD_MAX_INDEXES
+indexes are kept, least recently used first out.
+"""
+import threading
+import time
+from collections import OrderedDict
+from bisect import bisect_left
+
+from django.conf import settings
+
+from core import metrics
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+def normalize(value):
+    return (value or '').strip().lower()
+
+
+class PrefixIndex:
+    """Sorted (key -> item) array answering "top-k items with a key starting with prefix"."""
+
+    def __init__(self, entries):
+        """entries: iterable of (keys, item); an item may be reachable through several keys."""
+        self.items = []
+        pairs = []
+        for keys, item in entries:
+            ref = len(self.items)
+            self.items.append(item)
+            pairs.extend((normalize(key), ref) for key in keys if key)
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.refs = [ref for _, ref in pairs]
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.items)
+
+    def search(self, prefix, limit=DEFAULT_LIMIT):
+        prefix = normalize(prefix)
+        results = []
+        seen = set()
+        for pos in range(bisect_left(self.keys, prefix), len(self.keys)):
+            if not self.keys[pos].startswith(prefix):
+                break
+            ref = self.refs[pos]
+            if ref in seen:
+                continue
+            seen.add(ref)
+            results.append(self.items[ref])
+            if len(results) >= limit:
+                break
+        return results
+
+
+# ============================================
+# INDEX BUILDERS
+# ============================================
+
+def _user_entries(role):
+    from core.models import User
+
+    users = (
+        User.objects.filter(role=role, is_active=True)
+        .order_by('first_name', 'last_name')
+        .values('id', 'first_name', 'last_name', 'email', 'student_id', 'employee_id')
+    )
+    for user in users:
+        name = f"{user['first_name']} {user['last_name']}".strip()
+        item = {'id': user['id'], 'name': name, 'email': user['email'], 'label': f"{name} ({user['email']})"}
+        keys = [name, user['first_name'], user['last_name'], user['email']]
+        if role == User.ROLE_STUDENT:
+            item['student_id'] = user['student_id']
+            keys.append(user['student_id'])
+        else:
+            keys.append(user['employee_id'])
+        yield keys, item
+
+
+def build_courses(degree_id=None):
+    from .models import Course
+
+    courses = Course.objects.filter(is_active=True).order_by('code')
+    if degree_id is not None:
+        courses = courses.filter(degrees=degree_id)
+    for course in courses.values('id', 'code', 'name'):
+        item = {**course, 'label': f"{course['code']} - {course['name']}"}
+        yield [course['code'], course['name'], *course['name'].split()], item
+
+
+def build_lecturers(scope=None):
+    from core.models import User
+    return _user_entries(User.ROLE_LECTURER)
+
+
+def build_students(scope=None):
+    from core.models import User
+    return _user_entries(User.ROLE_STUDENT)
+
+
+BUILDERS = {
+    'courses': build_courses,
+    'lecturers': build_lecturers,
+    'students': build_students,
+}
+
+
+# ============================================
+# REGISTRY
+# ============================================
+
+_indexes = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_index(name, scope=None):
+    """Return the (possibly freshly built) index for `name`, optionally narrowed by scope."""
+    max_age = getattr(settings, 'TYPEAHEAD_MAX_AGE', 300)
+    key = (name, scope)
+    index = _indexes.get(key)
+    if index is not None and time.monotonic() - index.built_at < max_age:
+        metrics.cache_requests.inc(cache='typeahead', result='hit')
+        with _lock:
+            if key in _indexes:
+                _indexes.move_to_end(key)
+        return index
+
+    metrics.cache_requests.inc(cache='typeahead', result='miss')
+    with _lock:
+        index = _indexes.get(key)
+        if index is None or time.monotonic() - index.built_at >= max_age:
+            index = PrefixIndex(BUILDERS[name](scope))
+            _indexes[key] = index
+        _indexes.move_to_end(key)
+        while len(_indexes) > getattr(settings, 'TYPEAHEAD_MAX_INDEXES', 64):
+            _indexes.popitem(last=False)
+        return index
+
+
+def invalidate(*names):
+    """Drop all cached indexes (every scope) for the given names."""
+    with _lock:
+        for key in [key for key in _indexes if key[0] in names]:
+            del _indexes[key]
+
+
+def search(name, prefix, limit=DEFAULT_LIMIT, scope=None):
+    limit = max(1, min(limit, MAX_LIMIT))
+    return get_index(name, scope).search(prefix, limit)
@@ -0,0 +1,13 @@
+"""
+Shared JSON endpoints (typeahead/autocomplete).
+"""
+from django.urls import path
+from . import views
+
+app_name = "typeahead"
+
+urlpatterns = [
+    path("courses/", views.courses, name="courses"),
+    path("lecturers/", views.lecturers, name="lecturers"),
+    path("students/", views.students, name="students"),
+]
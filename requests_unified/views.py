@@ -0,0 +1,256 @@
+"""
+Typeahead (autocomplete) JSON endpoints shared by the student and management forms,
+the notification center and live notification stream shared by every role, and
+the delta sync feed and versioned REST API for client apps.
+"""
+import json
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.shortcuts import redirect, render
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
+
+from core.models import User
+from . import api, batch, digests, live, notifications, sync, typeahead
+from .models import NotificationPreference
+
+
+def json_api(allowed_roles=None):
+    """Decorator for JSON endpoints - JSON errors instead of redirects."""
+    def decorator(view_func):
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                return JsonResponse({'error': 'Unauthorized'}, status=401)
+            if allowed_roles and not (request.user.role in allowed_roles or request.user.is_superuser):
+                return JsonResponse({'error': 'Forbidden'}, status=403)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _limit(request):
+    try:
+        return int(request.GET.get('limit', typeahead.DEFAULT_LIMIT))
+    except ValueError:
+        return typeahead.DEFAULT_LIMIT
+
+
+def _results(request, name, scope=None):
+    results = typeahead.search(name, request.GET.get('q', ''), _limit(request), scope=scope)
+    response = JsonResponse({'results': results})
+    response['Cache-Control'] = 'private, max-age=30'
+    return response
+
+
+STAFF_ROLES = [User.ROLE_ADMIN, User.ROLE_HEAD_OF_DEPT, User.ROLE_SECRETARY]
+
+
+@require_GET
+@json_api()
+def courses(request: HttpRequest) -> JsonResponse:
+    """Active courses matching ?q=, optionally restricted to ?degree=<id>."""
+    degree = request.GET.get('degree', '')
+    return _results(request, 'courses', scope=int(degree) if degree.isdigit() else None)
+
+
+@require_GET
+@json_api(STAFF_ROLES)
+def lecturers(request: HttpRequest) -> JsonResponse:
+    """Active lecturers matching ?q= (name, email or employee ID)."""
+    return _results(request, 'lecturers')
+
+
+@require_GET
+@json_api(STAFF_ROLES + [User.ROLE_LECTURER])
+def students(request: HttpRequest) -> JsonResponse:
+    """Active students matching ?q= (name, email or student ID)."""
+    return _results(request, 'students')
+
+
+@require_GET
+async def notification_stream(request: HttpRequest) -> StreamingHttpResponse:
+    """
+    Server-sent events with the user's new notifications and, for students,
+    status changes of their requests. Resumes after Last-Event-ID (or ?after=).
+    Held open under ASGI; under WSGI each response is a short poll (see
+    requests_unified.live).
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+    cursor = live.parse_cursor(request.headers.get('Last-Event-ID') or request.GET.get('after'))
+    if isinstance(request, ASGIRequest):
+        body = live.stream(user.pk, cursor)
+    else:
+        body = live.poll(user.pk, cursor)
+    response = StreamingHttpResponse(body, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+    return response
+
+
+@require_GET
+def sync_changes(request: HttpRequest) -> JsonResponse:
+    """
+    Delta sync feed (see requests_unified.sync): a snapshot without ?cursor=,
+    otherwise what changed since the cursor of the previous response, or 410
+    if that cursor predates the retained change log.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            payload = sync.changes(request.user, sync.decode_cursor(cursor))
+        except ValueError:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+        except sync.CursorExpired:
+            # 410 tells the client to drop its cursor and fetch a snapshot.
+            return JsonResponse({'error': 'Cursor expired', 'reset': True}, status=410)
+    else:
+        payload = sync.snapshot(request.user)
+    response = JsonResponse(payload)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _api_response(request, etag, build):
+    """304 if the client has etag, else the JSON from build(); clients always revalidate."""
+    if api.etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = JsonResponse(build())
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@require_GET
+@json_api(api.API_ROLES)
+def api_request_list(request: HttpRequest) -> HttpResponse:
+    """
+    Requests visible to the user, newest first: ?fields=, ?limit= and
+    ?cursor= (next_cursor of the previous page), filters as in api.filter_requests.
+    """
+    try:
+        fields = api.parse_fields(request.GET.get('fields'), api.DEFAULT_LIST_FIELDS)
+        queryset = api.filter_requests(api.visible_requests(request.user), request.GET)
+        pks, updated, next_cursor = api.page_keys(
+            queryset, request.GET.get('cursor'), api.page_size(request.GET.get('limit')),
+        )
+    except api.APIError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    def build():
+        lookups, serialize = api.compile_serializer(fields)
+        return {'results': api.fetch(queryset, pks, lookups, serialize), 'next_cursor': next_cursor}
+    return _api_response(request, api.make_etag(request.user.pk, fields, pks, updated, next_cursor), build)
+
+
+@require_GET
+@json_api(api.API_ROLES)
+def api_request_detail(request: HttpRequest, request_id: str) -> HttpResponse:
+    """One request by its public request_id, with every field unless ?fields= narrows it."""
+    try:
+        fields = api.parse_fields(request.GET.get('fields'), api.REQUEST_FIELDS)
+    except api.APIError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    queryset = api.visible_requests(request.user).filter(request_id=request_id)
+    key = queryset.values_list('pk', 'updated_at').first()
+    if key is None:
+        return JsonResponse({'error': 'Not found'}, status=404)
+
+    def build():
+        lookups, serialize = api.compile_serializer(fields)
+        return api.fetch(queryset, [key[0]], lookups, serialize)[0]
+    return _api_response(request, api.make_etag(request.user.pk, fields, key), build)
+
+
+# Where a notification about a request links to, per role: (URL name, Request attribute)
+REQUEST_LINKS = {
+    User.ROLE_STUDENT: ('students:request_detail', 'request_id'),
+    User.ROLE_SECRETARY: ('staff:request_detail', 'pk'),
+    User.ROLE_LECTURER: ('lecturers:request_detail', 'pk'),
+    User.ROLE_HEAD_OF_DEPT: ('head_of_dept:request_detail', 'pk'),
+}
+
+
+@login_required
+@require_GET
+def notification_center(request: HttpRequest) -> HttpResponse:
+    """All notifications of the user, newest first, one keyset page at a time (?before=, ?show=unread)."""
+    show = 'unread' if request.GET.get('show') == 'unread' else 'all'
+    items, next_position = notifications.page(
+        request.user.pk, before=request.GET.get('before'), unread_only=show == 'unread',
+    )
+    link = REQUEST_LINKS.get(request.user.role)
+    for item in items:
+        item.link = reverse(link[0], args=[getattr(item.request, link[1])]) if link and item.request else None
+
+    preference = NotificationPreference.objects.filter(user=request.user).first()
+    email_delivery, digest_hours = digests.get_delivery(request.user, preference)
+    context = {
+        'notifications': items,
+        'next_position': next_position,
+        'show': show,
+        'unread_count': notifications.unread_count(request.user.pk),
+        'email_delivery': email_delivery,
+        'digest_hours': digest_hours,
+        'delivery_choices': NotificationPreference.DELIVERY_CHOICES,
+    }
+    return render(request, 'notifications/center.html', context)
+
+
+@login_required
+@require_POST
+def mark_notification_read(request: HttpRequest, notification_id: int) -> HttpResponse:
+    notifications.mark_read(request.user.pk, [notification_id])
+    return redirect('notifications:center')
+
+
+@login_required
+@require_POST
+def mark_all_notifications_read(request: HttpRequest) -> HttpResponse:
+    changed = notifications.mark_all_read(request.user.pk)
+    messages.success(request, f"Marked {changed} notification{'s' if changed != 1 else ''} as read.")
+    return redirect('notifications:center')
+
+
+@login_required
+@require_POST
+def notification_preferences(request: HttpRequest) -> HttpResponse:
+    """Save how the user's notifications are emailed."""
+    delivery = request.POST.get('email_delivery', '')
+    if delivery not in dict(NotificationPreference.DELIVERY_CHOICES):
+        messages.error(request, "Invalid delivery option.")
+        return redirect('notifications:center')
+    try:
+        hours = min(max(int(request.POST.get('digest_hours', 24)), 1), 24 * 7)
+    except ValueError:
+        hours = 24
+    NotificationPreference.objects.update_or_create(
+        user=request.user, defaults={'email_delivery': delivery, 'digest_hours': hours},
+    )
+    messages.success(request, "Email preferences saved.")
+    return redirect('notifications:center')
+
+
+@require_POST
+@json_api(api.API_ROLES)
+def api_batch(request: HttpRequest) -> JsonResponse:
+    """
+    Run an ordered list of workflow operations in one transaction (see
+    requests_unified.batch). Body: {"operations": [{"op", "request", "data"}]}.
+    """
+    try:
+        operations = batch.parse(json.loads(request.body or b'null'))
+    except ValueError:
+        return JsonResponse({'error': 'Body must be JSON'}, status=400)
+    except batch.BatchError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    succeeded, results = batch.execute(request, operations)
+    # Nothing is applied unless every operation succeeded.
+    return JsonResponse({'success': succeeded, 'results': results}, status=200 if succeeded else 409)
@@ -9,8 +9,10 @@ from django.utils import timezone
 
 from core.models import User
 from requests_unified.models import (
-    Request, StaffNote, MissingDocument, StatusHistory, Notification, Degree
+    Request, StaffNote, MissingDocument, StatusHistory, Degree
 )
+from requests_unified import notifications
+from requests_unified.search import search_requests
 
 
 def staff_required(view_func):
@@ -31,8 +33,9 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     """Staff dashboard - view all requests."""
     status_filter = request.GET.get("status", "all")
     view_mode = request.GET.get("view", "requests")  # 'requests' or 'lecturers'
+    search = request.GET.get("search", "").strip()
     
-    requests_qs = Request.objects.all().order_by("-created_at")
+    requests_qs = Request.objects.select_related("student").order_by("-created_at")
     
     # Count statistics
     total = requests_qs.count()
@@ -69,8 +72,13 @@ def dashboard(request: HttpRequest) -> HttpResponse:
             status__in=[Request.STATUS_APPROVED, Request.STATUS_REJECTED]
         )
     
+    # Full-text search within the current filter, ranked by relevance
+    if search:
+        visible_requests = search_requests(search, visible_requests)
+    
     context = {
         "requests": visible_requests,
+        "search": search,
         "total": total,
         "new_count": new_count,
         "in_progress": in_progress,
@@ -205,11 +213,7 @@ def request_docs(request: HttpRequest, request_id: int) -> HttpResponse:
             )
             
             # Notify student
-            Notification.objects.create(
-                user=req.student,
-                request=req,
-                message=f"Additional document requested: {doc_name}. Please check your request details."
-            )
+            notifications.notify(req.student, req, 'document_requested', document=doc_name)
             
             messages.success(request, "Additional documents request sent to student.")
         else:
@@ -272,18 +276,10 @@ def send_to_lecturer(request: HttpRequest, request_id: int) -> HttpResponse:
         )
         
         # Notify the assigned lecturer
-        Notification.objects.create(
-            user=lecturer,
-            request=req,
-            message=f"A new request has been assigned to you: {req.title}"
-        )
+        notifications.notify(lecturer, req, 'assigned')
         
         # Notify student
-        Notification.objects.create(
-            user=req.student,
-            request=req,
-            message=f"Your request has been forwarded to {lecturer.get_full_name()} for review."
-        )
+        notifications.notify(req.student, req, 'forwarded_to_lecturer', lecturer=lecturer.get_full_name())
         
         messages.success(request, f"Request sent to {lecturer.get_full_name()}.")
         return redirect("staff:request_detail", request_id=req.id)
@@ -316,11 +312,7 @@ def send_to_hod(request: HttpRequest, request_id: int) -> HttpResponse:
     )
     
     # Notify student
-    Notification.objects.create(
-        user=req.student,
-        request=req,
-        message="Your request has been forwarded to the Head of Department."
-    )
+    notifications.notify(req.student, req, 'sent_to_hod')
     
     messages.success(request, "Request sent to Head of Department.")
     return redirect("staff:request_detail", request_id=req.id)
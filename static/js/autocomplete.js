@@ -0,0 +1,109 @@
+/*
+ * Lazy autocomplete widget backed by the /api/typeahead/ endpoints.
+ *
+ * Markup:
+ *   <div class="autocomplete" data-autocomplete="{% url 'typeahead:courses' %}"
+ *        data-autocomplete-name="course" [data-autocomplete-multiple] [data-autocomplete-params="degree=1"]>
+ *     <input type="text" data-autocomplete-input>
+ *     <input type="hidden" name="course">                <!-- single mode -->
+ *     <ul data-autocomplete-selected>...</ul>            <!-- multiple mode: chips with hidden inputs -->
+ *     <ul data-autocomplete-results hidden>...</ul>      <!-- may be pre-filled with initial suggestions -->
+ *   </div>
+ */
+(function () {
+    const DEBOUNCE_MS = 150;
+
+    function initAutocomplete(root) {
+        const url = root.dataset.autocomplete;
+        const name = root.dataset.autocompleteName;
+        const multiple = root.hasAttribute('data-autocomplete-multiple');
+        const params = root.dataset.autocompleteParams || '';
+        const input = root.querySelector('[data-autocomplete-input]');
+        const results = root.querySelector('[data-autocomplete-results]');
+        const selected = root.querySelector('[data-autocomplete-selected]');
+        const hidden = multiple ? null : root.querySelector(`input[type=hidden][name="${name}"]`);
+        let timer = null;
+        let controller = null;
+
+        function addChip(id, label) {
+            if (selected.querySelector(`input[value="${id}"]`)) return;
+            const chip = document.createElement('li');
+            chip.className = 'autocomplete-chip';
+            chip.innerHTML = '<input type="hidden"><span></span><button type="button" aria-label="Remove">&times;</button>';
+            chip.querySelector('input').name = name;
+            chip.querySelector('input').value = id;
+            chip.querySelector('span').textContent = label;
+            selected.appendChild(chip);
+        }
+
+        function choose(item) {
+            if (multiple) {
+                addChip(item.dataset.id, item.textContent);
+                input.value = '';
+            } else {
+                hidden.value = item.dataset.id;
+                input.value = item.textContent;
+            }
+            results.hidden = true;
+        }
+
+        function render(items) {
+            results.innerHTML = '';
+            items.forEach(function (item) {
+                const li = document.createElement('li');
+                li.dataset.id = item.id;
+                li.textContent = item.label;
+                results.appendChild(li);
+            });
+            results.hidden = items.length === 0;
+        }
+
+        function fetchResults() {
+            if (controller) controller.abort();
+            controller = new AbortController();
+            const query = `q=${encodeURIComponent(input.value)}${params ? '&' + params : ''}`;
+            fetch(`${url}?${query}`, {signal: controller.signal, credentials: 'same-origin'})
+                .then(response => response.ok ? response.json() : {results: []})
+                .then(data => render(data.results))
+                .catch(() => {});
+        }
+
+        input.setAttribute('autocomplete', 'off');
+        input.addEventListener('input', function () {
+            if (hidden) hidden.value = '';
+            clearTimeout(timer);
+            timer = setTimeout(fetchResults, DEBOUNCE_MS);
+        });
+        input.addEventListener('focus', function () {
+            if (results.children.length) results.hidden = false;
+            else fetchResults();
+        });
+        input.addEventListener('keydown', function (e) {
+            if (e.key === 'Enter' && !results.hidden && results.firstElementChild) {
+                e.preventDefault();
+                choose(results.firstElementChild);
+            } else if (e.key === 'Escape') {
+                results.hidden = true;
+            }
+        });
+        results.addEventListener('mousedown', function (e) {
+            const item = e.target.closest('li[data-id]');
+            if (item) {
+                e.preventDefault();
+                choose(item);
+            }
+        });
+        input.addEventListener('blur', function () {
+            results.hidden = true;
+        });
+        if (selected) {
+            selected.addEventListener('click', function (e) {
+                if (e.target.matches('button')) e.target.closest('li').remove();
+            });
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('[data-autocomplete]').forEach(initAutocomplete);
+    });
+})();
@@ -0,0 +1,52 @@
+/*
+ * Live dashboard updates from the notifications:stream server-sent events.
+ *
+ * Markup:
+ *   <div data-live-stream="{% url 'notifications:stream' %}">
+ *     <ul data-live-notifications hidden></ul>        <!-- new notifications are prepended -->
+ *     <p data-live-empty>No notifications yet.</p>    <!-- removed by the first one -->
+ *   </div>
+ *   <span data-live-status="REQ-1234ABCD" class="badge status-new">New</span>
+ *   <div data-live-count="approved">3</div>          <!-- incremented when a request reaches that status -->
+ *
+ * EventSource reconnects by itself and sends Last-Event-ID, so nothing is missed.
+ */
+(function () {
+    const MAX_ITEMS = 10;
+
+    function initLiveStream(root) {
+        if (!window.EventSource) return;
+        const list = root.querySelector('[data-live-notifications]');
+        const empty = root.querySelector('[data-live-empty]');
+        const source = new EventSource(root.dataset.liveStream);
+
+        source.addEventListener('notification', function (event) {
+            const data = JSON.parse(event.data);
+            if (!list) return;
+            const item = document.createElement('li');
+            item.className = 'live-notification';
+            item.textContent = data.message;
+            list.prepend(item);
+            while (list.children.length > MAX_ITEMS) list.lastElementChild.remove();
+            list.hidden = false;
+            if (empty) empty.remove();
+        });
+
+        source.addEventListener('status', function (event) {
+            const data = JSON.parse(event.data);
+            document.querySelectorAll(`[data-live-status="${data.request_id}"]`).forEach(function (badge) {
+                if (badge.dataset.status === data.status) return;
+                badge.classList.remove(`status-${badge.dataset.status}`);
+                badge.classList.add(`status-${data.status}`);
+                badge.dataset.status = data.status;
+                badge.textContent = data.status_display;
+                const counter = document.querySelector(`[data-live-count="${data.status}"]`);
+                if (counter) counter.textContent = (parseInt(counter.textContent, 10) || 0) + 1;
+            });
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('[data-live-stream]').forEach(initLiveStream);
+    });
+})();
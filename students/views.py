@@ -3,17 +3,23 @@ Student portal views - Dashboard, submit requests, track status, profile managem
 """
 from __future__ import annotations
 
+import heapq
 import uuid
 from django.contrib import messages
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.decorators import login_required
 from django.db import transaction
+from django.db.models import Count
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
 from core.models import User
+from requests_unified import live, notifications, typeahead
+from requests_unified.archive import get_request_or_404
+from requests_unified.details import clean_details
 from requests_unified.models import (
-    Request, StatusHistory, Notification, RequestDocument, Course, Degree
+    Request, StatusHistory, Notification, RequestDocument, Course, Degree, ArchivedRequest,
+    RequestDetails,
 )
 
 
@@ -36,7 +42,7 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     user = request.user
     
     requests_qs = Request.objects.filter(student=user).order_by("-created_at")
-    notifications = Notification.objects.filter(user=user).order_by("-created_at")[:10]
+    recent_notifications = Notification.objects.filter(user=user).select_related("request").order_by("-created_at")[:10]
     
     status_filter = request.GET.get("status", "all")
     
@@ -50,6 +56,13 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     approved = requests_qs.filter(status=Request.STATUS_APPROVED).count()
     rejected = requests_qs.filter(status=Request.STATUS_REJECTED).count()
     
+    # Old closed requests live in the archive; they are always approved or rejected
+    archived_qs = ArchivedRequest.objects.filter(student=user)
+    archived_counts = dict(archived_qs.order_by().values_list("status").annotate(n=Count("pk")))
+    total_requests += sum(archived_counts.values())
+    approved += archived_counts.get(Request.STATUS_APPROVED, 0)
+    rejected += archived_counts.get(Request.STATUS_REJECTED, 0)
+    
     if status_filter == "new":
         visible_requests = requests_qs.filter(status=Request.STATUS_NEW)
     elif status_filter == "in_progress":
@@ -66,6 +79,14 @@ def dashboard(request: HttpRequest) -> HttpResponse:
         status_filter = "all"
         visible_requests = requests_qs
     
+    if status_filter in ("all", "approved", "rejected") and archived_counts:
+        archived_visible = archived_qs if status_filter == "all" else archived_qs.filter(status=status_filter)
+        # Both are newest first; merge them so archived requests sit in date order.
+        visible_requests = list(heapq.merge(
+            visible_requests, archived_visible.order_by("-created_at"),
+            key=lambda r: r.created_at, reverse=True,
+        ))
+    
     context = {
         "total_requests": total_requests,
         "new_count": new_count,
@@ -74,7 +95,9 @@ def dashboard(request: HttpRequest) -> HttpResponse:
         "rejected": rejected,
         "requests": visible_requests,
         "status_filter": status_filter,
-        "notifications": notifications,
+        "notifications": recent_notifications,
+        # The live stream starts after what this page already shows
+        "live_cursor": live.format_cursor(live.current_cursor(user.pk)),
     }
     return render(request, "students/dashboard.html", context)
 
@@ -93,11 +116,8 @@ def submit_request(request: HttpRequest, request_type: str = None) -> HttpRespon
     # Get all active degrees (departments) for selection
     degrees = Degree.objects.filter(is_active=True).order_by('name')
     
-    # Get courses for the student's degree
-    if user.degree:
-        courses = Course.objects.filter(degrees=user.degree, is_active=True).order_by('code')
-    else:
-        courses = Course.objects.filter(is_active=True).order_by('code')
+    # Initial course suggestions; the rest are fetched from the typeahead endpoint
+    initial_courses = typeahead.search('courses', '', scope=user.degree_id)
     
     if request.method == "POST":
         title = request.POST.get("title", "")
@@ -127,10 +147,13 @@ def submit_request(request: HttpRequest, request_type: str = None) -> HttpRespon
         dept_display = selected_department.name if selected_department else "Not specified"
         course_display = f"{selected_course.code} - {selected_course.name}" if selected_course else "Not specified"
         
+        # Per-type fields, stored as typed columns in RequestDetails
+        details = {}
         if request_type_value == "Study Approval":
             semester = request.POST.get("semester", "")
             reason = request.POST.get("reason", "")
             
+            details = {"semester": semester}
             if not title:
                 title = f"Study Approval - {dept_display}"
             description = f"Department: {dept_display}\nCourse: {course_display}\nSemester: {semester}\nReason: {reason}"
@@ -141,6 +164,7 @@ def submit_request(request: HttpRequest, request_type: str = None) -> HttpRespon
             reason = request.POST.get("reason", "")
             evidence = request.POST.get("evidence", "")
             
+            details = {"grade_received": grade_received, "expected_grade": expected_grade}
             if not title:
                 title = f"Grade Appeal - {dept_display}"
             description = f"Department: {dept_display}\nCourse: {course_display}\nGrade Received: {grade_received}\nExpected Grade: {expected_grade}\nReason: {reason}\nSupporting Evidence: {evidence}"
@@ -151,6 +175,7 @@ def submit_request(request: HttpRequest, request_type: str = None) -> HttpRespon
             explanation = request.POST.get("explanation", "")
             return_date = request.POST.get("return_date", "")
             
+            details = {"semester": semester, "reason_type": reason_type, "return_date": return_date}
             if not title:
                 title = f"Postponement Request - {semester}"
             description = f"Department: {dept_display}\nSemester to Postpone: {semester}\nReason Type: {reason_type}\nExplanation: {explanation}\nExpected Return Date: {return_date if return_date else 'Not specified'}"
@@ -160,6 +185,7 @@ def submit_request(request: HttpRequest, request_type: str = None) -> HttpRespon
             category = request.POST.get("category", "")
             desc = request.POST.get("description", "")
             
+            details = {"category": category}
             if not title:
                 title = subject or "General Request"
             
@@ -175,6 +201,11 @@ def submit_request(request: HttpRequest, request_type: str = None) -> HttpRespon
             course=selected_course,
             course_name=dept_display,  # Store department in course_name field
         )
+        RequestDetails.objects.create(
+            request=new_request,
+            department=selected_department,
+            **clean_details(details),
+        )
         
         StatusHistory.objects.create(
             request=new_request,
@@ -195,11 +226,7 @@ def submit_request(request: HttpRequest, request_type: str = None) -> HttpRespon
                 uploaded_by_student=True,
             )
         
-        Notification.objects.create(
-            user=request.user,
-            request=new_request,
-            message=f"Your request '{title}' has been submitted successfully."
-        )
+        notifications.notify(request.user, new_request, 'submitted')
         
         messages.success(request, "Your request has been submitted successfully!")
         return redirect("students:dashboard")
@@ -217,7 +244,7 @@ def submit_request(request: HttpRequest, request_type: str = None) -> HttpRespon
     
     context = {
         "initial_data": initial_data,
-        "courses": courses,
+        "initial_courses": initial_courses,
         "degrees": degrees,
     }
     return render(request, "students/request_form.html", context)
@@ -226,8 +253,8 @@ def submit_request(request: HttpRequest, request_type: str = None) -> HttpRespon
 @login_required
 @student_required
 def request_detail(request: HttpRequest, request_id: str) -> HttpResponse:
-    """View details of a specific request."""
-    req = get_object_or_404(Request, request_id=request_id, student=request.user)
+    """View details of a specific request (archived requests included)."""
+    req = get_request_or_404(request_id=request_id, student=request.user)
     status_history = req.status_history.all()
     staff_notes = req.staff_notes.all()
     documents = req.documents.all()
@@ -0,0 +1,32 @@
+// Tailwind configuration for `manage.py build_assets` (Tailwind standalone CLI).
+// The CDN fallback in templates/assets.html carries the same theme inline.
+module.exports = {
+    content: [
+        './templates/**/*.html',
+        './*/templates/**/*.html',
+        './static/js/**/*.js',
+    ],
+    darkMode: 'class',
+    theme: {
+        extend: {
+            fontFamily: {
+                sans: ['Inter', 'system-ui', 'sans-serif'],
+            },
+            colors: {
+                dark: {
+                    50: '#f8fafc',
+                    100: '#f1f5f9',
+                    200: '#e2e8f0',
+                    300: '#cbd5e1',
+                    400: '#94a3b8',
+                    500: '#64748b',
+                    600: '#475569',
+                    700: '#334155',
+                    800: '#1e293b',
+                    900: '#0f172a',
+                    950: '#020617',
+                }
+            }
+        }
+    },
+}
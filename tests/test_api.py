@@ -0,0 +1,186 @@
+"""
+Tests for the versioned JSON REST API.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import User
+from requests_unified.benchmarks import compare_serialization
+from requests_unified.models import Course, Degree, Request
+
+
+class RequestAPITest(TestCase):
+    """Tests for /api/v1/requests/."""
+
+    def setUp(self):
+        self.client = Client()
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.other = User.objects.create_user(
+            username="other",
+            email="other@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Other",
+            last_name="Student",
+        )
+        self.lecturer = User.objects.create_user(
+            username="lecturer",
+            email="lecturer@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_LECTURER,
+            first_name="Lecturer",
+            last_name="One",
+        )
+        self.secretary = User.objects.create_user(
+            username="secretary",
+            email="secretary@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_SECRETARY,
+            first_name="Secretary",
+            last_name="One",
+        )
+        degree = Degree.objects.create(name="Software Engineering", code="SEX")
+        self.course = Course.objects.create(code="CS101", name="Intro")
+        self.course.degrees.add(degree)
+        self.course.lecturers.add(self.lecturer)
+
+        self.mine = [
+            Request.objects.create(student=self.student, title=f"Mine {i}", description="D", course=self.course)
+            for i in range(5)
+        ]
+        # Distinct, increasing creation times; two share one to exercise the id tie-break.
+        base = timezone.now() - timedelta(days=1)
+        for i, req in enumerate(self.mine):
+            Request.objects.filter(pk=req.pk).update(created_at=base + timedelta(minutes=min(i, 3)))
+        self.theirs = Request.objects.create(
+            student=self.other, title="Theirs", description="D", status=Request.STATUS_SENT_TO_LECTURER,
+            course=self.course,
+        )
+
+    def _get(self, user, url, params=None, **headers):
+        self.client.force_login(user)
+        return self.client.get(url, params or {}, **headers)
+
+    def test_students_see_only_their_requests_across_pages(self):
+        """Test that cursor pages cover the student's requests exactly once, newest first."""
+        url = reverse('api_v1:request_list')
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 2, **({'cursor': cursor} if cursor else {})}
+            data = self._get(self.student, url, params).json()
+            seen.extend(row['id'] for row in data['results'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+
+        expected = list(
+            Request.objects.filter(student=self.student).order_by('-created_at', '-pk').values_list('pk', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_role_scoping(self):
+        """Test that lecturers see their course's pending requests and staff see everything."""
+        url = reverse('api_v1:request_list')
+
+        lecturer_ids = [row['id'] for row in self._get(self.lecturer, url).json()['results']]
+        self.assertEqual(lecturer_ids, [self.theirs.pk])
+
+        staff_ids = {row['id'] for row in self._get(self.secretary, url, {'limit': 200}).json()['results']}
+        self.assertEqual(staff_ids, {req.pk for req in self.mine} | {self.theirs.pk})
+
+        response = self._get(self.student, reverse('api_v1:request_detail', args=[self.theirs.request_id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_sparse_fields_select_only_needed_columns(self):
+        """Test that ?fields= limits both the response keys and the columns read."""
+        with CaptureQueriesContext(connection) as queries:
+            data = self._get(self.secretary, reverse('api_v1:request_list'), {'fields': 'request_id,status'}).json()
+
+        self.assertEqual(set(data['results'][0]), {'request_id', 'status'})
+        self.assertNotIn('description', queries[-1]['sql'])
+        self.assertNotIn('JOIN', queries[-1]['sql'])
+
+        data = self._get(self.secretary, reverse('api_v1:request_list'), {'fields': 'student_name,course'}).json()
+        self.assertIn({'student_name': "Other Student", 'course': "CS101"}, data['results'])
+
+        response = self._get(self.secretary, reverse('api_v1:request_list'), {'fields': 'password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_filters(self):
+        """Test server-side filtering and validation of filter values."""
+        url = reverse('api_v1:request_list')
+        data = self._get(self.secretary, url, {'status': 'sent_to_lecturer,approved'}).json()
+        self.assertEqual([row['id'] for row in data['results']], [self.theirs.pk])
+
+        today = timezone.localdate().isoformat()
+        data = self._get(self.secretary, url, {'created_from': today}).json()
+        self.assertEqual([row['id'] for row in data['results']], [self.theirs.pk])
+
+        self.assertEqual(self._get(self.secretary, url, {'status': 'bogus'}).status_code, 400)
+        self.assertEqual(self._get(self.secretary, url, {'created_to': 'yesterday'}).status_code, 400)
+        self.assertEqual(self._get(self.secretary, url, {'cursor': '!!!'}).status_code, 400)
+
+    def test_conditional_get(self):
+        """Test that a matching If-None-Match gets 304 until the page changes."""
+        url = reverse('api_v1:request_detail', args=[self.mine[0].request_id])
+        response = self._get(self.student, url)
+        etag = response['ETag']
+        self.assertEqual(response.json()['title'], "Mine 0")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # Session and user, then only the (pk, updated_at) lookup: nothing is serialized.
+        self.assertNotIn('"title"', queries[-1]['sql'])
+
+        self.mine[0].title = "Renamed"
+        self.mine[0].save()
+        response = self._get(self.student, url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        list_url = reverse('api_v1:request_list')
+        etag = self._get(self.student, list_url)['ETag']
+        self.assertEqual(self._get(self.student, list_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_requires_api_role(self):
+        """Test that anonymous users get 401 and other roles 403."""
+        url = reverse('api_v1:request_list')
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+        admin = User.objects.create_user(
+            username="admin", email="admin@sce.ac.il", password="Test123!", role=User.ROLE_ADMIN,
+        )
+        self.assertEqual(self._get(admin, url).status_code, 403)
+
+
+class SerializationBenchmarkTest(TestCase):
+    """Tests for the serialization comparison of the JSON endpoints."""
+
+    def test_compares_same_rows(self):
+        """Test that both endpoints are measured over the same number of rows."""
+        call_command(
+            'generate_load_data', requests=60, students=5, lecturers=3, secretaries=1, hods=1,
+            courses=6, seed=3, statuses='sent_to_hod=1', skip_indexes=True, verbosity=0, stdout=StringIO(),
+        )
+
+        results = compare_serialization(repeat=1)
+
+        self.assertEqual(
+            results['head_of_dept:api_pending_requests']['rows'], results['api_v1:request_list']['rows'],
+        )
+        self.assertGreater(results['api_v1:request_list']['us_per_row'], 0)
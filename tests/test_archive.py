@@ -0,0 +1,191 @@
+"""
+Tests for archiving closed requests into cold storage.
+"""
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import User
+from requests_unified.models import (
+    ApprovalLog, ArchivedDocumentFile, ArchivedRequest, Comment, Notification, Request,
+    RequestDetails, RequestDocument, StatusHistory,
+)
+
+
+class ArchiveRequestsTest(TestCase):
+    """Tests for the archive_requests command and reading archived requests."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.client = Client()
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.other_student = User.objects.create_user(
+            username="other",
+            email="other@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Other",
+            last_name="Student",
+        )
+        self.hod = User.objects.create_user(
+            username="hod",
+            email="hod@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_HEAD_OF_DEPT,
+            first_name="Head",
+            last_name="Dept",
+        )
+
+        self.old = self._create_request("Old Appeal", Request.STATUS_APPROVED, Request.TYPE_APPEAL)
+        StatusHistory.objects.create(
+            request=self.old, status=Request.STATUS_APPROVED, description="Approved by HOD",
+            role=StatusHistory.ROLE_HEAD_OF_DEPT, changed_by=self.hod,
+        )
+        Comment.objects.create(request=self.old, author=self.hod, comment="Archived comment text")
+        ApprovalLog.objects.create(request=self.old, approver=self.hod, action=ApprovalLog.ACTION_APPROVED)
+        Notification.objects.create(user=self.student, request=self.old, message="Your appeal was approved")
+        RequestDetails.objects.create(request=self.old, grade_received=65, expected_grade=80)
+        self.document = RequestDocument.objects.create(
+            request=self.old, file=SimpleUploadedFile("grades.txt", b"grades"), uploaded_by=self.student,
+        )
+
+        self.recent = self._create_request("Recent Appeal", Request.STATUS_REJECTED, Request.TYPE_APPEAL)
+        self.open = self._create_request("Open Request", Request.STATUS_SENT_TO_HOD, Request.TYPE_GENERAL)
+
+        two_years_ago = timezone.now() - timedelta(days=730)
+        Request.objects.filter(pk__in=[self.old.pk, self.open.pk]).update(updated_at=two_years_ago)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _create_request(self, title, status, request_type):
+        return Request.objects.create(
+            student=self.student,
+            title=title,
+            description=f"{title} description",
+            status=status,
+            request_type=request_type,
+        )
+
+    def _archive(self):
+        out = StringIO()
+        call_command('archive_requests', stdout=out)
+        return out.getvalue()
+
+    def test_only_old_closed_requests_are_archived(self):
+        """Test that recent or open requests stay in the hot table."""
+        output = self._archive()
+
+        self.assertIn("Archived 1 requests", output)
+        self.assertFalse(Request.objects.filter(pk=self.old.pk).exists())
+        self.assertEqual(Request.objects.filter(pk__in=[self.recent.pk, self.open.pk]).count(), 2)
+        self.assertTrue(ArchivedRequest.objects.filter(pk=self.old.pk, request_id=self.old.request_id).exists())
+
+    def test_child_rows_move_with_request(self):
+        """Test that history, comments, logs, notifications and documents leave the hot tables."""
+        self._archive()
+
+        for model in (StatusHistory, Comment, ApprovalLog, Notification, RequestDocument):
+            self.assertFalse(model.objects.filter(request_id=self.old.pk).exists(), model.__name__)
+        self.assertTrue(ArchivedDocumentFile.objects.filter(file=self.document.file.name).exists())
+
+    def test_dry_run_changes_nothing(self):
+        """Test that --dry-run only reports."""
+        out = StringIO()
+        call_command('archive_requests', dry_run=True, stdout=out)
+
+        self.assertIn("Would archive 1 requests", out.getvalue())
+        self.assertTrue(Request.objects.filter(pk=self.old.pk).exists())
+
+    def test_archived_request_restores_children(self):
+        """Test that an archived request rebuilds with its related rows."""
+        self._archive()
+        req = ArchivedRequest.objects.get(pk=self.old.pk).as_request()
+
+        self.assertEqual(req.title, "Old Appeal")
+        self.assertEqual(req.status_history.count(), 1)
+        self.assertEqual(req.comments.all()[0].comment, "Archived comment text")
+        self.assertEqual(req.documents.all()[0].get_filename(), self.document.get_filename())
+        self.assertEqual(req.details.expected_grade, 80)
+
+    def test_hod_detail_shows_archived_request(self):
+        """Test that the HOD detail view renders an archived request read-only."""
+        self._archive()
+        self.client.force_login(self.hod)
+
+        response = self.client.get(reverse('head_of_dept:request_detail', args=[self.old.pk]))
+
+        self.assertContains(response, "Old Appeal")
+        self.assertContains(response, "Archived comment text")
+        self.assertContains(response, "Approved by HOD")
+        self.assertNotContains(response, reverse('head_of_dept:add_comment', args=[self.old.pk]))
+
+    def test_student_detail_shows_only_own_archived_request(self):
+        """Test that students can open their archived requests but not others'."""
+        self._archive()
+        url = reverse('students:request_detail', args=[self.old.request_id])
+
+        self.client.force_login(self.student)
+        self.assertContains(self.client.get(url), "Old Appeal")
+
+        self.client.force_login(self.other_student)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_statistics_combine_hot_and_archived(self):
+        """Test that statistics count archived requests too."""
+        self._archive()
+        self.client.force_login(self.hod)
+
+        stats = self.client.get(reverse('head_of_dept:api_statistics')).json()['statistics']
+
+        self.assertEqual(stats['total'], 3)
+        self.assertEqual(stats['approved'], 1)
+        self.assertEqual(stats['rejected'], 1)
+        self.assertEqual(stats['pending'], 1)
+        self.assertEqual(stats['by_type'][Request.TYPE_APPEAL]['total'], 2)
+        self.assertEqual(stats['by_type'][Request.TYPE_APPEAL]['approval_rate'], 50.0)
+
+    def test_student_dashboard_lists_archived_requests(self):
+        """Test that the student dashboard keeps counting and listing archived requests."""
+        self._archive()
+        self.client.force_login(self.student)
+
+        response = self.client.get(reverse('students:dashboard'), {'status': 'approved'})
+
+        self.assertEqual(response.context['total_requests'], 3)
+        self.assertEqual(response.context['approved'], 1)
+        self.assertContains(response, self.old.request_id)
+
+    def test_student_dashboard_interleaves_archived_requests_by_date(self):
+        """Test that archived requests are listed in date order among live ones, not after them."""
+        now = timezone.now()
+        Request.objects.filter(pk=self.recent.pk).update(created_at=now - timedelta(days=10))
+        Request.objects.filter(pk=self.old.pk).update(created_at=now - timedelta(days=800))
+        Request.objects.filter(pk=self.open.pk).update(created_at=now - timedelta(days=900))
+        self._archive()
+        self.client.force_login(self.student)
+
+        response = self.client.get(reverse('students:dashboard'))
+
+        self.assertEqual(
+            [r.request_id for r in response.context['requests']],
+            [self.recent.request_id, self.old.request_id, self.open.request_id],
+        )
@@ -0,0 +1,135 @@
+"""
+Tests for the self-hosted asset build.
+"""
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.http import HttpResponse
+from django.test import TestCase, Client, RequestFactory, override_settings
+
+from core import assets
+from core.middleware import StaticCacheControlMiddleware
+
+
+class PurgeCSSTest(TestCase):
+    """Tests for purge_css() and minify_css()."""
+
+    def test_drops_rules_for_unused_classes(self):
+        """Test that only selectors needing unused classes go, wherever they are nested."""
+        css = """
+            .btn, .unused { color: red }
+            .btn:not(.unused-state) { color: blue }
+            .hover\\:bg-slate-800:hover { color: green }
+            .w-\\[300px\\] { width: 300px }
+            [data-theme=dark] .unused { color: black }
+            @media (min-width: 640px) { .unused { display: none } }
+            @media print { .btn { display: none } }
+            @keyframes spin { from { transform: rotate(0) } }
+            .btn::after { content: "}" }
+        """
+        is_used = assets.ClassMatcher({'btn', 'hover:bg-slate-800', 'w-[300px]'})
+
+        purged = assets.minify_css(assets.purge_css(css, is_used))
+
+        self.assertIn('.btn{color:red}', purged)
+        self.assertIn('.btn:not(.unused-state){color:blue}', purged)
+        self.assertIn('.hover\\:bg-slate-800:hover', purged)
+        self.assertIn('.w-\\[300px\\]', purged)
+        self.assertIn('@media print{.btn{display:none}}', purged)
+        self.assertIn('@keyframes spin', purged)
+        self.assertIn('content:"}"', purged)
+        self.assertNotIn('.unused{', purged)
+        self.assertNotIn('640px', purged)
+
+    def test_dynamic_and_safelisted_classes_survive(self):
+        """Test that classes built in templates or added by scripts are not purged."""
+        with tempfile.TemporaryDirectory() as tmp:
+            template = Path(tmp) / 'page.html'
+            template.write_text('<span class="badge status-{{ req.status }} {% if x %}bg-red-500{% endif %}">')
+            tokens, prefixes = assets.template_tokens([template])
+
+        is_used = assets.ClassMatcher(tokens, prefixes, [r'^aos-'])
+        purged = assets.purge_css('.status-approved{a:b}.bg-red-500{a:b}.aos-animate{a:b}.nope{a:b}', is_used)
+
+        self.assertEqual(purged.count('{a:b}'), 3)
+        self.assertNotIn('.nope', purged)
+
+    def test_minify_keeps_meaningful_whitespace_and_licences(self):
+        """Test that descendant combinators, strings and /*! comments are kept."""
+        css = '/*! MIT */\n/* note */\na :hover ,\nb > c {\n  content: "a  b" ;\n}\n'
+        self.assertEqual(assets.minify_css(css), '/*! MIT */\na :hover,b > c{content:"a  b"}')
+
+
+class BuildAssetsCommandTest(TestCase):
+    """Tests for the build_assets management command."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        vendor = self.tmp / 'assets' / 'vendor'
+        vendor.mkdir(parents=True)
+        (vendor / 'lib.css').write_text('.btn { color: red }\n.never-used-class { color: blue }\n')
+        (vendor / 'lib.js').write_text('window.lib = 1')
+        self.settings = {
+            'ASSET_DIR': self.tmp / 'assets',
+            'STATIC_ROOT': self.tmp / 'static_root',
+            'STATICFILES_DIRS': [settings.BASE_DIR / 'static', self.tmp / 'assets' / 'build'],
+            'ASSET_BUNDLES': {
+                'bundle/app.css': ['vendor/lib.css', 'css/base.css'],
+                'bundle/app.js': ['vendor/lib.js'],
+            },
+        }
+
+    def test_builds_purged_hashed_bundles(self):
+        """Test that bundles are purged, collected under hashed names and linked by the pages."""
+        with override_settings(**self.settings):
+            self.assertIn('cdn.tailwindcss.com', Client().get('/').content.decode())
+
+            out = StringIO()
+            call_command('build_assets', stdout=out)
+
+            manifest = json.loads((self.tmp / 'static_root' / 'staticfiles.json').read_text())['paths']
+            css_name = manifest['bundle/app.css']
+            self.assertRegex(css_name, r'^bundle/app\.[0-9a-f]{12}\.css$')
+            css = (self.tmp / 'static_root' / css_name).read_text()
+            self.assertIn('.btn{color:red}', css)
+            self.assertNotIn('never-used-class', css)
+            self.assertIn('[data-theme="dark"]', css)  # from css/base.css
+            self.assertIn(css_name, out.getvalue())
+
+            page = Client().get('/').content.decode()
+            self.assertIn(f'/static/{css_name}', page)
+            self.assertIn(f"/static/{manifest['bundle/app.js']}", page)
+            self.assertNotIn('cdn.tailwindcss.com', page)
+
+    def test_missing_sources(self):
+        """Test that a missing vendor file or Tailwind CLI stops the build."""
+        (self.tmp / 'assets' / 'vendor' / 'lib.js').unlink()
+        with override_settings(**self.settings):
+            with self.assertRaisesMessage(CommandError, '--fetch'):
+                call_command('build_assets', skip_collectstatic=True, stdout=StringIO())
+
+        self.settings['ASSET_BUNDLES'] = {'bundle/app.css': ['tailwind']}
+        with override_settings(TAILWIND_CLI='no-such-tailwindcss', **self.settings):
+            with self.assertRaisesMessage(CommandError, 'Tailwind CLI'):
+                call_command('build_assets', skip_collectstatic=True, stdout=StringIO())
+
+
+class StaticCacheControlTest(TestCase):
+    """Tests for StaticCacheControlMiddleware."""
+
+    def test_only_hashed_names_are_immutable(self):
+        """Test that hashed static files get a far-future max-age and others nothing."""
+        middleware = StaticCacheControlMiddleware(lambda request: HttpResponse('body'))
+        factory = RequestFactory()
+
+        hashed = middleware(factory.get('/static/bundle/app.0123456789ab.css'))
+        self.assertEqual(hashed['Cache-Control'], f'public, max-age={365 * 24 * 3600}, immutable')
+        self.assertNotIn('Cache-Control', middleware(factory.get('/static/bundle/app.css')))
+        self.assertNotIn('Cache-Control', middleware(factory.get('/students/app.0123456789ab.css')))
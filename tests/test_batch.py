@@ -0,0 +1,125 @@
+"""
+Tests for the batch workflow operations endpoint.
+"""
+import json
+
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from core.models import User
+from requests_unified.models import Comment, Request, StatusHistory
+
+
+class BatchOperationsTest(TestCase):
+    """Tests for /api/v1/batch/."""
+
+    def setUp(self):
+        self.client = Client()
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.lecturer = User.objects.create_user(
+            username="lecturer",
+            email="lecturer@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_LECTURER,
+            first_name="Lecturer",
+            last_name="One",
+        )
+        self.hod = User.objects.create_user(
+            username="hod",
+            email="hod@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_HEAD_OF_DEPT,
+            first_name="Head",
+            last_name="Dept",
+        )
+        self.first, self.second = [
+            Request.objects.create(
+                student=self.student, title=f"Request {i}", description="D", status=Request.STATUS_SENT_TO_HOD,
+            )
+            for i in range(2)
+        ]
+
+    def _post(self, user, payload):
+        self.client.force_login(user)
+        return self.client.post(
+            reverse('api_v1:batch'),
+            json.dumps(payload) if not isinstance(payload, str) else payload,
+            content_type='application/json',
+        )
+
+    def test_operations_across_requests(self):
+        """Test that every operation is applied, in order, through the workflow views."""
+        response = self._post(self.hod, {'operations': [
+            {'op': 'hod.add_comment', 'request': self.first.pk, 'data': {'comment': "Looks fine"}},
+            {'op': 'hod.approve', 'request': self.first.pk},
+            {'op': 'hod.approve', 'request': self.second.pk, 'data': {'notes': "OK"}},
+        ]})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual([r['ok'] for r in data['results']], [True, True, True])
+        self.assertEqual(data['results'][0]['messages'], ["Comment added."])
+
+        self.assertTrue(Comment.objects.filter(request=self.first, comment="Looks fine").exists())
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.status, self.second.status), (Request.STATUS_APPROVED, Request.STATUS_APPROVED))
+        self.assertEqual(self.second.final_notes, "OK")
+
+    def test_failure_rolls_back_the_batch(self):
+        """Test that a failing operation undoes earlier ones and skips the rest."""
+        response = self._post(self.hod, {'operations': [
+            {'op': 'hod.approve', 'request': self.first.pk},
+            {'op': 'hod.reject', 'request': self.second.pk},  # no reason given
+            {'op': 'hod.add_comment', 'request': self.second.pk, 'data': {'comment': "Never added"}},
+        ]})
+
+        self.assertEqual(response.status_code, 409)
+        results = response.json()['results']
+        self.assertTrue(results[0]['ok'])
+        self.assertFalse(results[1]['ok'])
+        self.assertEqual(results[1]['messages'], ["Please provide a reason for rejection."])
+        self.assertTrue(results[2]['skipped'])
+
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.status, Request.STATUS_SENT_TO_HOD)
+        self.assertFalse(StatusHistory.objects.filter(request=self.first).exists())
+        self.assertFalse(Comment.objects.exists())
+
+    def test_view_permissions_apply(self):
+        """Test that an operation of another role fails, as does an unknown request."""
+        response = self._post(self.lecturer, {'operations': [{'op': 'hod.approve', 'request': self.first.pk}]})
+        self.assertEqual(response.status_code, 409)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.status, Request.STATUS_SENT_TO_HOD)
+
+        response = self._post(self.hod, {'operations': [{'op': 'hod.approve', 'request': 999999}]})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['results'][0]['status'], 404)
+
+    def test_malformed_batches(self):
+        """Test that malformed bodies are rejected before anything runs."""
+        self.assertEqual(self._post(self.hod, "not json").status_code, 400)
+        self.assertEqual(self._post(self.hod, {'operations': []}).status_code, 400)
+        response = self._post(self.hod, {'operations': [
+            {'op': 'hod.approve', 'request': self.first.pk},
+            {'op': 'hod.delete', 'request': self.first.pk},
+        ]})
+        self.assertEqual(response.status_code, 400)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.status, Request.STATUS_SENT_TO_HOD)
+
+    def test_requires_login_and_post(self):
+        """Test that anonymous clients get 401 and GET is not allowed."""
+        response = self.client.post(reverse('api_v1:batch'), '{}', content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+        self.client.force_login(self.hod)
+        self.assertEqual(self.client.get(reverse('api_v1:batch')).status_code, 405)
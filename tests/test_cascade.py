@@ -78,7 +78,7 @@ class CascadeCourseDeleteTest(TestCase):
         self.assertEqual(new_count, initial_count + 1)
         
         notification = Notification.objects.filter(user=self.student).first()
-        self.assertIn("routed to the Head of Department", notification.message)
+        self.assertIn("routed to the Head of Department", notification.text)
 
 
 class CascadeLecturerRemovedFromCourseTest(TestCase):
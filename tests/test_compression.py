@@ -0,0 +1,178 @@
+"""
+Tests for response compression and HTML minification.
+"""
+import gzip
+import zlib
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.urls import reverse
+
+from core import compression
+from core.middleware import CompressionMiddleware
+from core.models import User
+from requests_unified.benchmarks import measure_transfer
+from requests_unified.models import Request
+
+
+class NegotiationTest(TestCase):
+    """Tests for Accept-Encoding negotiation."""
+
+    def test_preference_and_refusal(self):
+        """Test that q-values pick the encoding and q=0 refuses it."""
+        both = ('br', 'gzip')
+        self.assertEqual(compression.negotiate('gzip, deflate, br', both), 'br')
+        self.assertEqual(compression.negotiate('br;q=0.5, gzip', both), 'gzip')
+        self.assertEqual(compression.negotiate('*;q=0.1, br;q=0', both), 'gzip')
+        self.assertIsNone(compression.negotiate('identity', both))
+        self.assertIsNone(compression.negotiate('', both))
+
+    def test_brotli_only_when_installed(self):
+        """Test that br is not offered without the brotli package."""
+        with mock.patch.object(compression, 'brotli', None):
+            self.assertEqual(compression.negotiate('br, gzip'), 'gzip')
+            self.assertIsNone(compression.negotiate('br'))
+
+
+class MinifyHTMLTest(TestCase):
+    """Tests for minify_html()."""
+
+    def test_collapses_indentation_only(self):
+        """Test that indentation goes while inline spacing and sensitive elements stay."""
+        html = (
+            '<div>\n    <span>a</span> <span>b</span>\n\n    <PRE>  keep\n    this</PRE>\n'
+            '  <script>\n  var s = `x\n   y`;\n  </script>\n  <textarea>\n  t</textarea>\n</div>'
+        )
+        self.assertEqual(
+            compression.minify_html(html),
+            '<div>\n<span>a</span> <span>b</span>\n<PRE>  keep\n    this</PRE>\n'
+            '<script>\n  var s = `x\n   y`;\n  </script>\n<textarea>\n  t</textarea>\n</div>',
+        )
+
+
+    def test_text_content_keeps_its_whitespace(self):
+        """Test that line breaks and indentation inside text (shown with pre-wrap) survive."""
+        html = '<div>\n    <p class="whitespace-pre-wrap">Reason:\n\n    1. first\n</p>\n</div>'
+        self.assertEqual(
+            compression.minify_html(html),
+            '<div>\n<p class="whitespace-pre-wrap">Reason:\n\n    1. first\n</p>\n</div>',
+        )
+
+    def test_request_description_is_rendered_verbatim(self):
+        """Test that a minified detail page shows the student's description exactly as written."""
+        student = User.objects.create_user(
+            username="student", email="student@sce.ac.il", password="Test123!", role=User.ROLE_STUDENT,
+        )
+        secretary = User.objects.create_user(
+            username="secretary", email="secretary@sce.ac.il", password="Test123!", role=User.ROLE_SECRETARY,
+        )
+        req = Request.objects.create(student=student, title="Appeal", description="Reason:\n\n    1. first")
+        client = Client()
+        client.force_login(secretary)
+
+        response = client.get(reverse('staff:request_detail', args=[req.pk]))
+
+        self.assertContains(response, "Reason:\n\n    1. first")
+
+
+class CompressionMiddlewareTest(TestCase):
+    """Tests for CompressionMiddleware and HTMLMinifyMiddleware on real pages."""
+
+    def setUp(self):
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        for i in range(10):
+            Request.objects.create(student=self.student, title=f"Request {i}", description="D")
+        self.url = reverse('students:dashboard')
+
+    def _client(self):
+        client = Client()
+        client.force_login(self.student)
+        return client
+
+    def test_dashboard_is_minified_and_gzipped(self):
+        """Test that the page is smaller minified, decompresses to the same bytes and varies on encoding."""
+        with override_settings(HTML_MINIFY=False):
+            raw = self._client().get(self.url).content
+        client = self._client()
+        plain = client.get(self.url)
+        compressed = client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertLess(len(plain.content), len(raw))
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertEqual(int(compressed['Content-Length']), len(compressed.content))
+        self.assertLess(len(compressed.content), len(plain.content) // 3)
+        # Only the CSRF token differs between renders.
+        self.assertEqual(len(gzip.decompress(compressed.content)), len(plain.content))
+
+    def test_gzip_is_padded_and_brotli_kept_for_static_files(self):
+        """Test the BREACH mitigation: random-length gzip output, and no Brotli for views."""
+        data = b'<p>secret</p>' * 200
+        outputs = {compression.compress(data, 'gzip', max_random_bytes=100) for _ in range(20)}
+        self.assertGreater(len({len(output) for output in outputs}), 1)
+        self.assertEqual({gzip.decompress(output) for output in outputs}, {data})
+
+        fake_brotli = mock.Mock(compress=mock.Mock(return_value=b'br'))
+        with mock.patch.object(compression, 'brotli', fake_brotli):
+            page = self._client().get(self.url, HTTP_ACCEPT_ENCODING='br, gzip')
+            self.assertEqual(page['Content-Encoding'], 'gzip')
+
+            static = CompressionMiddleware(lambda request: HttpResponse(data, content_type='text/css'))(
+                RequestFactory().get('/static/css/base.css', HTTP_ACCEPT_ENCODING='br, gzip')
+            )
+            self.assertEqual(static['Content-Encoding'], 'br')
+
+    def test_small_and_excluded_responses_are_untouched(self):
+        """Test the size threshold, the content-type list and server-sent events."""
+        def middleware(response):
+            request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+            return CompressionMiddleware(lambda request: response)(request)
+
+        self.assertNotIn('Content-Encoding', middleware(HttpResponse('short')))
+        self.assertNotIn('Content-Encoding', middleware(HttpResponse(b'x' * 4096, content_type='image/png')))
+        events = middleware(StreamingHttpResponse(iter([b'data: x\n\n'] * 100), content_type='text/event-stream'))
+        self.assertNotIn('Content-Encoding', events)
+        self.assertEqual(b''.join(events.streaming_content), b'data: x\n\n' * 100)
+
+    def test_streaming_chunks_decode_as_they_arrive(self):
+        """Test that each compressed chunk can be decoded without waiting for the rest."""
+        response = CompressionMiddleware(
+            lambda request: StreamingHttpResponse(iter([b'first,', b'second']), content_type='text/csv')
+        )(RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip'))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks = iter(response.streaming_content)
+        self.assertEqual(decoder.decompress(next(chunks)), b'first,')
+        self.assertEqual(decoder.decompress(next(chunks)), b'second')
+        decoder.decompress(b''.join(chunks))
+        self.assertTrue(decoder.eof)
+
+
+class TransferBenchmarkTest(TestCase):
+    """Tests for the bytes-on-the-wire benchmark."""
+
+    def test_reports_each_stage(self):
+        """Test that every view is measured raw, minified and compressed."""
+        call_command(
+            'generate_load_data', requests=30, students=5, lecturers=3, secretaries=1, hods=1,
+            courses=6, seed=3, skip_indexes=True, verbosity=0, stdout=StringIO(),
+        )
+
+        results = measure_transfer(names={'students:dashboard', 'head_of_dept:dashboard'})
+
+        self.assertEqual(set(results), {'students:dashboard', 'head_of_dept:dashboard'})
+        for sizes in results.values():
+            self.assertLess(sizes['minified'], sizes['raw'])
+            self.assertLess(sizes['gzip'], sizes['minified'])
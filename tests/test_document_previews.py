@@ -0,0 +1,150 @@
+"""
+Tests for document preview and thumbnail generation.
+"""
+import os
+import shutil
+import tempfile
+from unittest import skipUnless
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core.models import User
+from requests_unified.models import Request, RequestDocument
+from requests_unified.previews import (
+    get_document_kind, get_preview_dir, preview_names, render_document_previews,
+)
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+
+class DocumentPreviewTest(TestCase):
+    """Tests for preview rendering, caching and display."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.client = Client()
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.hod = User.objects.create_user(
+            username="hod",
+            email="hod@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_HEAD_OF_DEPT,
+            first_name="Head",
+            last_name="Dept",
+        )
+        self.request = Request.objects.create(
+            student=self.student,
+            title="Request With Documents",
+            description="Description",
+            status=Request.STATUS_SENT_TO_HOD,
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _create_document(self, name, content):
+        return RequestDocument.objects.create(
+            request=self.request,
+            file=SimpleUploadedFile(name, content),
+            uploaded_by=self.student,
+        )
+
+    def _write_cached_previews(self, document):
+        os.makedirs(get_preview_dir(), exist_ok=True)
+        for name in preview_names(document):
+            with open(os.path.join(get_preview_dir(), name), 'wb') as f:
+                f.write(b'png')
+
+    def test_document_kind_detection(self):
+        """Test that only images and PDFs are considered previewable."""
+        self.assertEqual(get_document_kind("scan.PDF"), 'pdf')
+        self.assertEqual(get_document_kind("photo.jpeg"), 'image')
+        self.assertIsNone(get_document_kind("notes.docx"))
+
+    def test_unsupported_document_is_not_rendered(self):
+        """Test that unsupported files produce no preview."""
+        doc = self._create_document("notes.txt", b"plain text")
+        preview, thumb = preview_names(doc)
+        result = render_document_previews(
+            doc.file.path,
+            os.path.join(get_preview_dir(), preview),
+            os.path.join(get_preview_dir(), thumb),
+            (800, 1100), (200, 260),
+        )
+        self.assertFalse(result)
+        self.assertEqual(doc.thumbnail_url(), "")
+
+    def test_preview_urls_point_to_cache(self):
+        """Test that preview URLs are returned once previews exist."""
+        doc = self._create_document("scan.pdf", b"%PDF-1.4")
+        self.assertEqual(doc.preview_url(), "")
+
+        self._write_cached_previews(doc)
+        preview, thumb = preview_names(doc)
+        self.assertTrue(doc.preview_url().endswith(f"previews/{preview}"))
+        self.assertTrue(doc.thumbnail_url().endswith(f"previews/{thumb}"))
+
+    def test_preview_names_cannot_be_guessed(self):
+        """Test that preview names carry a SECRET_KEY-dependent token, not just the pk."""
+        doc = self._create_document("scan.pdf", b"%PDF-1.4")
+        preview, thumb = preview_names(doc)
+
+        self.assertNotEqual(preview, f"{doc.pk}-preview.png")
+        self.assertTrue(preview.startswith(f"{doc.pk}-") and thumb.startswith(preview[:-len("preview.png")]))
+        with override_settings(SECRET_KEY="another-secret-key-" * 3):
+            self.assertNotEqual(preview_names(doc), (preview, thumb))
+
+    def test_detail_page_shows_lazy_thumbnail(self):
+        """Test that the HOD detail page embeds cached thumbnails lazily."""
+        doc = self._create_document("scan.pdf", b"%PDF-1.4")
+        self._write_cached_previews(doc)
+
+        self.client.force_login(self.hod)
+        response = self.client.get(reverse('head_of_dept:request_detail', args=[self.request.id]))
+
+        self.assertContains(response, doc.thumbnail_url())
+        self.assertContains(response, 'loading="lazy"')
+
+    def test_deleting_document_removes_previews(self):
+        """Test that cached previews are removed with their document."""
+        doc = self._create_document("scan.pdf", b"%PDF-1.4")
+        self._write_cached_previews(doc)
+        paths = [os.path.join(get_preview_dir(), name) for name in preview_names(doc)]
+
+        doc.delete()
+
+        for path in paths:
+            self.assertFalse(os.path.exists(path))
+
+    @skipUnless(HAS_PIL, "Pillow is not installed")
+    def test_image_upload_renders_thumbnail(self):
+        """Test that uploading an image renders its preview and thumbnail."""
+        image_path = os.path.join(self.media_root, "source.png")
+        Image.new('RGB', (1200, 1600), 'white').save(image_path)
+        with open(image_path, 'rb') as f:
+            content = f.read()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            doc = self._create_document("photo.png", content)
+
+        self.assertNotEqual(doc.thumbnail_url(), "")
+        with Image.open(os.path.join(get_preview_dir(), preview_names(doc)[1])) as thumb:
+            self.assertLessEqual(thumb.width, 200)
+            self.assertLessEqual(thumb.height, 260)
@@ -0,0 +1,107 @@
+"""
+Tests for the gc_media management command.
+"""
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.models import User
+from requests_unified.models import Request, RequestDocument
+from requests_unified.previews import preview_names
+
+
+class GcMediaCommandTest(TestCase):
+    """Tests for orphaned media cleanup."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.request = Request.objects.create(
+            student=self.student,
+            title="Request",
+            description="Description",
+        )
+        self.document = RequestDocument.objects.create(
+            request=self.request,
+            file=SimpleUploadedFile("kept.pdf", b"%PDF-1.4"),
+        )
+        self.upload_dir = os.path.join(self.media_root, "request_documents")
+        self.orphan = self._write_file(os.path.join(self.upload_dir, "orphan.pdf"), age_hours=48)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _write_file(self, path, age_hours):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b"data")
+        mtime = time.time() - age_hours * 3600
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def _run(self, *args):
+        out = StringIO()
+        call_command('gc_media', *args, stdout=out)
+        return out.getvalue()
+
+    def test_deletes_unreferenced_files(self):
+        """Test that old orphaned files are removed and referenced files are kept."""
+        output = self._run('--batch-size', '1')
+
+        self.assertFalse(os.path.exists(self.orphan))
+        self.assertTrue(os.path.exists(self.document.file.path))
+        self.assertIn("Deleted 1 of 2", output)
+
+    def test_dry_run_keeps_files(self):
+        """Test that dry-run only reports."""
+        output = self._run('--dry-run')
+
+        self.assertTrue(os.path.exists(self.orphan))
+        self.assertIn("Would delete 1", output)
+
+    def test_progress_output(self):
+        """Test that progress is printed every N files and --progress-every 0 turns it off."""
+        self.assertIn("scanned 1 files", self._run('--progress-every', '1'))
+
+        output = self._run('--progress-every', '0')
+
+        self.assertEqual(output.splitlines(), ["Deleted 0 of 1 scanned files (0.0 MB)."])
+
+    def test_grace_period_protects_recent_files(self):
+        """Test that recently written orphans survive."""
+        recent = self._write_file(os.path.join(self.upload_dir, "recent.pdf"), age_hours=1)
+
+        self._run('--grace-hours', '24')
+
+        self.assertTrue(os.path.exists(recent))
+        self.assertFalse(os.path.exists(self.orphan))
+
+    def test_orphaned_previews_are_removed(self):
+        """Test that previews of deleted documents are swept."""
+        preview_dir = os.path.join(self.media_root, "previews")
+        kept = self._write_file(os.path.join(preview_dir, preview_names(self.document)[1]), age_hours=48)
+        stale = self._write_file(os.path.join(preview_dir, "999999-thumb.png"), age_hours=48)
+        guessable = self._write_file(os.path.join(preview_dir, f"{self.document.pk}-thumb.png"), age_hours=48)
+
+        self._run()
+
+        self.assertTrue(os.path.exists(kept))
+        self.assertFalse(os.path.exists(stale))
+        self.assertFalse(os.path.exists(guessable))
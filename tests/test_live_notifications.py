@@ -0,0 +1,163 @@
+"""
+Tests for the live notification stream (server-sent events).
+"""
+import asyncio
+import json
+import time
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core.models import User
+from requests_unified import live
+from requests_unified.models import Notification, Request, StatusHistory
+
+
+def parse_events(body):
+    """[(event name, id, data)] from an SSE body, skipping comments and retry lines."""
+    events = []
+    for block in body.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line and not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], fields['id'], json.loads(fields['data'])))
+    return events
+
+
+class LiveNotificationTest(TestCase):
+    """Tests for cursors, the stream and the in-process doorbell."""
+
+    def setUp(self):
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.other = User.objects.create_user(
+            username="other",
+            email="other@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Other",
+            last_name="Student",
+        )
+        self.request = Request.objects.create(
+            student=self.student,
+            title="Test Request",
+            description="Description",
+        )
+
+    def test_fetch_events_after_cursor(self):
+        """Test that only the user's rows after the cursor are returned, each with its own resume id."""
+        cursor = live.current_cursor(self.student.pk)
+        Notification.objects.create(user=self.student, request=self.request, message="Approved!")
+        Notification.objects.create(user=self.other, message="Not yours")
+        StatusHistory.objects.create(
+            request=self.request, status=Request.STATUS_APPROVED, description="Approved.",
+            role=StatusHistory.ROLE_LECTURER,
+        )
+
+        events, new_cursor = live.fetch_events(self.student.pk, cursor)
+
+        self.assertEqual([name for name, _, _ in events], ['notification', 'status'])
+        self.assertEqual(events[0][2]['message'], "Approved!")
+        self.assertEqual(events[1][2]['status'], Request.STATUS_APPROVED)
+        self.assertEqual(events[1][2]['request_id'], self.request.request_id)
+        self.assertEqual(events[0][1], (events[0][2]['id'], cursor[1]))
+        self.assertEqual(events[1][1], new_cursor)
+        self.assertEqual(live.fetch_events(self.student.pk, new_cursor)[0], [])
+        self.assertEqual(live.parse_cursor(live.format_cursor(new_cursor)), new_cursor)
+        self.assertIsNone(live.parse_cursor('garbage'))
+
+    def test_stream_requires_login(self):
+        """Test that anonymous clients get 401 instead of a stream."""
+        response = Client().get(reverse('notifications:stream'))
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(LIVE_NOTIFICATIONS_MAX_AGE=0.2, LIVE_NOTIFICATIONS_POLL_INTERVAL=0.05)
+    def test_stream_resumes_after_last_event_id(self):
+        """Test that the view streams rows after Last-Event-ID as text/event-stream."""
+        cursor = live.current_cursor(self.student.pk)
+        notification = Notification.objects.create(user=self.student, request=self.request, message="Needs info")
+
+        async def consume():
+            await self.async_client.aforce_login(self.student)
+            response = await self.async_client.get(
+                reverse('notifications:stream'), headers={'Last-Event-ID': live.format_cursor(cursor)},
+            )
+            body = b''.join([chunk async for chunk in response.streaming_content])
+            return response, body.decode()
+
+        response, body = async_to_sync(consume)()
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertTrue(body.startswith('retry: '))
+        events = parse_events(body)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0][0], 'notification')
+        self.assertEqual(events[0][1], f'{notification.pk}-{cursor[1]}')
+        self.assertEqual(events[0][2]['message'], "Needs info")
+
+    def test_wsgi_requests_get_a_short_poll(self):
+        """Test that under WSGI the response ends at once with pending rows and a cursor to resume from."""
+        cursor = live.current_cursor(self.student.pk)
+        notification = Notification.objects.create(user=self.student, request=self.request, message="Needs info")
+        client = Client()
+        client.force_login(self.student)
+
+        started = time.monotonic()
+        response = client.get(reverse('notifications:stream'), headers={'Last-Event-ID': live.format_cursor(cursor)})
+        body = b''.join(response.streaming_content).decode()
+
+        self.assertLess(time.monotonic() - started, 5)  # not LIVE_NOTIFICATIONS_MAX_AGE
+        self.assertFalse(response.is_async)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual([data['message'] for _, _, data in parse_events(body)], ["Needs info"])
+        resume = f'{notification.pk}-{cursor[1]}'
+        self.assertTrue(body.endswith(f'id: {resume}\n\n'))
+
+        response = client.get(reverse('notifications:stream'), headers={'Last-Event-ID': resume})
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(parse_events(body), [])
+        self.assertTrue(body.endswith(f'id: {resume}\n\n'))
+
+    @override_settings(LIVE_NOTIFICATIONS_MAX_AGE=30, LIVE_NOTIFICATIONS_POLL_INTERVAL=30)
+    def test_commit_wakes_stream_without_polling(self):
+        """Test that a committed notification reaches an open stream long before the next poll."""
+        def notify():
+            with self.captureOnCommitCallbacks(execute=True):
+                Notification.objects.create(user=self.student, request=self.request, message="Decision made")
+
+        async def scenario():
+            stream = live.stream(self.student.pk)
+            try:
+                await stream.__anext__()  # retry line; the cursor is now fixed
+                pending = asyncio.ensure_future(stream.__anext__())
+                await asyncio.sleep(0.1)
+                await sync_to_async(notify)()
+                return await asyncio.wait_for(pending, timeout=5)
+            finally:
+                await stream.aclose()
+
+        chunk = async_to_sync(scenario)()
+
+        self.assertIn('event: notification', chunk)
+        self.assertIn('Decision made', chunk)
+        self.assertEqual(live._subscribers, {})
+
+    def test_dashboard_starts_stream_after_rendered_rows(self):
+        """Test that the dashboard connects to the stream from the current cursor."""
+        Notification.objects.create(user=self.student, request=self.request, message="Shown on the page")
+        client = Client()
+        client.force_login(self.student)
+
+        response = client.get(reverse('students:dashboard'))
+
+        cursor = live.format_cursor(live.current_cursor(self.student.pk))
+        self.assertContains(response, f'data-live-stream="{reverse("notifications:stream")}?after={cursor}"')
+        self.assertContains(response, 'Shown on the page')
+        self.assertContains(response, f'data-live-status="{self.request.request_id}"')
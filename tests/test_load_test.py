@@ -0,0 +1,112 @@
+"""
+Tests for the role-mix HTTP load generator and the load_test command.
+"""
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import LiveServerTestCase, SimpleTestCase, override_settings
+
+from core.models import User
+from requests_unified import typeahead
+from requests_unified.loadtest import SCENARIOS, VirtualUser, percentile, student_submit, summarize
+from requests_unified.models import Course, Request
+
+
+class SummaryTest(SimpleTestCase):
+    """Tests for the latency summary."""
+
+    def test_percentiles_and_throughput(self):
+        """Test that latencies are summarized per scenario in milliseconds."""
+        samples = [('a', i / 1000, True) for i in range(1, 101)] + [('b', 0.5, False)]
+        summary = summarize(samples, elapsed=10)
+
+        self.assertEqual(summary['a']['count'], 100)
+        self.assertEqual(summary['a']['errors'], 0)
+        self.assertAlmostEqual(summary['a']['rps'], 10.0)
+        self.assertAlmostEqual(summary['a']['p50'], 51, delta=1)
+        self.assertAlmostEqual(summary['a']['p99'], 99, delta=1)
+        self.assertAlmostEqual(summary['a']['max'], 100)
+        self.assertEqual(summary['b']['errors'], 1)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+
+# A fast hasher so concurrent logins do not serialize on password hashing.
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoadTestCommandTest(LiveServerTestCase):
+    """Tests for running virtual users against a live server."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        call_command(
+            'generate_load_data', requests=30, students=3, lecturers=2, secretaries=2, hods=2, courses=4,
+            skip_indexes=True, stdout=StringIO(),
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_virtual_user_logs_in_with_two_factor_code(self):
+        """Test that a virtual user passes both login steps and reaches its dashboard."""
+        import random
+
+        student = User.objects.filter(role=User.ROLE_STUDENT).first()
+        vu = VirtualUser(self.live_server_url, student, 'LoadTest123!', random.Random(1))
+        vu.login()
+        url, html = vu.get('students:dashboard')
+
+        self.assertTrue(url.endswith('/students/') or 'students' in url)
+        self.assertIn(student.first_name, html)
+
+    def test_student_submit_sends_department_and_course(self):
+        """Test that the submit scenario posts the student's department and a course of that degree."""
+        import random
+
+        student = User.objects.filter(role=User.ROLE_STUDENT, degree__isnull=False).first()
+        course = Course.objects.filter(is_active=True).first()
+        course.degrees.set([student.degree])
+        Course.objects.exclude(pk=course.pk).update(is_active=False)
+        typeahead.invalidate('courses')  # update() sends no signals
+        vu = VirtualUser(self.live_server_url, student, 'LoadTest123!', random.Random(1))
+        vu.login()
+
+        student_submit(vu)
+
+        submitted = Request.objects.filter(student=student).latest('created_at')
+        self.assertIn(f"Department: {student.degree.name}\n", submitted.description)
+        self.assertIn(f"Course: {course.code} - {course.name}\n", submitted.description)
+
+    def test_runs_every_role_and_reports_scenarios(self):
+        """Test that the command runs each role's scenarios and reports them."""
+        before = Request.objects.count()
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'summary.json')
+            call_command(
+                'load_test', base_url=self.live_server_url, students=2, secretaries=2, lecturers=2, hods=2,
+                duration=3, ramp_up=1, think_time=0.05, json_path=path, stdout=out,
+            )
+            with open(path) as fh:
+                summary = json.load(fh)['scenarios']
+
+        # Two users per role, so one login lost to an in-memory SQLite table lock cannot hide a role.
+        self.assertIn('by 8 virtual users', out.getvalue())
+        self.assertEqual(summary['login']['count'], 8)
+        for role, scenarios in SCENARIOS.items():
+            ran = [name for name, _, _ in scenarios if name in summary]
+            self.assertTrue(ran, f'no scenario ran for {role}')
+            self.assertGreater(summary[ran[0]]['p50'], 0)
+        if 'student_submit' in summary:
+            self.assertGreater(Request.objects.count(), before)
+
+    def test_missing_accounts_raise(self):
+        """Test that asking for more virtual users than accounts is an error."""
+        with self.assertRaises(CommandError):
+            call_command('load_test', base_url=self.live_server_url, students=50, duration=1, stdout=StringIO())
@@ -0,0 +1,150 @@
+"""
+Tests for the Prometheus /metrics endpoint.
+"""
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core import metrics
+from core.models import User
+from core.timing import RequestTimer
+from requests_unified.models import ApprovalLog, Request
+
+
+def sample(text, line_prefix):
+    """Value of the first exposition line starting with line_prefix (0 if absent)."""
+    match = re.search(rf'^{re.escape(line_prefix)} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+class MetricsEndpointTest(TestCase):
+    """Tests for metric collection and exposition."""
+
+    def setUp(self):
+        self.client = Client()
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.hod = User.objects.create_user(
+            username="hod",
+            email="hod@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_HEAD_OF_DEPT,
+            first_name="Head",
+            last_name="Dept",
+        )
+
+    def _scrape(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_request_latency_and_db_histograms(self):
+        """Test that views are timed per URL name and queries per database."""
+        before = self._scrape()
+        self.client.force_login(self.student)
+        self.client.get(reverse('students:dashboard'))
+        text = self._scrape()
+
+        count = 'http_request_duration_seconds_count{view="students:dashboard",method="GET"}'
+        self.assertEqual(sample(text, count) - sample(before, count), 1)
+        self.assertIn('http_request_duration_seconds_bucket{view="students:dashboard",method="GET",le="+Inf"}', text)
+        self.assertGreater(sample(text, 'db_query_duration_seconds_count{database="default"}'), 0)
+        self.assertIn('# TYPE http_requests_total counter', text)
+
+    def test_outstanding_gauge_and_workflow_counters(self):
+        """Test the per-status gauge and the submission and decision counters."""
+        before = self._scrape()
+        with self.captureOnCommitCallbacks(execute=True):
+            req = Request.objects.create(
+                student=self.student, title="Appeal", description="", request_type=Request.TYPE_APPEAL,
+                status=Request.STATUS_SENT_TO_HOD,
+            )
+            ApprovalLog.objects.create(request=req, approver=self.hod, action=ApprovalLog.ACTION_APPROVED)
+        text = self._scrape()
+
+        self.assertEqual(sample(text, 'requests_outstanding{status="sent_to_hod"}'), 1)
+        self.assertEqual(sample(text, 'requests_outstanding{status="new"}'), 0)
+        submissions = 'workflow_submissions_total{request_type="Appeal"}'
+        self.assertEqual(sample(text, submissions) - sample(before, submissions), 1)
+        decisions = 'workflow_decisions_total{role="head_of_dept",action="approved"}'
+        self.assertEqual(sample(text, decisions) - sample(before, decisions), 1)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_token_required_when_configured(self):
+        """Test that scrapes need the bearer token when one is set."""
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_multiprocess_mode_sums_worker_files(self):
+        """Test that totals written by other worker processes are added to this one's."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        with open(os.path.join(directory, '99999-dead.json'), 'w') as fh:
+            json.dump([
+                ['cache_requests_total', ['typeahead', 'hit'], 5],
+                ['db_query_duration_seconds', ['other'], [1] + [0] * 11 + [0.0004]],
+            ], fh)
+
+        with override_settings(METRICS_MULTIPROCESS_DIR=directory):
+            local = sample(metrics.render(), 'cache_requests_total{cache="typeahead",result="hit"}')
+            with override_settings(METRICS_MULTIPROCESS_DIR=None):
+                own = sample(metrics.render(), 'cache_requests_total{cache="typeahead",result="hit"}')
+            text = metrics.render()
+
+        self.assertEqual(local, own + 5)
+        self.assertEqual(sample(text, 'db_query_duration_seconds_bucket{database="other",le="0.0005"}'), 1)
+        self.assertEqual(len([name for name in os.listdir(directory) if name.endswith('.json')]), 2)
+
+    def test_finished_threads_are_folded_into_the_process_total(self):
+        """Test that short-lived threads neither pile up stores nor lose their counts."""
+        line = 'cache_requests_total{cache="typeahead",result="miss"}'
+        before = sample(metrics.render(), line)
+        for _ in range(500):
+            thread = threading.Thread(target=metrics.cache_requests.inc, kwargs={'cache': 'typeahead', 'result': 'miss'})
+            thread.start()
+            thread.join()
+
+        self.assertLess(len(metrics._stores), 50)
+        self.assertEqual(sample(metrics.render(), line), before + 500)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    def test_query_metrics_survive_a_connection_opened_inside_a_timed_request(self):
+        """Test that ServerTimingMiddleware's scoped wrapper neither pops record_query nor leaks."""
+        saved = list(connection.execute_wrappers)
+        self.addCleanup(setattr, connection, 'execute_wrappers', saved)
+        others = [w for w in saved if w is not metrics.record_query]
+        connection.execute_wrappers = list(others)
+        enter = RequestTimer.__enter__
+
+        def enter_and_connect(timer):
+            entered = enter(timer)
+            # As with CONN_MAX_AGE=0: the request's first query opens the connection.
+            metrics.install(sender=type(connection), connection=connection)
+            return entered
+
+        self.client.force_login(self.student)
+        with mock.patch.object(RequestTimer, '__enter__', enter_and_connect):
+            for _ in range(3):
+                self.client.get(reverse('students:dashboard'))
+
+        self.assertEqual(connection.execute_wrappers, [metrics.record_query, *others])
+        line = 'db_query_duration_seconds_count{database="default"}'
+        before = sample(metrics.render(), line)
+        User.objects.count()
+        self.assertGreater(sample(metrics.render(), line), before)
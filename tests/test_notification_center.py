@@ -0,0 +1,194 @@
+"""
+Tests for the notification center, unread counters and retention job.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import User
+from requests_unified import notifications
+from requests_unified.archive import archive_batch
+from requests_unified.models import Notification, NotificationCounter, Request
+
+
+class NotificationCenterTest(TestCase):
+    """Tests for notification listing, counters and bulk read."""
+
+    def setUp(self):
+        self.client = Client()
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.other = User.objects.create_user(
+            username="other",
+            email="other@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Other",
+            last_name="Student",
+        )
+        self.request = Request.objects.create(
+            student=self.student,
+            title="Test Request",
+            description="Description",
+        )
+
+    def _notify(self, count, user=None, **fields):
+        return [
+            Notification.objects.create(user=user or self.student, message=f"Message {i}", **fields)
+            for i in range(count)
+        ]
+
+    def test_counter_follows_inserts_and_reads(self):
+        """Test that the unread counter is maintained on insert, single read and bulk read."""
+        created = self._notify(3)
+        self._notify(1, is_read=True)
+        self._notify(2, user=self.other)
+
+        self.assertEqual(NotificationCounter.objects.get(user=self.student).unread, 3)
+        self.assertEqual(notifications.unread_count(self.student.pk), 3)
+
+        self.assertEqual(notifications.mark_read(self.student.pk, [created[0].pk]), 1)
+        self.assertEqual(notifications.mark_read(self.student.pk, [created[0].pk]), 0)
+        self.assertEqual(notifications.unread_count(self.student.pk), 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(notifications.mark_all_read(self.student.pk), 2)
+        # One UPDATE of the rows, one of the counter; the change-log row is written on commit.
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(notifications.unread_count(self.student.pk), 0)
+        self.assertEqual(notifications.unread_count(self.other.pk), 2)
+
+    def test_direct_save_and_missing_counter_are_recounted(self):
+        """Test that editing is_read directly, or losing the counter row, does not make the count drift."""
+        notification = self._notify(2)[0]
+        notification.is_read = True
+        notification.save()
+        self.assertEqual(notifications.unread_count(self.student.pk), 1)
+
+        NotificationCounter.objects.all().delete()
+        self.assertEqual(notifications.unread_count(self.student.pk), 1)
+
+    def test_archiving_recounts_unread(self):
+        """Test that archiving a request recounts users whose unread notifications went with it."""
+        self._notify(2, request=self.request)
+        self._notify(1)
+        Request.objects.filter(pk=self.request.pk).update(status=Request.STATUS_APPROVED)
+
+        archive_batch([self.request.pk])
+
+        self.assertEqual(notifications.unread_count(self.student.pk), 1)
+
+    def test_keyset_pages_cover_everything_once(self):
+        """Test that following next positions returns each notification exactly once, newest first."""
+        created = self._notify(7)
+        # Same timestamp for several rows: the id breaks the tie.
+        Notification.objects.filter(pk__in=[n.pk for n in created[:4]]).update(created_at=created[0].created_at)
+
+        seen, before = [], None
+        while True:
+            items, before = notifications.page(self.student.pk, before=before, size=3)
+            seen.extend(items)
+            if before is None:
+                break
+
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len({n.pk for n in seen}), 7)
+        keys = [(n.created_at, n.pk) for n in seen]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_center_page_and_mark_all_read(self):
+        """Test that the center lists, filters and bulk-reads the user's notifications."""
+        self._notify(2, request=self.request)
+        self._notify(1, is_read=True)
+        self._notify(1, user=self.other)
+        self.client.force_login(self.student)
+
+        response = self.client.get(reverse('notifications:center'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['notifications']), 3)
+        self.assertEqual(response.context['unread_count'], 2)
+        self.assertContains(response, reverse('students:request_detail', args=[self.request.request_id]))
+
+        response = self.client.get(reverse('notifications:center'), {'show': 'unread'})
+        self.assertEqual(len(response.context['notifications']), 2)
+
+        response = self.client.post(reverse('notifications:mark_all_read'))
+        self.assertRedirects(response, reverse('notifications:center'))
+        self.assertFalse(Notification.objects.filter(user=self.student, is_read=False).exists())
+        self.assertTrue(Notification.objects.filter(user=self.other, is_read=False).exists())
+
+    def test_mark_read_only_affects_own_notifications(self):
+        """Test that a user cannot mark someone else's notification read."""
+        theirs = self._notify(1, user=self.other)[0]
+        self.client.force_login(self.student)
+
+        self.client.post(reverse('notifications:mark_read', args=[theirs.pk]))
+
+        theirs.refresh_from_db()
+        self.assertFalse(theirs.is_read)
+
+    def test_navbar_shows_unread_badge(self):
+        """Test that pages show the unread count next to the notifications link."""
+        self._notify(4)
+        self.client.force_login(self.student)
+
+        response = self.client.get(reverse('students:dashboard'))
+
+        self.assertContains(response, f'href="{reverse("notifications:center")}"')
+        self.assertContains(response, 'badge-xs absolute -top-1 -right-1">4</span>', html=False)
+
+
+class CompactNotificationsCommandTest(TestCase):
+    """Tests for the notification retention job."""
+
+    def setUp(self):
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+
+    def test_deletes_only_old_read_notifications(self):
+        """Test that old read notifications are deleted while unread and recent ones stay."""
+        old = timezone.now() - timedelta(days=200)
+        for i in range(5):
+            Notification.objects.create(user=self.student, message=f"Old read {i}", is_read=True)
+        Notification.objects.create(user=self.student, message="Old unread")
+        Notification.objects.create(user=self.student, message="Recent read", is_read=True)
+        Notification.objects.exclude(message="Recent read").update(created_at=old)
+        NotificationCounter.objects.filter(user=self.student).update(unread=42)  # drifted
+
+        out = StringIO()
+        call_command('compact_notifications', older_than_days=90, batch_size=2, stdout=out)
+
+        self.assertIn('Deleted 5 read notifications', out.getvalue())
+        self.assertEqual(
+            set(Notification.objects.values_list('message', flat=True)), {"Old unread", "Recent read"},
+        )
+        self.assertEqual(notifications.unread_count(self.student.pk), 1)
+
+    def test_dry_run_deletes_nothing(self):
+        """Test that --dry-run only reports."""
+        Notification.objects.create(user=self.student, message="Old read", is_read=True)
+        Notification.objects.update(created_at=timezone.now() - timedelta(days=200))
+
+        out = StringIO()
+        call_command('compact_notifications', dry_run=True, stdout=out)
+
+        self.assertIn('Would delete 1 read notifications', out.getvalue())
+        self.assertEqual(Notification.objects.count(), 1)
@@ -0,0 +1,177 @@
+"""
+Tests for notification email delivery: immediate, digest and batching.
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import User
+from requests_unified import digests
+from requests_unified.models import Notification, NotificationPreference, Request
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    NOTIFICATION_EMAIL_DEFAULT='immediate',
+    NOTIFICATION_EMAIL_ROLE_DEFAULTS={'lecturer': 'digest'},
+    NOTIFICATION_DIGEST_HOURS=24,
+)
+class NotificationEmailTest(TestCase):
+    """Tests for planning and sending notification emails."""
+
+    def setUp(self):
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.lecturer = User.objects.create_user(
+            username="lecturer",
+            email="lecturer@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_LECTURER,
+            first_name="Lecturer",
+            last_name="One",
+        )
+        self.request = Request.objects.create(
+            student=self.student,
+            title="Test Request",
+            description="Description",
+        )
+
+    def _notify(self, user, count, age_hours=0):
+        created = [
+            Notification.objects.create(user=user, request=self.request, message=f"Message {i}")
+            for i in range(count)
+        ]
+        if age_hours:
+            Notification.objects.filter(pk__in=[n.pk for n in created]).update(
+                created_at=timezone.now() - timedelta(hours=age_hours)
+            )
+        return created
+
+    def test_immediate_sends_one_email_per_notification(self):
+        """Test that immediate recipients get each notification as its own email."""
+        self._notify(self.student, 2)
+
+        call_command('send_notification_emails', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].to, ["student@sce.ac.il"])
+        self.assertIn(self.request.request_id, mail.outbox[0].subject)
+        self.assertIn("Message 0", mail.outbox[0].body)
+        self.assertFalse(Notification.objects.filter(emailed_at__isnull=True).exists())
+
+        call_command('send_notification_emails', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_digest_waits_for_window_then_sends_one_summary(self):
+        """Test that digest recipients get nothing until the window is up, then a single summary."""
+        self._notify(self.lecturer, 3, age_hours=1)
+
+        call_command('send_notification_emails', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Notification.objects.filter(emailed_at__isnull=True).count(), 3)
+
+        Notification.objects.update(created_at=timezone.now() - timedelta(hours=25))
+        call_command('send_notification_emails', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("3 new notifications", mail.outbox[0].subject)
+        for i in range(3):
+            self.assertIn(f"Message {i}", mail.outbox[0].body)
+        self.assertFalse(Notification.objects.filter(emailed_at__isnull=True).exists())
+
+    def test_saved_preference_overrides_role_default(self):
+        """Test that a NotificationPreference row beats the role default, including opting out."""
+        NotificationPreference.objects.create(user=self.lecturer, email_delivery='immediate')
+        NotificationPreference.objects.create(user=self.student, email_delivery='none')
+        self._notify(self.lecturer, 1)
+        self._notify(self.student, 2)
+
+        call_command('send_notification_emails', stdout=StringIO())
+
+        self.assertEqual([m.to for m in mail.outbox], [["lecturer@sce.ac.il"]])
+        # Opted-out notifications leave the queue without being sent.
+        self.assertFalse(Notification.objects.filter(emailed_at__isnull=True).exists())
+
+    def test_one_connection_per_batch(self):
+        """Test that messages share a backend connection per batch."""
+        self._notify(self.student, 5)
+        messages, skipped = digests.plan()
+
+        with mock.patch('requests_unified.digests.get_connection', wraps=digests.get_connection) as get_connection:
+            sent, connections = digests.deliver(messages, skipped, batch_size=2)
+
+        self.assertEqual((sent, connections), (5, 3))
+        self.assertEqual(get_connection.call_count, 3)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_failed_batch_stays_queued(self):
+        """Test that notifications are only marked emailed once their batch was sent."""
+        self._notify(self.student, 2)
+        messages, skipped = digests.plan()
+
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError):
+            with self.assertRaises(OSError):
+                digests.deliver(messages, skipped)
+
+        self.assertEqual(Notification.objects.filter(emailed_at__isnull=True).count(), 2)
+
+    def test_dry_run_sends_nothing(self):
+        """Test that --dry-run only reports."""
+        self._notify(self.student, 2)
+
+        out = StringIO()
+        call_command('send_notification_emails', dry_run=True, stdout=out)
+
+        self.assertIn('Would send 2 emails', out.getvalue())
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Notification.objects.filter(emailed_at__isnull=True).count(), 2)
+
+
+class NotificationPreferenceViewTest(TestCase):
+    """Tests for the email preference form on the notification center."""
+
+    def setUp(self):
+        self.client = Client()
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.client.force_login(self.student)
+
+    def test_saves_preference(self):
+        """Test that the form creates and then updates the user's preference."""
+        url = reverse('notifications:preferences')
+
+        response = self.client.post(url, {'email_delivery': 'digest', 'digest_hours': '12'})
+        self.assertRedirects(response, reverse('notifications:center'))
+        preference = NotificationPreference.objects.get(user=self.student)
+        self.assertEqual((preference.email_delivery, preference.digest_hours), ('digest', 12))
+
+        self.client.post(url, {'email_delivery': 'none', 'digest_hours': '12'})
+        preference.refresh_from_db()
+        self.assertEqual(preference.email_delivery, 'none')
+
+        response = self.client.get(reverse('notifications:center'))
+        self.assertEqual(response.context['email_delivery'], 'none')
+
+    def test_rejects_unknown_option(self):
+        """Test that an unknown delivery option is not saved."""
+        self.client.post(reverse('notifications:preferences'), {'email_delivery': 'hourly'})
+
+        self.assertFalse(NotificationPreference.objects.exists())
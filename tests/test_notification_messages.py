@@ -0,0 +1,132 @@
+"""
+Tests for template-coded notifications and the conversion of free-text ones.
+"""
+import json
+from importlib import import_module
+
+from django.apps import apps
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from core.models import User
+from requests_unified import live, notifications
+from requests_unified.models import Notification, Request
+from requests_unified.notification_messages import MESSAGES, render
+
+conversion = import_module('requests_unified.migrations.0008_notification_codes')
+
+
+class NotificationMessagesTest(TestCase):
+    """Tests for creating and rendering coded notifications."""
+
+    def setUp(self):
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.request = Request.objects.create(
+            student=self.student,
+            title="Grade appeal for Calculus",
+            description="Description",
+        )
+
+    def test_renders_title_from_request(self):
+        """Test that the title is not stored but read from the request when rendering."""
+        notification = notifications.notify(self.student, self.request, 'lecturer_rejected', reason="Late")
+
+        notification.refresh_from_db()
+        self.assertEqual(notification.params, {'reason': "Late"})
+        self.assertEqual(notification.message, '')
+        self.assertEqual(
+            notification.text, "Your request 'Grade appeal for Calculus' has been rejected. Reason: Late",
+        )
+
+        Request.objects.filter(pk=self.request.pk).update(title="Renamed")
+        self.assertIn("'Renamed'", Notification.objects.get(pk=notification.pk).text)
+
+    def test_unknown_code_is_rejected(self):
+        """Test that notify() refuses codes without a template."""
+        with self.assertRaises(ValueError):
+            notifications.notify(self.student, self.request, 'no_such_code')
+
+    def test_free_text_and_missing_params(self):
+        """Test that free-text rows render their message and missing params render empty."""
+        notification = Notification.objects.create(user=self.student, message="Welcome!")
+        self.assertEqual(notification.text, "Welcome!")
+        self.assertEqual(render('needs_info', {}, "T"), "More information needed for your request 'T': ")
+
+    def test_views_and_stream_render_messages(self):
+        """Test that the center page and the live stream show rendered messages."""
+        notifications.notify(self.student, self.request, 'hod_approved')
+        expected = "Great news! Your request 'Grade appeal for Calculus' has been approved by the Head of Department!"
+
+        events, _ = live.fetch_events(self.student.pk, (0, 0))
+        self.assertEqual(events[0][2]['message'], expected)
+
+        client = Client()
+        client.force_login(self.student)
+        self.assertContains(client.get(reverse('notifications:center')), "Great news! Your request")
+
+    def test_rows_are_smaller_than_rendered_messages(self):
+        """Test that coded rows store a fraction of the rendered sentence."""
+        notification = notifications.notify(self.student, self.request, 'lecturer_approved')
+
+        stored = len(notification.code) + len(json.dumps(notification.params)) + len(notification.message)
+        self.assertLess(stored * 3, len(notification.text))
+
+
+class NotificationConversionTest(TestCase):
+    """Tests for the migration that converts free-text notifications to codes."""
+
+    def setUp(self):
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.request = Request.objects.create(
+            student=self.student,
+            title="Appeal",
+            description="Description",
+        )
+
+    def test_frozen_templates_match_registry(self):
+        """Test that every template the migration converts to still renders the same way."""
+        for code, template in conversion.MESSAGES.items():
+            self.assertEqual(MESSAGES[code], template)
+
+    def test_converts_known_messages_in_batches(self):
+        """Test that rendered messages become codes and unknown or stale ones stay free text."""
+        messages = [
+            "Your request 'Appeal' has been rejected by the Head of Department. Reason: Too late: sorry",
+            "Additional document requested: Medical form. Please check your request details.",
+            "Your request 'Old title' has been approved by a lecturer!",
+            "Something else entirely",
+        ]
+        for message in messages:
+            Notification.objects.create(user=self.student, request=self.request, message=message)
+
+        original_batch_size = conversion.BATCH_SIZE
+        conversion.BATCH_SIZE = 2
+        try:
+            conversion.to_codes(apps, None)
+        finally:
+            conversion.BATCH_SIZE = original_batch_size
+
+        rows = list(Notification.objects.select_related('request').order_by('pk'))
+        self.assertEqual([row.code for row in rows], ['hod_rejected', 'document_requested', '', ''])
+        self.assertEqual(rows[0].params, {'reason': "Too late: sorry"})
+        self.assertEqual([row.text for row in rows], messages)
+
+        conversion.to_messages(apps, None)
+        self.assertEqual(
+            list(Notification.objects.order_by('pk').values_list('message', 'code')),
+            [(message, '') for message in messages],
+        )
@@ -0,0 +1,115 @@
+"""
+Tests for on-demand request profiling and the management profiles page.
+"""
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core import profiling
+from core.models import User
+
+
+class ProfilingTest(TestCase):
+    """Tests for ProfilingMiddleware, profile rotation and download."""
+
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(PROFILING_DIR=Path(self.profile_dir), PROFILING_SAMPLE_RATE=0)
+        self.settings_override.enable()
+
+        self.client = Client()
+        self.admin = User.objects.create_user(
+            username="admin",
+            email="admin@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_ADMIN,
+            first_name="Admin",
+            last_name="User",
+        )
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def _profiled_get(self, user, token):
+        self.client.force_login(user)
+        return self.client.get(reverse('management:user_list'), headers={profiling.PROFILE_HEADER: token})
+
+    def test_admin_token_profiles_request(self):
+        """Test that a valid admin token writes .prof and collapsed-stack files."""
+        response = self._profiled_get(self.admin, profiling.make_token(self.admin))
+
+        name = response['X-Profile-Name']
+        [profile] = profiling.list_profiles()
+        self.assertEqual(profile['name'], name)
+        self.assertEqual(set(profile['files']), {'.prof', '.collapsed'})
+
+    def test_invalid_or_foreign_token_is_ignored(self):
+        """Test that bad tokens and tokens used by non-admins do not profile."""
+        self.assertNotIn('X-Profile-Name', self._profiled_get(self.admin, "forged:token"))
+        self.client.force_login(self.student)
+        response = self.client.get(
+            reverse('students:dashboard'), headers={profiling.PROFILE_HEADER: profiling.make_token(self.admin)},
+        )
+        self.assertNotIn('X-Profile-Name', response)
+        self.assertEqual(profiling.list_profiles(), [])
+
+    def test_sample_rate_profiles_without_header(self):
+        """Test that sampled requests are profiled without a token."""
+        with override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_MODE="sampler"):
+            client = Client()
+            client.force_login(self.student)
+            client.get(reverse('students:dashboard'))
+
+        [profile] = profiling.list_profiles()
+        self.assertEqual(set(profile['files']), {'.collapsed'})
+
+    @override_settings(PROFILING_MAX_PROFILES=2)
+    def test_old_profiles_are_rotated(self):
+        """Test that only the newest profiles are kept."""
+        token = profiling.make_token(self.admin)
+        names = [self._profiled_get(self.admin, token)['X-Profile-Name'] for _ in range(3)]
+
+        self.assertEqual([profile['name'] for profile in profiling.list_profiles()], names[:0:-1])
+
+    def test_profiles_page_lists_and_downloads(self):
+        """Test that admins can list and download profiles, and paths cannot escape the directory."""
+        name = self._profiled_get(self.admin, profiling.make_token(self.admin))['X-Profile-Name']
+
+        response = self.client.get(reverse('management:profile_list'))
+        self.assertContains(response, name)
+        download = self.client.get(reverse('management:profile_download', args=[f'{name}.collapsed']))
+        self.assertEqual(download.status_code, 200)
+        self.assertIn(f'{name}.collapsed', download['Content-Disposition'])
+        self.assertEqual(self.client.get(reverse('management:profile_download', args=['..%2Fsettings.py'])).status_code, 404)
+
+
+class StackSamplerTest(TestCase):
+    """Tests for the collapsed-stack sampler."""
+
+    def test_collapsed_stacks_of_busy_code(self):
+        """Test that sampling a busy function yields collapsed stacks that include it."""
+        def busy():
+            total = 0
+            for i in range(3_000_000):
+                total += i
+            return total
+
+        result, profiler, sampler, elapsed = profiling.profile_call(busy, mode="sampler", interval=0.001)
+
+        self.assertIsNone(profiler)
+        self.assertEqual(result, sum(range(3_000_000)))
+        line = sampler.collapsed().splitlines()[0]
+        self.assertIn("busy (test_profiling.py", line)
+        self.assertRegex(line, r";.* \d+$")
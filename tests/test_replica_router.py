@@ -0,0 +1,117 @@
+"""
+Tests for the read-replica router, read-your-writes stickiness and replica refresh.
+"""
+import os
+import sqlite3
+import tempfile
+import time
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.management.commands.refresh_replica import backup_database
+from core.middleware import ReplicaStickinessMiddleware
+from core.routers import (
+    LAST_WRITE_SESSION_KEY, is_sticky, mark_write, read_from_replica, replica_view,
+)
+from requests_unified.models import Request
+
+
+@replica_view
+def read_alias_view(request):
+    """Report which alias a read would use."""
+    return HttpResponse(router.db_for_read(Request))
+
+
+@override_settings(REPLICA_DATABASE='replica', REPLICA_STICKY_SECONDS=10)
+class ReplicaRouterTest(TestCase):
+    """Tests for routing decisions."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _get(self):
+        request = self.factory.get('/')
+        request.session = SessionStore()
+        return request
+
+    def test_reads_use_primary_by_default(self):
+        """Test that nothing goes to the replica outside an opted-in block."""
+        self.assertEqual(router.db_for_read(Request), 'default')
+
+    def test_reads_and_writes_inside_replica_block(self):
+        """Test that reads go to the replica while writes stay on the primary."""
+        with read_from_replica():
+            self.assertEqual(router.db_for_read(Request), 'replica')
+            self.assertEqual(router.db_for_write(Request), 'default')
+        self.assertEqual(router.db_for_read(Request), 'default')
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_no_replica_configured(self):
+        """Test that an unset replica keeps everything on the primary."""
+        with read_from_replica():
+            self.assertEqual(router.db_for_read(Request), 'default')
+
+    def test_replica_view_reads_from_replica(self):
+        """Test that a decorated GET view reads from the replica."""
+        response = read_alias_view(self._get())
+        self.assertEqual(response.content, b'replica')
+
+    def test_recent_write_sticks_to_primary(self):
+        """Test read-your-writes: a session that just wrote reads from the primary."""
+        request = self._get()
+        mark_write(request)
+
+        self.assertTrue(is_sticky(request))
+        self.assertEqual(read_alias_view(request).content, b'default')
+
+    def test_stickiness_expires(self):
+        """Test that the primary is only pinned for the configured window."""
+        request = self._get()
+        request.session[LAST_WRITE_SESSION_KEY] = time.time() - 11
+
+        self.assertFalse(is_sticky(request))
+        self.assertEqual(read_alias_view(request).content, b'replica')
+
+    def test_middleware_marks_successful_writes(self):
+        """Test that successful non-GET requests start the sticky window."""
+        middleware = ReplicaStickinessMiddleware(lambda request: HttpResponse())
+        request = self.factory.post('/')
+        request.session = SessionStore()
+        middleware(request)
+        self.assertIn(LAST_WRITE_SESSION_KEY, request.session)
+
+        failing = ReplicaStickinessMiddleware(lambda request: HttpResponse(status=403))
+        request = self.factory.post('/')
+        request.session = SessionStore()
+        failing(request)
+        self.assertNotIn(LAST_WRITE_SESSION_KEY, request.session)
+
+
+class RefreshReplicaTest(TestCase):
+    """Tests for copying the primary into the replica."""
+
+    def test_backup_copies_data(self):
+        """Test that the online backup produces a readable copy."""
+        with tempfile.TemporaryDirectory() as tmp:
+            primary, replica = os.path.join(tmp, 'primary.db'), os.path.join(tmp, 'replica.db')
+            conn = sqlite3.connect(primary)
+            conn.execute('CREATE TABLE t (v INTEGER)')
+            conn.executemany('INSERT INTO t VALUES (?)', [(i,) for i in range(100)])
+            conn.commit()
+            conn.close()
+
+            self.assertGreater(backup_database(primary, replica, pages=1), 0)
+
+            copy = sqlite3.connect(replica)
+            self.assertEqual(copy.execute('SELECT count(*) FROM t').fetchone()[0], 100)
+            copy.close()
+
+    def test_rejects_primary_alias(self):
+        """Test that the primary cannot be used as the backup target."""
+        with self.assertRaises(CommandError):
+            call_command('refresh_replica', database='default')
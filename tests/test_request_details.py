@@ -0,0 +1,130 @@
+"""
+Tests for structured request details, their backfill and dashboard filters.
+"""
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from core.models import User
+from requests_unified.details import clean_details, normalize_semester, parse_description
+from requests_unified.models import Degree, Request, RequestDetails
+
+
+POSTPONEMENT_DESCRIPTION = (
+    "Department: Software Engineering\n"
+    "Semester to Postpone: spring  2026\n"
+    "Reason Type: Medical\n"
+    "Explanation: Surgery\n"
+    "Expected Return Date: 2026-10-01"
+)
+
+
+class RequestDetailsParsingTest(TestCase):
+    """Tests for cleaning and parsing detail values."""
+
+    def test_parse_generated_description(self):
+        """Test that labelled lines are mapped to detail fields."""
+        raw = parse_description(POSTPONEMENT_DESCRIPTION)
+
+        self.assertEqual(raw['department'], "Software Engineering")
+        self.assertEqual(raw['semester'], "spring  2026")
+        self.assertEqual(raw['return_date'], "2026-10-01")
+        self.assertNotIn('explanation', raw)
+
+    def test_clean_details_types_values(self):
+        """Test normalization and validation of raw values."""
+        details = clean_details({
+            'semester': ' spring 2026 ',
+            'grade_received': '65 (final exam)',
+            'expected_grade': 'Not specified',
+            'reason_type': 'Unknown',
+            'return_date': '2026-13-40',
+        })
+
+        self.assertEqual(details, {'semester': "Spring 2026", 'grade_received': 65})
+        self.assertEqual(normalize_semester("semester  b"), "Semester B")
+
+
+class RequestDetailsFlowTest(TestCase):
+    """Tests for populating and using request details."""
+
+    def setUp(self):
+        self.client = Client()
+        self.degree = Degree.objects.create(name="Software Engineering", code="SE")
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+            degree=self.degree,
+        )
+        self.hod = User.objects.create_user(
+            username="hod",
+            email="hod@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_HEAD_OF_DEPT,
+            first_name="Head",
+            last_name="Dept",
+        )
+
+    def test_submission_stores_details(self):
+        """Test that submitting a postponement stores typed details."""
+        self.client.force_login(self.student)
+        self.client.post(reverse('students:submit_request'), {
+            'request_type': 'Postponement',
+            'title': 'Postponement Request',
+            'priority': 'high',
+            'department': self.degree.id,
+            'semester': 'Fall 2026',
+            'reason_type': 'Medical',
+            'explanation': 'Medical reasons',
+            'return_date': '2027-03-01',
+        })
+
+        details = Request.objects.get(student=self.student).details
+        self.assertEqual(details.department, self.degree)
+        self.assertEqual(details.semester, "Fall 2026")
+        self.assertEqual(details.reason_type, RequestDetails.REASON_MEDICAL)
+        self.assertEqual(details.return_date, date(2027, 3, 1))
+
+    def test_backfill_parses_existing_descriptions(self):
+        """Test that the backfill creates details only for requests without them."""
+        legacy = Request.objects.create(
+            student=self.student, title="Legacy", description=POSTPONEMENT_DESCRIPTION,
+            request_type=Request.TYPE_POSTPONEMENT,
+        )
+        existing = Request.objects.create(student=self.student, title="New", description="")
+        RequestDetails.objects.create(request=existing, category="Keep")
+
+        out = StringIO()
+        call_command('backfill_request_details', stdout=out)
+
+        self.assertIn("Created details for 1 requests", out.getvalue())
+        details = RequestDetails.objects.get(request=legacy)
+        self.assertEqual(details.department, self.degree)
+        self.assertEqual(details.semester, "Spring 2026")
+        self.assertEqual(details.return_date, date(2026, 10, 1))
+        self.assertEqual(RequestDetails.objects.get(request=existing).category, "Keep")
+
+    def test_hod_dashboard_filters_by_semester_and_reason(self):
+        """Test that the HOD dashboard filters on the structured columns."""
+        match = Request.objects.create(
+            student=self.student, title="Medical Spring", description="", status=Request.STATUS_SENT_TO_HOD,
+        )
+        RequestDetails.objects.create(request=match, semester="Spring 2026", reason_type="Medical")
+        other = Request.objects.create(
+            student=self.student, title="Financial Spring", description="", status=Request.STATUS_SENT_TO_HOD,
+        )
+        RequestDetails.objects.create(request=other, semester="Spring 2026", reason_type="Financial")
+
+        self.client.force_login(self.hod)
+        response = self.client.get(reverse('head_of_dept:dashboard'), {
+            'semester': 'spring 2026', 'reason_type': 'Medical',
+        })
+
+        self.assertEqual(list(response.context['requests']), [match])
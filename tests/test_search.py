@@ -0,0 +1,135 @@
+"""
+Tests for full-text search over requests, comments and staff notes.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from core.models import User
+from requests_unified.models import Request, Comment, StaffNote
+from requests_unified.search import search_requests, build_match_query
+
+
+class RequestSearchTest(TestCase):
+    """Tests for the search index and ranked results."""
+
+    def setUp(self):
+        self.client = Client()
+
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.secretary = User.objects.create_user(
+            username="secretary",
+            email="secretary@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_SECRETARY,
+            first_name="Sara",
+            last_name="Secretary",
+        )
+        self.hod = User.objects.create_user(
+            username="hod",
+            email="hod@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_HEAD_OF_DEPT,
+            first_name="Head",
+            last_name="Dept",
+        )
+
+        self.calculus = Request.objects.create(
+            student=self.student,
+            title="Calculus exam postponement",
+            description="I was hospitalized during the exam week.",
+        )
+        self.physics = Request.objects.create(
+            student=self.student,
+            title="Physics grade appeal",
+            description="My lab grade was not counted.",
+            status=Request.STATUS_SENT_TO_HOD,
+        )
+
+    def test_match_query_escapes_operators(self):
+        """Test that user input cannot inject FTS syntax."""
+        self.assertEqual(build_match_query('lab" OR *'), '"lab"* "OR"*')
+        self.assertEqual(build_match_query('  '), '')
+
+    def test_search_finds_request_fields(self):
+        """Test that titles and descriptions are searchable with prefix matching."""
+        results = search_requests("hospital")
+
+        self.assertEqual(results, [self.calculus])
+        self.assertIn("<mark>", results[0].search_snippet)
+
+    def test_search_ranks_title_matches_first(self):
+        """Test that title matches outrank description matches."""
+        Request.objects.create(
+            student=self.student,
+            title="Other request",
+            description="Physics was mentioned only here.",
+        )
+
+        results = search_requests("physics")
+
+        self.assertEqual(results[0], self.physics)
+        self.assertEqual(len(results), 2)
+
+    def test_comments_and_notes_are_indexed(self):
+        """Test that new comments and staff notes update the index."""
+        Comment.objects.create(request=self.physics, author=self.hod, comment="Check the syllabus")
+        StaffNote.objects.create(request=self.calculus, author=self.secretary,
+                                 role=StaffNote.ROLE_STAFF, note="Medical certificate attached")
+
+        self.assertEqual(search_requests("syllabus"), [self.physics])
+        self.assertEqual(search_requests("certificate"), [self.calculus])
+
+    def test_deleted_request_leaves_index(self):
+        """Test that deleted requests no longer match."""
+        self.calculus.delete()
+
+        self.assertEqual(search_requests("hospitalized"), [])
+
+    def test_search_respects_queryset_scope(self):
+        """Test that results are restricted to the given queryset."""
+        scope = Request.objects.filter(status=Request.STATUS_SENT_TO_HOD)
+
+        self.assertEqual(search_requests("exam grade", scope), [])
+        self.assertEqual(search_requests("grade", scope), [self.physics])
+
+    def test_snippet_escapes_html(self):
+        """Test that snippets never render user HTML."""
+        Request.objects.create(student=self.student, title="<script>alert(1)</script> xss")
+
+        snippet = search_requests("xss")[0].search_snippet
+
+        self.assertNotIn("<script>", snippet)
+        self.assertIn("&lt;script&gt;", snippet)
+
+    def test_rebuild_command(self):
+        """Test that the rebuild command re-indexes all requests."""
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertIn("Indexed 2 requests", out.getvalue())
+        self.assertEqual(search_requests("lab"), [self.physics])
+
+    def test_staff_dashboard_search(self):
+        """Test that the secretary dashboard shows ranked results with snippets."""
+        self.client.force_login(self.secretary)
+        response = self.client.get(reverse('staff:dashboard'), {'search': 'hospitalized'})
+
+        self.assertEqual(list(response.context['requests']), [self.calculus])
+        self.assertContains(response, "<mark>hospitalized</mark>")
+
+    def test_hod_dashboard_search_covers_all_statuses(self):
+        """Test that HOD search looks beyond pending requests."""
+        self.client.force_login(self.hod)
+        response = self.client.get(reverse('head_of_dept:dashboard'), {'search': 'calculus'})
+
+        self.assertEqual(list(response.context['requests']), [self.calculus])
@@ -0,0 +1,70 @@
+"""
+Tests for the Server-Timing request instrumentation.
+"""
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core.models import User
+from core.timing import RequestTimer
+from requests_unified.models import Request
+
+
+class ServerTimingMiddlewareTest(TestCase):
+    """Tests for ServerTimingMiddleware headers, sampling and slow-request logging."""
+
+    def setUp(self):
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        Request.objects.create(student=self.student, title="Timed", description="")
+
+    def _get(self, **settings):
+        with override_settings(**settings):
+            client = Client()  # middleware reads its settings when the handler is built
+            client.force_login(self.student)
+            return client.get(reverse('students:dashboard'))
+
+    def test_server_timing_header(self):
+        """Test that sampled responses report db, template, view and total time."""
+        response = self._get(SERVER_TIMING_SAMPLE_RATE=1.0, SERVER_TIMING_QUERY_COUNT_HEADER=True)
+
+        header = response['Server-Timing']
+        for metric in ('db;dur=', 'tpl;dur=', 'view;dur=', 'total;dur='):
+            self.assertIn(metric, header)
+        self.assertGreater(int(response['X-Query-Count']), 0)
+        self.assertIn(f'desc="{response["X-Query-Count"]} queries"', header)
+
+    def test_unsampled_requests_are_not_instrumented(self):
+        """Test that a zero sample rate adds no headers."""
+        response = self._get(SERVER_TIMING_SAMPLE_RATE=0, SERVER_TIMING_QUERY_COUNT_HEADER=True)
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertNotIn('X-Query-Count', response)
+
+    def test_threshold_logs_slowest_queries(self):
+        """Test that exceeding the query threshold logs a warning with SQL."""
+        with self.assertLogs('core.timing', 'WARNING') as logs:
+            self._get(SERVER_TIMING_SAMPLE_RATE=1.0, SERVER_TIMING_MAX_QUERIES=1, SERVER_TIMING_SLOW_QUERIES=2)
+
+        self.assertIn('flagged=queries>1', logs.output[0])
+        self.assertIn('SELECT', logs.output[0])
+        self.assertEqual(len(logs.records[0].timing['slowest_queries']), 2)
+
+
+class RequestTimerTest(TestCase):
+    """Tests for RequestTimer query accounting."""
+
+    def test_counts_queries_and_keeps_slowest(self):
+        """Test that queries are counted and only the slowest SQL is kept."""
+        with RequestTimer(slow_queries=1) as timer:
+            list(User.objects.all())
+            User.objects.count()
+
+        self.assertEqual(timer.queries, 2)
+        self.assertEqual(len(timer.slowest_queries()), 1)
+        self.assertIn('total;dur=', timer.server_timing())
@@ -0,0 +1,137 @@
+"""
+Tests for the slow query log and its report command.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core.models import User
+from core import slow_queries
+from core.slow_queries import SlowQueryLog, has_full_scan, normalize_sql, params_shape
+from core.timing import RequestTimer
+
+
+class SlowQueryLogTest(TestCase):
+    """Tests for recording slow queries."""
+
+    def setUp(self):
+        User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+
+    def _log(self, query):
+        with self.assertLogs('core.slow_queries', 'WARNING') as logs:
+            with connection.execute_wrapper(SlowQueryLog(threshold_ms=0)):
+                list(query)
+        return [json.loads(record.getMessage()) for record in logs.records]
+
+    def test_records_plan_and_full_scan(self):
+        """Test that a query over the threshold is logged with its plan and a full-scan flag."""
+        [record] = self._log(User.objects.filter(first_name="Student"))
+
+        self.assertIn('FROM "core_user" WHERE "core_user"."first_name" = ?', record['sql'])
+        self.assertEqual(record['params'], '(str)')
+        self.assertTrue(record['full_scan'])
+        self.assertTrue(any(line.startswith('SCAN') for line in record['plan']))
+        self.assertTrue(any('test_slow_queries.py' in frame for frame in record['stack']))
+
+    def test_index_lookup_is_not_a_full_scan(self):
+        """Test that a primary key lookup is not flagged."""
+        [record] = self._log(User.objects.filter(pk__in=[1, 2, 3]))
+
+        self.assertFalse(record['full_scan'])
+        self.assertIn('IN (...)', record['sql'])
+
+    def test_fast_queries_are_not_logged(self):
+        """Test that queries under the threshold are ignored."""
+        with self.assertNoLogs('core.slow_queries', 'WARNING'):
+            with connection.execute_wrapper(SlowQueryLog(threshold_ms=60_000)):
+                list(User.objects.all())
+
+    @override_settings(SLOW_QUERY_MS=60_000, SERVER_TIMING_SAMPLE_RATE=1.0)
+    def test_connection_opened_inside_a_timed_request(self):
+        """Test that installing the log mid-request does not leave request timers behind."""
+        saved = list(connection.execute_wrappers)
+        self.addCleanup(setattr, connection, 'execute_wrappers', saved)
+        others = [w for w in saved if not isinstance(w, SlowQueryLog)]
+        connection.execute_wrappers = list(others)
+        enter = RequestTimer.__enter__
+
+        def enter_and_connect(timer):
+            entered = enter(timer)
+            # As with CONN_MAX_AGE=0: the request's first query opens the connection.
+            slow_queries.install(sender=type(connection), connection=connection)
+            return entered
+
+        client = Client()
+        client.force_login(User.objects.get(username="student"))
+        with mock.patch.object(RequestTimer, '__enter__', enter_and_connect):
+            client.get(reverse('students:dashboard'))
+            installed = len(connection.execute_wrappers)
+            for _ in range(5):
+                client.get(reverse('students:dashboard'))
+                self.assertEqual(len(connection.execute_wrappers), installed)
+
+        self.assertIsInstance(connection.execute_wrappers[0], SlowQueryLog)
+        self.assertEqual(connection.execute_wrappers[1:], others)
+
+    def test_normalization(self):
+        """Test that literals and placeholder lists normalize to the same fingerprint text."""
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE a = 'x''y' AND b IN (%s, %s,  %s) LIMIT 21"),
+            "SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?",
+        )
+        self.assertEqual(params_shape([(1, 'a'), (2, 'b')], many=True), '(int, str) x 2')
+        self.assertFalse(has_full_scan(['SCAN core_user USING INDEX core_user_role', 'SCAN CONSTANT ROW']))
+
+
+class SlowQueryReportTest(TestCase):
+    """Tests for the slow_query_report command."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(handle)
+        scan = {'fingerprint': 'aaa', 'sql': 'SELECT * FROM t WHERE x = ?', 'params': '(int)',
+                'stack': ['views.py:10 dashboard'], 'plan': ['SCAN t'], 'full_scan': True}
+        lookup = {'fingerprint': 'bbb', 'sql': 'SELECT * FROM t WHERE id = ?', 'params': '(int)',
+                  'stack': [], 'plan': ['SEARCH t USING INTEGER PRIMARY KEY (rowid=?)'], 'full_scan': False}
+        with open(f'{self.path}.1', 'w') as fh:
+            fh.write(json.dumps({**scan, 'ms': 150}) + '\n')
+        with open(self.path, 'w') as fh:
+            fh.write(json.dumps({**scan, 'ms': 250}) + '\n')
+            fh.write('not json\n')
+            fh.write(json.dumps({**lookup, 'ms': 300}) + '\n')
+
+    def tearDown(self):
+        for path in (self.path, f'{self.path}.1'):
+            os.unlink(path)
+
+    def test_aggregates_by_fingerprint_including_backups(self):
+        """Test that records from rotated files are grouped and ranked by total time."""
+        out = StringIO()
+        call_command('slow_query_report', log=self.path, stdout=out)
+        output = out.getvalue()
+
+        self.assertIn('#1 aaa  count=2  total=400ms', output)
+        self.assertIn('FULL SCAN', output)
+        self.assertIn('from: views.py:10 dashboard', output)
+        self.assertIn('3 slow queries, 2 fingerprints', output)
+
+    def test_full_scans_filter(self):
+        """Test that --full-scans hides queries using an index."""
+        out = StringIO()
+        call_command('slow_query_report', log=self.path, full_scans=True, stdout=out)
+
+        self.assertNotIn('bbb', out.getvalue())
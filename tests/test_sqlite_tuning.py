@@ -0,0 +1,64 @@
+"""
+Tests for the SQLite connection tuning and its benchmark command.
+"""
+import os
+import sqlite3
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from core.db import apply_pragmas, configure_sqlite
+
+
+class SQLiteTuningTest(TestCase):
+    """Tests for the connection_created PRAGMA hook."""
+
+    def _pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_to_connections(self):
+        """Test that new connections get the configured PRAGMAs."""
+        self.assertEqual(self._pragma('busy_timeout'), 5000)
+        self.assertEqual(self._pragma('cache_size'), -20000)
+        self.assertEqual(self._pragma('temp_store'), 2)  # MEMORY
+
+    def test_apply_pragmas_enables_wal(self):
+        """Test that file databases switch to WAL with the default settings."""
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = sqlite3.connect(os.path.join(tmp, 'db.sqlite3'))
+            apply_pragmas(conn, {'journal_mode': 'WAL', 'synchronous': 'NORMAL'})
+            self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            self.assertEqual(conn.execute('PRAGMA synchronous').fetchone()[0], 1)  # NORMAL
+            conn.close()
+
+    def test_write_transactions_begin_immediate(self):
+        """Test that atomic blocks start with BEGIN IMMEDIATE."""
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def test_pragmas_configurable(self):
+        """Test that SQLITE_PRAGMAS overrides the defaults."""
+        try:
+            with self.settings(SQLITE_PRAGMAS={'busy_timeout': 1234}):
+                configure_sqlite(sender=None, connection=connection)
+                self.assertEqual(self._pragma('busy_timeout'), 1234)
+        finally:
+            with connection.cursor() as cursor:
+                apply_pragmas(cursor, {'busy_timeout': 5000})
+
+
+class SQLiteBenchmarkCommandTest(TestCase):
+    """Tests for the benchmark_sqlite command."""
+
+    def test_benchmark_reports_each_mode(self):
+        """Test that a short run prints a row per mode."""
+        out = StringIO()
+        call_command('benchmark_sqlite', duration=0.2, rows=50, readers=1, writers=1, stdout=out)
+
+        output = out.getvalue()
+        for mode in ('default', 'wal', 'wal-immediate'):
+            self.assertIn(f'\n{mode} ', output)
@@ -0,0 +1,155 @@
+"""
+Tests for the delta sync change feed.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import User
+from requests_unified import notifications, sync
+from requests_unified.archive import archive_batch
+from requests_unified.models import ChangeLog, Notification, Request, StatusHistory
+
+
+class SyncFeedTest(TestCase):
+    """Tests for snapshots, deltas and the change log behind them."""
+
+    def setUp(self):
+        self.client = Client()
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+        )
+        self.other = User.objects.create_user(
+            username="other",
+            email="other@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Other",
+            last_name="Student",
+        )
+        self.request = Request.objects.create(
+            student=self.student,
+            title="Test Request",
+            description="Description",
+        )
+        self.client.force_login(self.student)
+
+    def _poll(self, cursor=None):
+        response = self.client.get(reverse('sync'), {'cursor': cursor} if cursor else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_snapshot_then_only_changes(self):
+        """Test that a poll after the snapshot returns only what changed, once, in its current state."""
+        notifications.notify(self.student, self.request, 'submitted')
+        Request.objects.create(student=self.other, title="Not mine", description="Description")
+
+        snapshot = self._poll()
+        self.assertEqual([r['request_id'] for r in snapshot['requests']], [self.request.request_id])
+        self.assertEqual(len(snapshot['notifications']), 1)
+
+        empty = self._poll(snapshot['cursor'])
+        self.assertEqual((empty['requests'], empty['notifications']), ([], []))
+        self.assertEqual(empty['cursor'], snapshot['cursor'])
+
+        self.request.status = Request.STATUS_IN_PROGRESS
+        self.request.save()
+        self.request.save()  # changed twice, sent once
+        history = StatusHistory.objects.create(
+            request=self.request, status=Request.STATUS_IN_PROGRESS, description="Handled",
+            role=StatusHistory.ROLE_STAFF,
+        )
+
+        delta = self._poll(snapshot['cursor'])
+        self.assertEqual([(r['id'], r['status']) for r in delta['requests']], [(self.request.pk, 'in_progress')])
+        self.assertEqual([h['id'] for h in delta['status_history']], [history.pk])
+        self.assertEqual(delta['notifications'], [])
+
+    def test_read_state_and_deletions_are_synced(self):
+        """Test that bulk reads and archived requests reach the client."""
+        notification = notifications.notify(self.student, self.request, 'submitted')
+        cursor = self._poll()['cursor']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notifications.mark_all_read(self.student.pk)
+        delta = self._poll(cursor)
+        self.assertTrue(delta['notifications_read'])
+        self.assertEqual(delta['notifications'], [])
+        self.assertEqual(ChangeLog.objects.filter(entity=ChangeLog.ENTITY_ALL_READ).count(), 1)
+
+        other = notifications.notify(self.student, self.request, 'submitted')
+        with self.captureOnCommitCallbacks(execute=True):
+            notifications.mark_read(self.student.pk, [other.pk])
+        delta = self._poll(delta['cursor'])
+        self.assertFalse(delta['notifications_read'])
+        self.assertEqual([(n['id'], n['is_read']) for n in delta['notifications']], [(other.pk, True)])
+
+        Request.objects.filter(pk=self.request.pk).update(status=Request.STATUS_APPROVED)
+        archive_batch([self.request.pk])
+        delta = self._poll(delta['cursor'])
+        self.assertEqual(delta['deleted']['requests'], [self.request.pk])
+        self.assertEqual(delta['deleted']['notifications'], [notification.pk, other.pk])
+
+    def test_pages_through_large_deltas(self):
+        """Test that has_more pages through changes without losing any."""
+        cursor = sync.encode_cursor(sync.latest_position())
+        created = {
+            Notification.objects.create(user=self.student, message=f"Message {i}").pk for i in range(5)
+        }
+
+        seen = set()
+        while True:
+            payload = sync.changes(self.student, sync.decode_cursor(cursor), limit=2)
+            seen |= {n['id'] for n in payload['notifications']}
+            cursor = payload['cursor']
+            if not payload['has_more']:
+                break
+        self.assertEqual(seen, created)
+
+    def test_feed_is_per_user(self):
+        """Test that other users' changes are neither sent nor counted."""
+        cursor = self._poll()['cursor']
+        Notification.objects.create(user=self.other, message="Theirs")
+
+        delta = self._poll(cursor)
+
+        self.assertEqual(delta['notifications'], [])
+        self.assertFalse(ChangeLog.objects.filter(user=self.student, id__gt=sync.decode_cursor(cursor)).exists())
+
+    def test_deleting_a_student_with_requests(self):
+        """Test that change-log rows written during a user's cascade do not block the delete."""
+        self.student.delete()
+
+        self.assertFalse(Request.objects.filter(pk=self.request.pk).exists())
+
+    def test_compacted_cursor_must_start_over(self):
+        """Test that old change-log rows are deleted and cursors from before them get 410."""
+        stale = self._poll()['cursor']
+        notifications.notify(self.student, self.request, 'submitted')
+        notifications.notify(self.student, self.request, 'submitted')
+        ChangeLog.objects.update(created_at=timezone.now() - timedelta(days=60))
+        recent = self._poll()['cursor']
+        notifications.notify(self.student, self.request, 'submitted')
+
+        call_command('compact_notifications', change_log_days=30, stdout=StringIO())
+
+        self.assertEqual(ChangeLog.objects.count(), 1)
+        response = self.client.get(reverse('sync'), {'cursor': stale})
+        self.assertEqual(response.status_code, 410)
+        self.assertTrue(response.json()['reset'])
+        self.assertEqual(len(self._poll(recent)['notifications']), 1)
+
+    def test_invalid_cursor_and_anonymous(self):
+        """Test that bad cursors are rejected and anonymous clients get 401."""
+        self.assertEqual(self.client.get(reverse('sync'), {'cursor': 'nope'}).status_code, 400)
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('sync')).status_code, 401)
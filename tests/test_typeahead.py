@@ -0,0 +1,157 @@
+"""
+Tests for the typeahead prefix indexes and their JSON endpoints.
+"""
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core.models import User
+from requests_unified import typeahead
+from requests_unified.models import Course, Degree
+from requests_unified.typeahead import PrefixIndex
+
+
+class PrefixIndexTest(TestCase):
+    """Tests for the sorted-array prefix index."""
+
+    def setUp(self):
+        self.index = PrefixIndex([
+            (["SE101", "Intro to Programming", "Intro", "Programming"], {'id': 1}),
+            (["SE102", "Data Structures", "Data", "Structures"], {'id': 2}),
+            (["MA101", "Calculus", "Calculus"], {'id': 3}),
+        ])
+
+    def test_prefix_match_is_case_insensitive(self):
+        """Test that any key prefix finds its item regardless of case."""
+        self.assertEqual(self.index.search("se1"), [{'id': 1}, {'id': 2}])
+        self.assertEqual(self.index.search("STRUC"), [{'id': 2}])
+
+    def test_items_are_not_duplicated(self):
+        """Test that an item reachable through several keys is returned once."""
+        self.assertEqual(self.index.search("calc"), [{'id': 3}])
+
+    def test_limit_and_no_match(self):
+        """Test that results are capped and unknown prefixes return nothing."""
+        self.assertEqual(len(self.index.search("", limit=2)), 2)
+        self.assertEqual(self.index.search("zzz"), [])
+
+
+class TypeaheadEndpointTest(TestCase):
+    """Tests for the typeahead endpoints and index invalidation."""
+
+    def setUp(self):
+        typeahead.invalidate(*typeahead.BUILDERS)
+        self.client = Client()
+
+        self.degree = Degree.objects.create(name="Typeahead Engineering", code="TAE")
+        self.other_degree = Degree.objects.create(name="Typeahead Science", code="TAS")
+        self.course = Course.objects.create(code="TA101", name="Algorithms")
+        self.course.degrees.add(self.degree)
+        self.other_course = Course.objects.create(code="TA201", name="Algebra")
+        self.other_course.degrees.add(self.other_degree)
+        Course.objects.create(code="TA301", name="Archived Algorithms", is_active=False)
+
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="Student",
+            last_name="One",
+            degree=self.degree,
+        )
+        self.lecturer = User.objects.create_user(
+            username="lecturer",
+            email="dana.levi@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_LECTURER,
+            first_name="Dana",
+            last_name="Levi",
+        )
+        self.secretary = User.objects.create_user(
+            username="secretary",
+            email="secretary@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_SECRETARY,
+            first_name="Secretary",
+            last_name="User",
+        )
+
+    def _ids(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.json()['results']]
+
+    def test_requires_login(self):
+        """Test that anonymous requests get a JSON 401."""
+        response = self.client.get(reverse('typeahead:courses'), {'q': 'ta'})
+        self.assertEqual(response.status_code, 401)
+
+    def test_student_cannot_search_lecturers(self):
+        """Test that role restrictions apply to user endpoints."""
+        self.client.force_login(self.student)
+        response = self.client.get(reverse('typeahead:lecturers'), {'q': 'da'})
+        self.assertEqual(response.status_code, 403)
+
+    def test_courses_match_code_and_name_words(self):
+        """Test that active courses match by code or any word of their name."""
+        self.client.force_login(self.student)
+        url = reverse('typeahead:courses')
+
+        self.assertEqual(self._ids(url, q='ta1'), [self.course.id])
+        self.assertEqual(self._ids(url, q='alg'), [self.other_course.id, self.course.id])
+
+    def test_courses_scoped_by_degree(self):
+        """Test that ?degree= restricts courses to that degree."""
+        self.client.force_login(self.student)
+        ids = self._ids(reverse('typeahead:courses'), q='alg', degree=self.degree.id)
+        self.assertEqual(ids, [self.course.id])
+
+    @override_settings(TYPEAHEAD_MAX_INDEXES=3)
+    def test_client_scopes_do_not_grow_the_registry(self):
+        """Test that arbitrary ?degree= values evict the least recently used indexes."""
+        self.client.force_login(self.student)
+        url = reverse('typeahead:courses')
+        for degree in range(1000, 1010):
+            self._ids(url, q='alg', degree=degree)
+
+        self.assertEqual(len(typeahead._indexes), 3)
+        self.assertEqual(self._ids(url, q='alg', degree=self.degree.id), [self.course.id])
+
+    def test_lecturers_match_name_and_email(self):
+        """Test that staff can find lecturers by name or email."""
+        self.client.force_login(self.secretary)
+        url = reverse('typeahead:lecturers')
+
+        self.assertEqual(self._ids(url, q='lev'), [self.lecturer.id])
+        self.assertEqual(self._ids(url, q='dana.l'), [self.lecturer.id])
+
+    def test_index_invalidated_on_course_change(self):
+        """Test that new and renamed courses show up without waiting for expiry."""
+        self.client.force_login(self.student)
+        url = reverse('typeahead:courses')
+        self.assertEqual(self._ids(url, q='graph'), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.name = "Graph Theory"
+            self.course.save()
+
+        self.assertEqual(self._ids(url, q='graph'), [self.course.id])
+
+    def test_course_form_renders_selected_lecturers_only(self):
+        """Test that the course form no longer renders every lecturer."""
+        other = User.objects.create_user(
+            username="other", email="other@sce.ac.il", password="Test123!",
+            role=User.ROLE_LECTURER, first_name="Other", last_name="Lecturer",
+        )
+        self.course.lecturers.add(self.lecturer)
+        admin = User.objects.create_user(
+            username="admin", email="admin@sce.ac.il", password="Test123!",
+            role=User.ROLE_ADMIN, first_name="Admin", last_name="User",
+        )
+        self.client.force_login(admin)
+
+        response = self.client.get(reverse('management:course_edit', args=[self.course.id]))
+
+        self.assertContains(response, f'name="lecturers" value="{self.lecturer.id}"')
+        self.assertNotContains(response, other.email)
+        self.assertContains(response, reverse('typeahead:lecturers'))
@@ -0,0 +1,145 @@
+"""
+Tests for the indexed user search used by the management user list.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from core.models import User, UserSearchTerm
+from core.search import search_users, user_terms
+from management.pagination import EstimatedCountPaginator
+
+
+class UserSearchIndexTest(TestCase):
+    """Tests for search term maintenance and matching."""
+
+    def setUp(self):
+        self.john = User.objects.create_user(
+            username="john",
+            email="john.doe@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_STUDENT,
+            first_name="John",
+            last_name="Doe",
+            student_id="111111111",
+        )
+        self.jane = User.objects.create_user(
+            username="jane",
+            email="jane@sce.ac.il",
+            password="Test123!",
+            role=User.ROLE_LECTURER,
+            first_name="Jane",
+            last_name="Smith",
+            employee_id="EMP-ABC",
+        )
+
+    def _search(self, text):
+        results, fuzzy = search_users(User.objects.order_by('pk'), text)
+        return list(results), fuzzy
+
+    def test_terms_are_normalized(self):
+        """Test that tokens are lowercased and email pieces are split."""
+        tokens, grams = user_terms("John", "Doe", "John.Doe@sce.ac.il", "111", None)
+
+        self.assertIn("john.doe@sce.ac.il", tokens)
+        self.assertIn("doe", tokens)
+        self.assertIn("111", tokens)
+        self.assertIn(" jo", grams)
+
+    def test_terms_created_on_save(self):
+        """Test that saving a user maintains its search terms."""
+        self.john.last_name = "Walker"
+        self.john.email = "john.walker@sce.ac.il"
+        self.john.save()
+
+        terms = set(self.john.search_terms.filter(kind=UserSearchTerm.KIND_TOKEN).values_list('term', flat=True))
+        self.assertIn("walker", terms)
+        self.assertNotIn("doe", terms)
+
+    def test_prefix_matching(self):
+        """Test prefix matches on names, emails and IDs."""
+        self.assertEqual(self._search("smi"), ([self.jane], False))
+        self.assertEqual(self._search("jane@"), ([self.jane], False))
+        self.assertEqual(self._search("1111"), ([self.john], False))
+        self.assertEqual(self._search("emp-a"), ([self.jane], False))
+
+    def test_all_words_must_match(self):
+        """Test that multi-word searches are AND-ed."""
+        self.assertEqual(self._search("john doe"), ([self.john], False))
+        # No exact prefix match for both words, so only fuzzy candidates come back
+        self.assertTrue(self._search("john smith")[1])
+
+    def test_fuzzy_fallback(self):
+        """Test that typos fall back to trigram similarity."""
+        results, fuzzy = self._search("smiht")
+
+        self.assertTrue(fuzzy)
+        self.assertEqual(results, [self.jane])
+
+    def test_fuzzy_results_load_one_page(self):
+        """Test that paginating fuzzy results only loads the users of the page shown."""
+        for i in range(5):
+            User.objects.create_user(
+                username=f"smith{i}", email=f"smith{i}@sce.ac.il", password="Test123!",
+                first_name="Jane", last_name=f"Smith{i}",
+            )
+        results, fuzzy = search_users(User.objects.order_by('pk'), "smiht")
+        self.assertTrue(fuzzy)
+
+        with self.assertNumQueries(1):
+            page = EstimatedCountPaginator(results, 2).get_page(2)
+            users = list(page)
+
+        self.assertEqual(page.paginator.count, 6)
+        self.assertEqual(users, list(results)[2:4])
+
+    def test_rebuild_command(self):
+        """Test that the index can be rebuilt after bulk changes."""
+        User.objects.filter(pk=self.jane.pk).update(last_name="Brown")
+        call_command('rebuild_user_search_index', stdout=StringIO())
+
+        self.assertEqual(self._search("brown"), ([self.jane], False))
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    """Tests for the bounded-count paginator."""
+
+    def test_count_is_capped(self):
+        paginator = EstimatedCountPaginator(list(range(10)), 2, count_limit=100)
+        self.assertEqual(paginator.count, 10)
+
+        for i in range(5):
+            User.objects.create(username=f"u{i}", email=f"u{i}@sce.ac.il")
+        paginator = EstimatedCountPaginator(User.objects.order_by('pk'), 2, count_limit=3)
+        self.assertEqual(paginator.count, 3)
+        self.assertTrue(paginator.is_estimate)
+
+
+class UserListSearchViewTest(TestCase):
+    """Tests for search on the management user list page."""
+
+    def setUp(self):
+        self.client = Client()
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@sce.ac.il",
+            password="Admin123!",
+            first_name="Admin",
+            last_name="User",
+        )
+        User.objects.create_user(
+            username="john",
+            email="john@sce.ac.il",
+            password="Test123!",
+            first_name="John",
+            last_name="Doe",
+        )
+        self.client.force_login(self.admin)
+
+    def test_fuzzy_results_are_labelled(self):
+        response = self.client.get(reverse('management:user_list'), {'search': 'jhon doe'})
+
+        self.assertContains(response, "John Doe")
+        self.assertContains(response, "closest matches")
@@ -0,0 +1,63 @@
+"""
+Tests for the view benchmark suite and the query budgets it enforces.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from requests_unified.benchmarks import (
+    VIEW_BENCHMARKS, check_budgets, get_budgets, measure_user_search, run_benchmarks,
+)
+
+
+class ViewBudgetTest(TestCase):
+    """Tests that the main views stay within their query budgets."""
+
+    def _generate(self, requests, seed):
+        call_command(
+            'generate_load_data', requests=requests, students=5, lecturers=3, secretaries=1, hods=1,
+            courses=6, seed=seed, skip_indexes=True, verbosity=0, stdout=StringIO(),
+        )
+
+    def test_views_within_query_budgets(self):
+        """Test that every benchmarked view stays within its configured query budget."""
+        self._generate(40, seed=1)
+
+        results = run_benchmarks(repeat=1)
+
+        self.assertEqual(set(results), {name for name, _, _, _ in VIEW_BENCHMARKS})
+        self.assertEqual(check_budgets(results, get_budgets(), metrics=('queries',)), [])
+
+    def test_query_counts_do_not_grow_with_data(self):
+        """Test that list views do not issue a query per row."""
+        self._generate(20, seed=1)
+        small = run_benchmarks(repeat=1)
+        self._generate(80, seed=2)
+        large = run_benchmarks(repeat=1)
+
+        for name in ('staff:dashboard', 'lecturers:dashboard', 'head_of_dept:dashboard',
+                     'head_of_dept:api_pending_requests', 'api_v1:request_list', 'management:course_list'):
+            self.assertEqual(large[name]['queries'], small[name]['queries'], name)
+
+    def test_user_search_is_timed(self):
+        """Test that the user search benchmark covers prefix and fuzzy queries."""
+        call_command(
+            'generate_load_data', requests=10, students=20, lecturers=3, secretaries=1, hods=1,
+            courses=6, seed=1, verbosity=0, stdout=StringIO(),
+        )
+
+        results = measure_user_search(repeat=1)
+
+        self.assertEqual(
+            {label: measured['fuzzy'] for label, measured in results.items()},
+            {'first name prefix': False, 'full name': False, 'email': False, 'misspelled (fuzzy)': True},
+        )
+
+    def test_budget_overrides_and_violations(self):
+        """Test that overrides replace settings budgets and violations are reported."""
+        budgets = get_budgets({'default': {'queries': 1}, 'students:dashboard': {'ms': 5}})
+
+        self.assertEqual(budgets['students:dashboard'], {'queries': 1, 'ms': 5, 'memory_kb': 8192})
+        violations = check_budgets({'students:dashboard': {'queries': 3, 'ms': 2, 'memory_kb': 10}}, budgets)
+        self.assertEqual(violations, ['students:dashboard: queries 3 > budget 1'])